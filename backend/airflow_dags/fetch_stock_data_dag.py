@@ -1,18 +1,64 @@
 from datetime import datetime, timedelta
 import os
+import sys
 from pathlib import Path
 from airflow import DAG
+from airflow.decorators import task
 from airflow.operators.empty import EmptyOperator
 from airflow.operators.python import PythonOperator
 
-DATA_DIR = Path(os.getenv("DATA_DIR", "./data"))
+# Make the backend package importable so the DAG shares the services' catalog format
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config import Config
+
+# Same folder the API's price store reads
+DATA_DIR = Path(Config.DATA_DIR)
+# New bars come from INGEST_SOURCE, yfinance unless set to "fixture" (see services/ingestion.py)
+FIXTURE_DIR = os.getenv("INGEST_FIXTURE_DIR", "./fixtures")
+INGEST_MAX_PARALLEL = int(os.getenv("INGEST_MAX_PARALLEL", "4"))
 
 def validate_seed_csvs():
+    from services.ingestion import validate_folder
+
     DATA_DIR.mkdir(parents=True, exist_ok=True)
+    errors = validate_folder(str(DATA_DIR))
+    for symbol, error in errors.items():
+        print(f"[validate_seed_csvs] {symbol}: {error}")
+    if errors:
+        raise ValueError(f"{len(errors)} invalid CSV(s) in {DATA_DIR.resolve()}")
     print(f"[validate_seed_csvs] OK. Data dir: {DATA_DIR.resolve()}")
 
+@task
+def list_tickers():
+    from services.ingestion import FixtureSource, Ingestor, make_source
+
+    configured = os.getenv("INGEST_TICKERS")
+    if configured:
+        return [t.strip() for t in configured.split(",") if t.strip()]
+    source = make_source(fixture_dir=FIXTURE_DIR)
+    if isinstance(source, FixtureSource):
+        return source.tickers()
+    # CSVs are named after the bare symbol (TCS.csv), so use the ticker each was downloaded as
+    return Ingestor(str(DATA_DIR), source).tickers()
+
+@task(max_active_tis_per_dagrun=INGEST_MAX_PARALLEL)
+def ingest_ticker(ticker):
+    from services.ingestion import Ingestor, make_source
+
+    # The catalog is rebuilt once after every mapped ingest has finished
+    ingestor = Ingestor(str(DATA_DIR), make_source(fixture_dir=FIXTURE_DIR), update_catalog=False)
+    result = ingestor.ingest(ticker)
+    print(f"[ingest_ticker] {result}")
+    if result["status"] == "failed":
+        raise RuntimeError(f"Ingestion failed for {ticker}: {result['error']}")
+    return result
+
 def ingest_to_catalog():
-    print("[ingest_to_catalog] Stub. CSV -> curated output.")
+    from services.catalog import build_catalog, catalog_dir_for
+
+    published = build_catalog(str(DATA_DIR))
+    print(f"[ingest_to_catalog] Published {len(published)} symbol(s) to {catalog_dir_for(str(DATA_DIR))}")
 
 DEFAULT_ARGS = {
     "owner": "asr",
@@ -23,7 +69,7 @@ DEFAULT_ARGS = {
 
 with DAG(
     dag_id="fetch_stock_data",
-    description="Validate & curate local stock CSVs (no yfinance)",
+    description="Validate, incrementally ingest & curate stock CSVs",
     default_args=DEFAULT_ARGS,
     start_date=datetime(2025, 8, 1),
     schedule="0 18 * * 1-5",  # 6PM Mon–Fri
@@ -33,7 +79,11 @@ with DAG(
 
     start = EmptyOperator(task_id="start")
     validate = PythonOperator(task_id="validate_seed_csvs", python_callable=validate_seed_csvs)
+    # One mapped task instance per ticker, at most INGEST_MAX_PARALLEL at a time
+    tickers = list_tickers()
+    fetched = ingest_ticker.expand(ticker=tickers)
     ingest = PythonOperator(task_id="ingest_to_catalog", python_callable=ingest_to_catalog)
     end = EmptyOperator(task_id="end")
 
-    start >> validate >> ingest >> end
\ No newline at end of file
+    start >> validate >> tickers
+    fetched >> ingest >> end
\ No newline at end of file
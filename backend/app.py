@@ -2,6 +2,8 @@ from flask import Flask
 from flask_cors import CORS
 import os
 from routes.stock_routes import stock_routes
+from services.telemetry import init_app as init_telemetry
+from services.warmup import start_warm_up
 from dotenv import load_dotenv
 
 # Load env
@@ -18,6 +20,11 @@ def home():
 # Register blueprint
 app.register_blueprint(stock_routes, url_prefix="/api")
 
+# Server-Timing headers, /metrics and the ?_profile=1 request profiler
+init_telemetry(app)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 10000))
+    # Import heavy dependencies and load prices once the server accepts connections (see WARMUP)
+    start_warm_up(wait_for=('127.0.0.1', port))
     app.run(host='0.0.0.0', port=port)
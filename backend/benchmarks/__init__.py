@@ -0,0 +1,8 @@
+"""
+Benchmarks for the stock API.
+
+Run from the ``backend`` directory, e.g.::
+
+    python -m benchmarks.synthetic --out /tmp/bench-data --symbols 50
+    python -m benchmarks.bench_api --symbols 20 --concurrency 8 --output bench.json
+"""
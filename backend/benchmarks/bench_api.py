@@ -0,0 +1,349 @@
+"""
+Endpoint benchmark for the stock API.
+
+Provides functionality for:
+- Generating a synthetic data folder (see ``benchmarks.synthetic``)
+- Serving NewsAPI from a local HTTP stub with configurable latency
+- Driving each endpoint through the Flask test client from a thread pool
+- Reporting latency percentiles, throughput, status counts and peak RSS
+- Writing the results as JSON, and comparing them with an earlier run
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_api --symbols 20 --years 5 --concurrency 8 --output bench.json
+    python -m benchmarks.bench_api --compare bench-main.json --output bench.json
+
+``--cold`` clears every cache before a scenario instead of warming it up,
+and ``--isolate`` runs each scenario in a fresh process so its peak RSS is
+not inflated by earlier scenarios.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import DATE_FORMATS, generate_dataset  # noqa: E402
+
+# name -> URL template; {symbol} and {symbols} are filled per request
+SCENARIOS = {
+    "stock_figure": "/api/stock/{symbol}?news=none",
+    "stock_series": "/api/stock/{symbol}?chart=series&max_points=1200&news=none",
+    "stock_columnar": "/api/stock/{symbol}?chart=series&max_points=1200&news=none&format=columnar",
+    "stock_ndjson": "/api/stock/{symbol}?format=ndjson&table_period=max",
+    "stock_news": "/api/stock/{symbol}?chart=series&max_points=1200&news=wait",
+    "predict": "/api/stock/{symbol}/predict?max_points=1200",
+    "predict_keras": "/api/stock/{symbol}/predict?model=keras&horizon=30",
+    "batch": "/api/stocks?symbols={symbols}&fields=info,series&max_points=300",
+}
+DEFAULT_SCENARIOS = ("stock_figure", "stock_series", "stock_columnar", "stock_ndjson",
+                     "stock_news", "predict", "batch")
+BATCH_SIZE = 10
+
+
+class StubNewsServer:
+    """
+    Local HTTP server answering NewsAPI ``everything`` queries with canned articles.
+
+    Runs on an ephemeral port in a daemon thread; requests reach it through
+    the service's real pooled session, so connection handling and JSON
+    decoding are measured too.
+    """
+
+    HEADLINES = (
+        "{q} shares surge after strong quarterly profit growth",
+        "{q} faces regulatory probe as losses widen",
+        "{q} announces expansion plan and new partnership",
+        "Analysts hold steady on {q} ahead of results",
+        "{q} stock falls on weak guidance and rising costs",
+    )
+
+    def __init__(self, latency_ms: float = 50.0, articles: int = 5):
+        self.latency = latency_ms / 1000.0
+        self.articles = articles
+        self.calls = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query).get("q", ["STOCK"])[0]
+                body = json.dumps(stub.payload(q)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/v2/everything"
+        threading.Thread(target=self._server.serve_forever, name="stub-newsapi", daemon=True).start()
+
+    def payload(self, q: str) -> Dict:
+        """Count the call, wait the configured latency and return the response body."""
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        articles = [
+            {
+                "title": self.HEADLINES[i % len(self.HEADLINES)].format(q=q),
+                "description": f"Synthetic article {i} about {q} for benchmarking.",
+                "content": f"{q} traded actively today as investors weighed the latest update.",
+                "url": f"https://news.invalid/{q}/{i}",
+                "source": {"name": "Benchmark Wire"},
+                "publishedAt": "2025-06-30T09:00:00Z",
+            }
+            for i in range(self.articles)
+        ]
+        return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+_news_server: Optional[StubNewsServer] = None
+
+
+def _setup(data_folder: str, news_latency_ms: float):
+    """Point the services at the synthetic data and a local NewsAPI stub; return the Flask app."""
+    global _news_server
+    if _news_server is None or _news_server.latency != news_latency_ms / 1000.0:
+        if _news_server is not None:
+            _news_server.close()
+        _news_server = StubNewsServer(news_latency_ms)
+    os.environ["NEWS_API_KEY"] = "benchmark"
+    os.environ["NEWS_API_URL"] = _news_server.url
+    from services import sentiment_service
+    from services.price_store import price_store
+
+    price_store.data_folder = data_folder
+    # The URL is read when the module is imported, which may have happened before this call
+    sentiment_service.NEWS_API_URL = _news_server.url
+
+    from app import app
+
+    return app
+
+
+def _reset_caches() -> None:
+    from services.charts import figure_cache
+    from services.downsample import index_cache
+    from services.http_cache import body_cache
+    from services.keras_predict import forecast_cache
+    from services.price_store import price_store
+    from services.regression import trend_model
+    from services.sentiment_service import news_cache
+
+    for cache in (price_store, figure_cache, index_cache, body_cache, forecast_cache, trend_model, news_cache):
+        cache.clear()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _urls(template: str, symbols: List[str], count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    urls = []
+    for i in range(count):
+        batch = rng.sample(symbols, min(BATCH_SIZE, len(symbols)))
+        urls.append(template.format(symbol=symbols[i % len(symbols)], symbols=",".join(batch)))
+    return urls
+
+
+def run_scenario(config: Dict) -> Dict:
+    """
+    Run one scenario and return its measurements.
+
+    Args:
+        config (Dict): Scenario name, data folder, symbols, request count,
+            concurrency, cold flag, news latency and seed
+
+    Returns:
+        Dict: Latency percentiles in ms, throughput, statuses and peak RSS
+    """
+    app = _setup(config["data_folder"], config["news_latency_ms"])
+    template = SCENARIOS[config["scenario"]]
+    symbols = config["symbols"]
+    local = threading.local()
+
+    def call(url: str):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        started = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        return time.perf_counter() - started, response.status_code
+
+    if config["cold"]:
+        _reset_caches()
+    else:
+        for url in _urls(template, symbols, len(symbols), config["seed"]):
+            call(url)
+
+    urls = _urls(template, symbols, config["requests"], config["seed"] + 1)
+    rss_before = _peak_rss_mb()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config["concurrency"]) as pool:
+        results = list(pool.map(call, urls))
+    wall = time.perf_counter() - started
+
+    latencies = np.array([latency for latency, _ in results]) * 1000.0
+    statuses: Dict[str, int] = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    return {
+        "requests": len(results),
+        "concurrency": config["concurrency"],
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "status_counts": statuses,
+        "latency_ms": {
+            "mean": round(float(latencies.mean()), 3),
+            "p50": round(float(np.percentile(latencies, 50)), 3),
+            "p90": round(float(np.percentile(latencies, 90)), 3),
+            "p95": round(float(np.percentile(latencies, 95)), 3),
+            "p99": round(float(np.percentile(latencies, 99)), 3),
+            "max": round(float(latencies.max()), 3),
+        },
+        "throughput_rps": round(len(results) / wall, 2),
+        "wall_s": round(wall, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: Dict, current: Dict) -> List[str]:
+    """Return one line per shared scenario with p50/p95/throughput ratios (current / previous)."""
+    lines = [f"{'scenario':<16} {'p50':>8} {'p95':>8} {'rps':>8}"]
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if not old:
+            continue
+
+        def ratio(new_value, old_value):
+            return f"{new_value / old_value:7.2f}x" if old_value else "    n/a"
+
+        lines.append(
+            f"{name:<16} {ratio(result['latency_ms']['p50'], old['latency_ms']['p50'])} "
+            f"{ratio(result['latency_ms']['p95'], old['latency_ms']['p95'])} "
+            f"{ratio(result['throughput_rps'], old['throughput_rps'])}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark the stock API endpoints")
+    parser.add_argument("--data", help="Existing data folder; a synthetic one is generated when omitted")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--date-format", choices=DATE_FORMATS, default="mixed")
+    parser.add_argument("--catalog", action="store_true", help="Publish the columnar catalog before running")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--news-latency-ms", type=float, default=50.0)
+    parser.add_argument("--cold", action="store_true", help="Clear caches before each scenario instead of warming")
+    parser.add_argument("--isolate", action="store_true", help="Run each scenario in a fresh process")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="stock-bench-") as tmp:
+        data_folder = args.data or tmp
+        if args.data:
+            symbols = sorted(name[:-4] for name in os.listdir(data_folder) if name.endswith(".csv"))
+            if args.catalog:
+                from services.catalog import build_catalog
+
+                build_catalog(data_folder, symbols)
+        else:
+            symbols = generate_dataset(data_folder, args.symbols, args.years, args.date_format,
+                                       seed=args.seed, catalog=args.catalog)
+
+        results = {}
+        for name in scenarios:
+            config = {
+                "scenario": name, "data_folder": data_folder, "symbols": symbols,
+                "requests": args.requests, "concurrency": args.concurrency, "cold": args.cold,
+                "news_latency_ms": args.news_latency_ms, "seed": args.seed,
+            }
+            if args.isolate:
+                with multiprocessing.get_context("spawn").Pool(1) as pool:
+                    results[name] = pool.apply(run_scenario, (config,))
+            else:
+                results[name] = run_scenario(config)
+            latency = results[name]["latency_ms"]
+            print(f"{name:<16} p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms "
+                  f"rps={results[name]['throughput_rps']:.1f} errors={results[name]['errors']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(json.load(f), report)))
+    return report
+
+
+if __name__ == "__main__":
+    main()
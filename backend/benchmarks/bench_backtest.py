@@ -0,0 +1,123 @@
+"""
+Walk-forward backtest benchmark.
+
+Times a full-universe backtest over a synthetic data folder: cold (every
+symbol evaluated) inline and over the process pool, both including and
+excluding the pool's start-up, and warm (every result reused from the
+database). For reference, the linear predictor is also timed and checked
+against refitting ``TrendStats`` at every bar of one symbol.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_backtest --symbols 500 --years 10 --output backtest.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import generate_dataset  # noqa: E402
+from services.backtest import BACKTEST_WORKERS, Backtester, linear_trend  # noqa: E402
+from services.catalog import build_catalog  # noqa: E402
+from services.price_store import PriceStore  # noqa: E402
+from services.regression import TrendStats, date_ordinals  # noqa: E402
+from services.symbols import SymbolRegistry  # noqa: E402
+
+
+def loop_reference(store: PriceStore, symbol: str, horizon: int) -> Dict[str, float]:
+    """Time the expanding-window linear forecasts against one refit per bar."""
+    data = store.get(symbol)
+    x = date_ordinals(data.dates).astype(np.float64)
+    y = data["Close"].astype(np.float64)
+    target_x = np.concatenate([x[horizon:], np.full(horizon, np.nan)])
+
+    started = time.perf_counter()
+    vectorized = linear_trend(x, y, target_x)
+    vectorized_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    looped = np.empty(len(y))
+    for t in range(len(y)):
+        slope, intercept = TrendStats.from_arrays(x[:t + 1], y[:t + 1]).coefficients()
+        looped[t] = intercept + slope * target_x[t]
+    looped_s = time.perf_counter() - started
+
+    finite = np.isfinite(looped)
+    return {
+        "bars": len(y),
+        "vectorized_ms": round(vectorized_s * 1000, 3),
+        "refit_loop_ms": round(looped_s * 1000, 1),
+        "max_relative_error": float(np.max(np.abs(vectorized[finite] - looped[finite]) / np.abs(looped[finite]))),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark walk-forward backtests")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--years", type=float, default=10)
+    parser.add_argument("--predictors", default="linear,naive,drift")
+    parser.add_argument("--horizon", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=BACKTEST_WORKERS)
+    parser.add_argument("--source", choices=("csv", "catalog"), default="catalog")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix="bench-backtest-")
+    try:
+        symbols = generate_dataset(folder, symbols=args.symbols, years=args.years)
+        if args.source == "catalog":
+            build_catalog(folder)
+        store = PriceStore(folder)
+        registry = SymbolRegistry(store, names_path=os.path.join(folder, "names.json"))
+        predictors = args.predictors.split(",")
+
+        runs = {}
+        for label, workers in (("inline", 1), ("pool", args.workers)):
+            db_path = os.path.join(folder, f"backtest-{label}.db")
+            backtester = Backtester(store, registry, db_path=db_path, workers=workers)
+            try:
+                cold = backtester.run(predictors=predictors, horizon=args.horizon)
+                warm = backtester.run(predictors=predictors, horizon=args.horizon)
+                # Another horizon re-evaluates every symbol on the already started pool
+                started_pool = backtester.run(predictors=predictors, horizon=args.horizon + 1)
+            finally:
+                backtester.close()
+            runs[label] = {
+                "workers": workers,
+                "cold_s": cold["seconds"],
+                "cold_pool_started_s": started_pool["seconds"],
+                "warm_s": warm["seconds"],
+                "evaluated": cold["evaluated"],
+                "summary": cold["summary"],
+            }
+        report = {
+            "symbols": args.symbols,
+            "years": args.years,
+            "source": args.source,
+            "cpus": os.cpu_count(),
+            "runs": runs,
+            "linear_reference": loop_reference(store, symbols[0], args.horizon),
+        }
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
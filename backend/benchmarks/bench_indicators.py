@@ -0,0 +1,143 @@
+"""
+Indicator engine versus pandas rolling/ewm equivalents.
+
+For each indicator the full-history computation is timed against the
+pandas formulation and checked for agreement, and a one-bar append is timed
+through the engine's incremental path.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_indicators --years 10 --repeat 20 --output indicators.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import synthetic_ohlcv  # noqa: E402
+from services.indicators import IndicatorEngine, parse_indicator  # noqa: E402
+from services.price_store import PriceData  # noqa: E402
+
+
+def _price_data(frame: pd.DataFrame, rows: int, version) -> PriceData:
+    columns = {name: frame[name].to_numpy()[:rows].copy() for name in ("Open", "High", "Low", "Close", "Volume")}
+    return PriceData("BENCH", frame["Date"].to_numpy()[:rows].astype("datetime64[ns]"), columns, version)
+
+
+def pandas_reference(frame: pd.DataFrame) -> Dict[str, Callable[[], Dict[str, np.ndarray]]]:
+    """The pandas formulation of each benchmarked indicator."""
+    close = frame["Close"]
+
+    def rsi():
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+        return {"rsi": (100 - 100 / (1 + gain / loss)).to_numpy()}
+
+    def macd():
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+        return {"macd": line.to_numpy(), "signal": signal.to_numpy(), "histogram": (line - signal).to_numpy()}
+
+    def bollinger():
+        middle = close.rolling(20).mean()
+        std = close.rolling(20).std(ddof=0)
+        return {"middle": middle.to_numpy(), "upper": (middle + 2 * std).to_numpy(),
+                "lower": (middle - 2 * std).to_numpy()}
+
+    def vwap():
+        typical = (frame["High"] + frame["Low"] + frame["Close"]) / 3
+        flow = typical * frame["Volume"]
+        return {"vwap": (flow.rolling(20).sum() / frame["Volume"].rolling(20).sum()).to_numpy()}
+
+    return {
+        "sma50": lambda: {"sma": close.rolling(50).mean().to_numpy()},
+        "ema20": lambda: {"ema": close.ewm(span=20, adjust=False).mean().to_numpy()},
+        "rsi14": rsi,
+        "macd": macd,
+        "bb20": bollinger,
+        "vwap20": vwap,
+    }
+
+
+def _best_of(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark the indicator engine against pandas")
+    parser.add_argument("--years", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    frame = synthetic_ohlcv(args.years, seed=args.seed)
+    rows = len(frame)
+    full = _price_data(frame, rows, ("bench", rows))
+    prefix = _price_data(frame, rows - 1, ("bench", rows - 1))
+    references = pandas_reference(frame)
+
+    results = {}
+    for name, reference in references.items():
+        canonical, indicator = parse_indicator(name)
+        expected = reference()
+
+        def engine_full():
+            return indicator.compute({column: full[column] for column in indicator.inputs})[0]
+
+        def engine_append():
+            engine = IndicatorEngine()
+            engine.compute(prefix, name)
+            started = time.perf_counter()
+            engine.compute(full, name)
+            return time.perf_counter() - started
+
+        computed = engine_full()
+        appended = IndicatorEngine()
+        appended.compute(prefix, name)
+        incremental = appended.compute(full, name)
+        max_error = max(
+            float(np.nanmax(np.abs(computed[column] - expected[column]))) for column in indicator.outputs
+        )
+        max_step_error = max(
+            float(np.nanmax(np.abs(incremental[column] - computed[column]))) for column in indicator.outputs
+        )
+
+        pandas_s = _best_of(reference, args.repeat)
+        numpy_s = _best_of(engine_full, args.repeat)
+        append_s = min(engine_append() for _ in range(args.repeat))
+        results[canonical] = {
+            "pandas_ms": round(pandas_s * 1000, 4),
+            "engine_full_ms": round(numpy_s * 1000, 4),
+            "engine_append_ms": round(append_s * 1000, 4),
+            "speedup_vs_pandas": round(pandas_s / numpy_s, 2),
+            "max_abs_error_vs_pandas": max_error,
+            "max_abs_error_incremental": max_step_error,
+        }
+
+    report = {"rows": rows, "years": args.years, "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
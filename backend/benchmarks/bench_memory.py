@@ -0,0 +1,157 @@
+"""
+Per-worker memory of the price store under a forking multi-worker server.
+
+Each mode starts a fresh master process, which forks ``--workers`` workers
+the way gunicorn does. Every worker loads and reads every symbol through the
+price store, then reports its memory while all workers are alive:
+
+- ``csv``: no catalog; each worker parses the CSVs into private arrays
+- ``catalog``: published catalog; each worker maps the columns on demand
+- ``preload``: the master maps the catalog before forking (``wsgi.py``)
+
+RSS counts shared pages in every process, so the proportional (PSS) and
+private (USS) figures from ``/proc/self/smaps_rollup`` are the ones that
+show the saving; they are only reported on Linux.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_memory --symbols 200 --years 10 --workers 4 --output memory.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import resource
+import multiprocessing
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import generate_dataset  # noqa: E402
+
+MODES = ("csv", "catalog", "preload")
+
+
+def _memory_mb() -> Dict[str, float]:
+    """Return this process's RSS, PSS and USS in MB (RSS only when smaps_rollup is unavailable)."""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+        private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+        return {"rss_mb": fields["Rss"] / 1024, "pss_mb": fields["Pss"] / 1024, "uss_mb": private / 1024}
+    except (OSError, KeyError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss_mb": peak / (1024 * 1024 if sys.platform == "darwin" else 1024)}
+
+
+def _worker(symbols: List[str], barrier, results) -> None:
+    from services.price_store import price_store
+
+    before = _memory_mb()
+    checksum = 0.0
+    for symbol in symbols:
+        data = price_store.get(symbol)
+        # Read every value so each column's pages are actually resident
+        checksum += sum(float(np.nansum(values)) for values in data.columns.values())
+    barrier.wait()
+    after = _memory_mb()
+    results.put({"before": before, "after": after, "checksum": checksum})
+    # Stay alive until every worker has measured, so PSS divides shared pages between all of them
+    barrier.wait()
+
+
+def _run_mode(mode: str, data_folder: str, symbols: List[str], workers: int, output) -> None:
+    """Master process for one mode; run in a fresh interpreter so modes don't share state."""
+    from services.price_store import price_store
+
+    price_store.data_folder = data_folder
+    price_store.max_symbols = max(price_store.max_symbols, len(symbols))
+    catalog_dir = price_store.catalog_dir
+    if mode == "csv":
+        shutil.rmtree(catalog_dir, ignore_errors=True)
+    else:
+        from services.catalog import build_catalog
+
+        build_catalog(data_folder)
+    master_before = _memory_mb()
+    if mode == "preload":
+        price_store.preload(build=False)
+
+    fork = multiprocessing.get_context("fork")
+    barrier = fork.Barrier(workers)
+    results = fork.Queue()
+    processes = [fork.Process(target=_worker, args=(symbols, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    def mean(key: str, when: str) -> Optional[float]:
+        values = [report[when].get(key) for report in reports]
+        return round(float(np.mean(values)), 1) if None not in values else None
+
+    keys = reports[0]["after"].keys()
+    output.put({
+        "mode": mode,
+        "workers": workers,
+        "master": {key: round(value, 1) for key, value in _memory_mb().items()},
+        "master_before_load": {key: round(value, 1) for key, value in master_before.items()},
+        "worker_mean": {key: mean(key, "after") for key in keys},
+        "worker_growth": {key: round(mean(key, "after") - mean(key, "before"), 1) for key in keys},
+        "total_pss_mb": round(sum(report["after"]["pss_mb"] for report in reports), 1)
+        if "pss_mb" in keys else None,
+    })
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark per-worker price store memory")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--years", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--data", help="Reuse or create the synthetic data folder here")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown mode(s): {', '.join(sorted(unknown))}")
+
+    data_folder = args.data or tempfile.mkdtemp(prefix="bench-memory-")
+    try:
+        symbols = generate_dataset(data_folder, symbols=args.symbols, years=args.years)
+        spawn = multiprocessing.get_context("spawn")
+        results = []
+        for mode in modes:
+            output = spawn.Queue()
+            master = spawn.Process(target=_run_mode, args=(mode, data_folder, symbols, args.workers, output))
+            master.start()
+            results.append(output.get())
+            master.join()
+    finally:
+        if not args.data:
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    report = {"symbols": args.symbols, "years": args.years, "workers": args.workers, "results": results}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Fan-out benchmark for the WebSocket push server.
+
+Starts the push server in a subprocess on a synthetic data folder, connects many
+subscribers (plus optional slow ones that never read), appends bars with
+the simulated feed and measures how long each update takes to reach every
+subscriber, from the end of the append to the message's arrival.
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_push --clients 2000 --symbols 20 --ticks 5 --output push.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from websockets.asyncio.client import connect  # noqa: E402
+
+from benchmarks.bench_startup import _free_port  # noqa: E402
+from benchmarks.synthetic import generate_dataset  # noqa: E402
+from simulate_feed import SimulatedFeed  # noqa: E402
+
+_LAUNCHER = """
+import sys, asyncio
+sys.path.insert(0, {backend!r})
+from services.price_store import price_store
+price_store.data_folder = {data_folder!r}
+from services.push import serve
+asyncio.run(serve("127.0.0.1", {port}))
+"""
+
+
+async def _subscriber(url: str, arrivals: List[float], ready: asyncio.Queue, stop: asyncio.Event) -> None:
+    async with connect(url, max_queue=None, open_timeout=60) as ws:
+        await ws.recv()
+        await ready.put(None)
+        async for raw in ws:
+            if raw.startswith('{"type":"bars"'):
+                arrivals.append(time.perf_counter())
+            if stop.is_set():
+                break
+
+
+async def _slow_subscriber(url: str, ready: asyncio.Queue, stop: asyncio.Event) -> None:
+    # Never reads after subscribing, so its buffers fill up and the server must not wait on it
+    async with connect(url, max_queue=4, open_timeout=60) as ws:
+        await ws.recv()
+        await ready.put(None)
+        await stop.wait()
+
+
+async def _run(port: int, feed: SimulatedFeed, symbols: List[str], args) -> Dict:
+    base = f"ws://127.0.0.1:{port}/"
+    rng = random.Random(0)
+    arrivals: List[float] = []
+    ready: asyncio.Queue = asyncio.Queue()
+    stop = asyncio.Event()
+    expected = 0
+    tasks = []
+    started = time.perf_counter()
+    for _ in range(args.clients):
+        chosen = rng.sample(symbols, min(args.per_client, len(symbols)))
+        expected += len(chosen)
+        tasks.append(asyncio.create_task(_subscriber(f"{base}?symbols={','.join(chosen)}", arrivals, ready, stop)))
+    for _ in range(args.slow):
+        tasks.append(asyncio.create_task(_slow_subscriber(f"{base}?symbols={','.join(symbols)}", ready, stop)))
+    for _ in tasks:
+        await ready.get()
+    connect_s = time.perf_counter() - started
+
+    ticks = []
+    for _ in range(args.ticks):
+        arrivals.clear()
+        await asyncio.to_thread(feed.tick)
+        appended = time.perf_counter()
+        deadline = appended + args.timeout
+        while len(arrivals) < expected and time.perf_counter() < deadline:
+            await asyncio.sleep(0.005)
+        latencies = sorted((arrival - appended) * 1000 for arrival in arrivals)
+        ticks.append({
+            "delivered": len(latencies),
+            "expected": expected,
+            "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+            "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 1) if latencies else None,
+            "max_ms": round(latencies[-1], 1) if latencies else None,
+        })
+        await asyncio.sleep(args.pause)
+
+    hub = json.loads(await asyncio.to_thread(
+        lambda: urllib.request.urlopen(f"http://127.0.0.1:{port}/stats").read()))
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {"connect_s": round(connect_s, 2), "ticks": ticks, "hub": hub}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark push server fan-out")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--slow", type=int, default=20, help="Subscribers to every symbol that never read")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--per-client", type=int, default=3, help="Symbols per subscriber")
+    parser.add_argument("--years", type=float, default=1)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--pause", type=float, default=0.5, help="Seconds between ticks")
+    parser.add_argument("--poll", type=float, default=0.05, help="PUSH_POLL_SECONDS for the server")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for a tick's deliveries")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix="bench-push-")
+    port = _free_port()
+    server = None
+    try:
+        symbols = generate_dataset(folder, symbols=args.symbols, years=args.years)
+        env = {**os.environ, "PUSH_POLL_SECONDS": str(args.poll)}
+        code = _LAUNCHER.format(backend=BACKEND_DIR, data_folder=folder, port=port)
+        server = subprocess.Popen([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=1).read()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Push server did not start")
+                time.sleep(0.05)
+
+        result = asyncio.run(_run(port, SimulatedFeed(folder, symbols), symbols, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(folder, ignore_errors=True)
+
+    report = {
+        "clients": args.clients,
+        "slow_clients": args.slow,
+        "symbols": args.symbols,
+        "per_client": args.per_client,
+        "poll_s": args.poll,
+        **result,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Sentiment scoring throughput: batch API versus the per-article loop.
+
+The baseline reproduces the previous scoring loop: one TextBlob parse and
+two substring scans over every keyword per article. The batch API is run
+cold (empty result cache) and warm (every article cached).
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_sentiment --articles 2000 --duplicates 0.3 --output sentiment.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from services.sentiment_service import EnhancedSentimentAnalyzer  # noqa: E402
+
+FILLER = ("the", "company", "said", "shares", "market", "investors", "quarter", "board", "sector",
+          "analysts", "today", "in", "on", "after", "amid", "with", "support", "upgrade", "commission")
+
+
+def synthetic_articles(count: int, duplicates: float = 0.0, seed: int = 0) -> List[str]:
+    """Return ``count`` headline+description texts, a ``duplicates`` fraction repeating earlier ones."""
+    rng = random.Random(seed)
+    keywords = [w for words in EnhancedSentimentAnalyzer().financial_keywords.values() for w in words]
+    texts: List[str] = []
+    for _ in range(count):
+        if texts and rng.random() < duplicates:
+            texts.append(rng.choice(texts))
+            continue
+        words = [rng.choice(keywords) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(40)]
+        texts.append(" ".join(words[:12]).capitalize() + ". " + " ".join(words[12:]) + ".")
+    return texts
+
+
+def legacy_score(analyzer: EnhancedSentimentAnalyzer, text: str) -> Dict:
+    """The previous per-article scoring: substring checks per keyword, run twice."""
+    blob = analyzer.analyzer(text)
+    polarity = blob.sentiment.polarity
+    lowered = text.lower()
+    keywords = analyzer.financial_keywords
+    positive = sum(1 for word in keywords['positive'] if word in lowered)
+    negative = sum(1 for word in keywords['negative'] if word in lowered)
+    neutral = sum(1 for word in keywords['neutral'] if word in lowered)
+    total = positive + negative + neutral
+    context = (positive - negative) / total if total else 0.0
+    adjusted = float(np.clip(0.7 * polarity + 0.3 * context, -1.0, 1.0))
+    return {
+        "score": round(adjusted, 3),
+        "keyword_matches": {
+            'positive': sum(1 for word in keywords['positive'] if word in lowered),
+            'negative': sum(1 for word in keywords['negative'] if word in lowered),
+            'neutral': sum(1 for word in keywords['neutral'] if word in lowered),
+        },
+    }
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark sentiment scoring")
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Fraction of repeated articles")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    texts = synthetic_articles(args.articles, args.duplicates, args.seed)
+    analyzer = EnhancedSentimentAnalyzer(cache_size=max(1, args.articles))
+
+    timings = {
+        "legacy_loop_s": _timed(lambda: [legacy_score(analyzer, text) for text in texts]),
+        "batch_cold_s": _timed(lambda: analyzer.analyze_batch(texts)),
+        "batch_warm_s": _timed(lambda: analyzer.analyze_batch(texts)),
+        "keywords_substring_s": _timed(lambda: [
+            [sum(1 for word in words if word in text.lower()) for words in analyzer.financial_keywords.values()]
+            for text in texts
+        ]),
+        "keywords_matcher_s": _timed(lambda: [analyzer._keyword_counts(text) for text in texts]),
+    }
+    report = {
+        "articles": len(texts),
+        "distinct_articles": len(set(texts)),
+        **{name: round(value, 4) for name, value in timings.items()},
+        "articles_per_s": {
+            name[:-2]: round(len(texts) / value, 1) for name, value in timings.items() if value > 0
+        },
+        "speedup_cold": round(timings["legacy_loop_s"] / timings["batch_cold_s"], 2),
+        "speedup_warm": round(timings["legacy_loop_s"] / timings["batch_warm_s"], 2),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Startup benchmark for the Flask app.
+
+Provides functionality for:
+- Per-module import times of ``import app`` (``python -X importtime``)
+- Checking that heavy dependencies stay out of the startup import graph
+- Time to first 200: launching the development server in a fresh process
+  and timing the first ``/`` and first stock data responses, for each
+  ``WARMUP`` mode
+
+Usage (from the ``backend`` directory)::
+
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+    python -m benchmarks.bench_startup --runs 1 --budget-ms 800
+
+The exit status is 1 when ``import app`` pulls in a module listed in
+``--forbid`` or takes longer than ``--budget-ms``, so the benchmark can
+guard against startup regressions.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.synthetic import generate_dataset  # noqa: E402
+
+# Deferred to the code paths that need them; none may be imported by ``import app``
+HEAVY_MODULES = ("pandas", "plotly", "textblob", "nltk", "scipy", "sklearn", "keras", "tensorflow")
+WARMUP_MODES = ("off", "background", "eager")
+
+_LAUNCHER = """
+import sys
+sys.path.insert(0, {backend!r})
+from services.price_store import price_store
+price_store.data_folder = {data_folder!r}
+from app import app
+from services.warmup import start_warm_up
+start_warm_up(wait_for=("127.0.0.1", {port}))
+app.run(host="127.0.0.1", port={port})
+"""
+
+
+def import_times(top: int = 15) -> Dict:
+    """
+    Import ``app`` in a fresh interpreter and report where the time went.
+
+    Returns:
+        Dict: Total milliseconds, the slowest modules by cumulative time,
+        every ``services.*`` module, and which HEAVY_MODULES were imported
+    """
+    probe = "import sys, app; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total.strip()) / 1000
+    loaded = set(result.stdout.strip().split(","))
+
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(cumulative.get("app", 0.0), 1),
+        "slowest_ms": {name: round(ms, 1) for name, ms in slowest},
+        "services_ms": {name: round(ms, 1) for name, ms in sorted(cumulative.items())
+                        if name.startswith("services.")},
+        "heavy_imported": [name for name in HEAVY_MODULES if name in loaded],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def time_to_first_200(data_folder: str, symbol: str, warmup: str, timeout: float = 60.0) -> Dict[str, float]:
+    """
+    Start the development server and time its first responses.
+
+    Returns:
+        Dict[str, float]: Milliseconds from process start to the first 200 on
+        ``/`` (listening), and to the first stock data response requested
+        right after it
+    """
+    port = _free_port()
+    code = _LAUNCHER.format(backend=BACKEND_DIR, data_folder=data_folder, port=port)
+    env = {**os.environ, "WARMUP": warmup, "PYTHONDONTWRITEBYTECODE": "1"}
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {process.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("Server did not answer in time")
+            try:
+                if _get(base + "/") == 200:
+                    break
+            except OSError:
+                time.sleep(0.01)
+        listening = time.perf_counter()
+        status = _get(f"{base}/api/stock/{symbol}?news=none")
+        if status != 200:
+            raise RuntimeError(f"Stock data request returned {status}")
+        first_data = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        "first_200_ms": round((listening - started) * 1000, 1),
+        "first_stock_200_ms": round((first_data - started) * 1000, 1),
+        "first_stock_latency_ms": round((first_data - listening) * 1000, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Benchmark app import time and time to first 200")
+    parser.add_argument("--runs", type=int, default=3, help="Server launches per warm-up mode")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--modes", default=",".join(WARMUP_MODES), help="Comma-separated WARMUP modes")
+    parser.add_argument("--forbid", default=",".join(HEAVY_MODULES),
+                        help="Modules that must not be imported at startup")
+    parser.add_argument("--budget-ms", type=float, help="Fail if importing app takes longer")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    imports = import_times()
+    data_folder = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        symbols = generate_dataset(data_folder, symbols=args.symbols, years=args.years)
+        servers = {}
+        for mode in [mode for mode in args.modes.split(",") if mode]:
+            runs = [time_to_first_200(data_folder, symbols[0], mode) for _ in range(args.runs)]
+            servers[mode] = {key: round(statistics.median(run[key] for run in runs), 1) for key in runs[0]}
+    finally:
+        shutil.rmtree(data_folder, ignore_errors=True)
+
+    forbidden = [name for name in args.forbid.split(",") if name in imports["heavy_imported"]]
+    failures = [f"import app loaded {name}" for name in forbidden]
+    if args.budget_ms is not None and imports["total_ms"] > args.budget_ms:
+        failures.append(f"import app took {imports['total_ms']} ms (budget {args.budget_ms} ms)")
+
+    report = {"python": sys.version.split()[0], "imports": imports, "servers": servers, "failures": failures}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if failures:
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Synthetic daily OHLCV data for benchmarks.
+
+Provides functionality for:
+- Reproducible price paths (geometric Brownian motion) per symbol and seed
+- Writing CSVs in the date formats the loader accepts: ISO, ISO with a
+  time and timezone suffix, and DD-MM-YYYY
+- Optionally shuffling rows, and publishing the generated data to the catalog
+
+Usage::
+
+    python -m benchmarks.synthetic --out /tmp/bench-data --symbols 50 --years 10 --date-format dmy
+"""
+
+import os
+import argparse
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMATS = ("iso", "iso_tz", "dmy", "mixed")
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_END = "2025-06-30"
+
+
+def symbol_names(count: int) -> List[str]:
+    """Return ``count`` synthetic symbols: SYN0000, SYN0001, ..."""
+    return [f"SYN{i:04d}" for i in range(count)]
+
+
+def synthetic_ohlcv(years: float = 5, seed: int = 0, end: str = DEFAULT_END,
+                    start_price: Optional[float] = None) -> pd.DataFrame:
+    """
+    Generate business-day OHLCV bars ending at ``end``.
+
+    Args:
+        years (float): Length of history in years of 252 trading days
+        seed (int): Random seed; the same seed always gives the same frame
+        end (str): Last bar date
+        start_price (Optional[float]): First close, random when not given
+
+    Returns:
+        pd.DataFrame: Date, Open, High, Low, Close, Adj Close and Volume columns
+    """
+    rng = np.random.default_rng(seed)
+    rows = max(2, int(years * TRADING_DAYS_PER_YEAR))
+    dates = pd.bdate_range(end=end, periods=rows)
+
+    first = start_price if start_price is not None else float(rng.uniform(50, 3000))
+    log_returns = rng.normal(0.0003, 0.018, rows)
+    log_returns[0] = 0.0
+    close = first * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate(([first], close[:-1])) * (1 + rng.normal(0, 0.004, rows))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, rows)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, rows)))
+    volume = rng.lognormal(13, 0.6, rows).astype(np.int64)
+
+    return pd.DataFrame({
+        "Date": dates,
+        "Open": open_.round(2),
+        "High": high.round(2),
+        "Low": low.round(2),
+        "Close": close.round(2),
+        "Adj Close": close.round(2),
+        "Volume": volume,
+    })
+
+
+def _format_dates(dates: pd.Series, date_format: str) -> pd.Series:
+    if date_format == "iso":
+        return dates.dt.strftime("%Y-%m-%d")
+    if date_format == "iso_tz":
+        return dates.dt.strftime("%Y-%m-%d 00:00:00+05:30")
+    if date_format == "dmy":
+        return dates.dt.strftime("%d-%m-%Y")
+    raise ValueError(f"Invalid date format '{date_format}', expected one of {', '.join(DATE_FORMATS)}")
+
+
+def write_csv(frame: pd.DataFrame, path: str, date_format: str = "iso", shuffle: bool = False,
+              seed: int = 0) -> None:
+    """
+    Write a frame as a data-folder CSV.
+
+    Args:
+        frame (pd.DataFrame): Output of ``synthetic_ohlcv``
+        path (str): Destination file
+        date_format (str): "iso", "iso_tz" or "dmy"
+        shuffle (bool): Write rows in random order, as unsorted sources do
+        seed (int): Seed for the shuffle
+    """
+    out = frame.copy()
+    out["Date"] = _format_dates(out["Date"], date_format)
+    if shuffle:
+        out = out.sample(frac=1.0, random_state=seed)
+    out.to_csv(path, index=False)
+
+
+def generate_dataset(folder: str, symbols: int = 20, years: float = 5, date_format: str = "iso",
+                     shuffle: bool = False, seed: int = 0, catalog: bool = False) -> List[str]:
+    """
+    Write one CSV per synthetic symbol into a folder.
+
+    Args:
+        folder (str): Data folder (created if missing)
+        symbols (int): Number of symbols
+        years (float): History per symbol
+        date_format (str): One of DATE_FORMATS; "mixed" cycles through the others
+        shuffle (bool): Write rows in random order
+        seed (int): Base seed; symbol i uses ``seed + i``
+        catalog (bool): Also publish the CSVs to the columnar catalog
+
+    Returns:
+        List[str]: The generated symbols
+    """
+    if date_format not in DATE_FORMATS:
+        raise ValueError(f"Invalid date format '{date_format}', expected one of {', '.join(DATE_FORMATS)}")
+    os.makedirs(folder, exist_ok=True)
+    concrete = [f for f in DATE_FORMATS if f != "mixed"]
+
+    names = symbol_names(symbols)
+    for i, name in enumerate(names):
+        fmt = concrete[i % len(concrete)] if date_format == "mixed" else date_format
+        frame = synthetic_ohlcv(years, seed=seed + i)
+        write_csv(frame, os.path.join(folder, f"{name}.csv"), fmt, shuffle, seed=seed + i)
+
+    if catalog:
+        from services.catalog import build_catalog
+
+        build_catalog(folder, names)
+    return names
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic OHLCV CSVs")
+    parser.add_argument("--out", required=True, help="Data folder to write")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--date-format", choices=DATE_FORMATS, default="iso")
+    parser.add_argument("--shuffle", action="store_true", help="Write rows in random order")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--catalog", action="store_true", help="Also publish the columnar catalog")
+    args = parser.parse_args(argv)
+
+    names = generate_dataset(args.out, args.symbols, args.years, args.date_format,
+                             args.shuffle, args.seed, args.catalog)
+    print(f"Wrote {len(names)} symbol(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,6 @@ Configuration module for environment-specific settings used across the applicati
 import os
 
 class Config:
-    # Directory where stock CSV data is stored (can be overridden by environment variable)
-    DATA_DIR = os.getenv("DATA_DIR", "data")
\ No newline at end of file
+    # Directory where stock CSV data is stored (can be overridden by environment variable).
+    # The API's price store, the ingest scripts and the Airflow DAG all read it.
+    DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "services", "data"))
\ No newline at end of file
@@ -1,16 +1,17 @@
+import argparse
+from config import Config
+from services.ingestion import DEFAULT_SOURCE, SOURCE_NAMES, Ingestor, make_source
 
+parser = argparse.ArgumentParser(description="Fetch new daily bars into data/*.csv")
+parser.add_argument("--data", default=Config.DATA_DIR, help="Data folder to update")
+parser.add_argument("--source", choices=SOURCE_NAMES,
+                    help=f"Data source, defaults to INGEST_SOURCE or {DEFAULT_SOURCE}")
+parser.add_argument("--fixtures", help="Fixture folder for --source fixture")
+parser.add_argument("--workers", type=int, default=4, help="Tickers fetched concurrently")
+args = parser.parse_args()
 
-import yfinance as yf
-import os
-
-# Make sure the data folder exists
-os.makedirs("data", exist_ok=True)
-
-tickers = ['TCS.NS', 'INFY.NS', 'RELIANCE.NS', 'TCS.BO', 'INFY.BO', 'RELIANCE.BO', 'SBIN.BO', 'HDFCBANK.BO', 'ITC.BO', 'LT.BO', 'BHARTIARTL.BO', 'KOTAKBANK.BO', 'AXISBANK.BO', 'HINDUNILVR.BO', 'BAJFINANCE.BO', 'MARUTI.BO', 'SUNPHARMA.BO', 'WIPRO.BO']
-
-for ticker in tickers:
-    print(f"Downloading {ticker}...")
-    data = yf.download(ticker, period='5y', interval='1d')
-    csv_path = f'data/{ticker}.csv'
-    data.to_csv(csv_path)
-    print(f"Saved: {csv_path}")
\ No newline at end of file
+# Only rows after each symbol's watermark are fetched; files are replaced atomically
+ingestor = Ingestor(args.data, make_source(args.source, args.fixtures))
+for result in ingestor.ingest_all(ingestor.tickers(), max_workers=args.workers):
+    detail = result.get("error") or f"{result['new_rows']} new row(s), watermark {result.get('watermark')}"
+    print(f"{result['ticker']}: {result['status']} ({detail})")
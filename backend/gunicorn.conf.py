@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for the stock API; see ``wsgi.py``.
+
+Every value can be overridden with the usual gunicorn flags or, for the
+ones below, the environment.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Import wsgi.py (and preload the price catalog) once in the master, before forking
+preload_app = True
+
+
+def post_worker_init(worker):
+    """
+    Warm each worker in the background once it is ready to serve.
+
+    Warm-up starts threads, so it runs in the workers; the master stays
+    thread-free and safe to fork.
+    """
+    from services.warmup import start_warm_up
+
+    start_warm_up()
@@ -0,0 +1,27 @@
+"""
+WebSocket push server for new price bars; see ``services/push.py``.
+
+Run from the ``backend`` directory alongside the API::
+
+    python push_server.py
+
+One asyncio process serves every subscriber, so run a single instance
+next to the gunicorn workers; it reads the same data folder and catalog.
+``PUSH_HOST`` and ``PUSH_PORT`` set the address (default ``0.0.0.0:8765``).
+"""
+
+import os
+import asyncio
+import logging
+
+from dotenv import load_dotenv
+
+from services.push import serve
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(os.getenv("PUSH_HOST", "0.0.0.0"), int(os.getenv("PUSH_PORT", "8765"))))
+    except KeyboardInterrupt:
+        pass
@@ -1,19 +1,121 @@
 from flask import Blueprint, request
-from services.stock_service import get_stock_data_handler
-from services.stock_predict import predict_stock_handler
+from services.stock_service import (
+    get_correlation_handler, get_indicators_handler, get_screener_handler, get_sentiment_history_handler,
+    get_stock_data_handler, get_stocks_batch_handler, get_symbols_handler, indicators_etag_key, panel_etag_key,
+    sentiment_history_etag_key, stock_data_etag_key,
+)
+from services.stock_predict import (
+    backtest_etag_key, get_backtest_handler, predict_stock_handler, prediction_etag_key,
+)
+from services.http_cache import conditional
 
 stock_routes = Blueprint('stock_routes', __name__)
 
 # GET /api/stock/<symbol>
 @stock_routes.route('/stock/<symbol>', methods=['GET'])
+@conditional(stock_data_etag_key)
 def get_stock_data(symbol):
     chart_period = request.args.get("chart_period", "1mo")
     table_period = request.args.get("table_period", "1mo")
-    # ✅ only pass 3 args (symbol, chart_period, table_period)
-    return get_stock_data_handler(symbol, chart_period, table_period)
+    start = request.args.get("start")
+    end = request.args.get("end")
+    chart = request.args.get("chart", "figure")
+    max_points = request.args.get("max_points", type=int)
+    method = request.args.get("downsample", "lttb")
+    news = request.args.get("news", "wait")
+    table_format = request.args.get("format", "records")
+    interval = request.args.get("interval", "1d")
+    return get_stock_data_handler(
+        symbol, chart_period, table_period,
+        start=start, end=end, chart=chart, max_points=max_points, method=method, news=news,
+        table_format=table_format, interval=interval,
+    )
+
+# GET /api/stocks?symbols=A,B,C&fields=info,series
+@stock_routes.route('/stocks', methods=['GET'])
+def get_stocks_batch():
+    return get_stocks_batch_handler(
+        request.args.get("symbols", ""),
+        fields=request.args.get("fields", "info"),
+        period=request.args.get("period", "1mo"),
+        max_points=request.args.get("max_points", type=int),
+        method=request.args.get("downsample", "lttb"),
+        news=request.args.get("news", "cached"),
+    )
 
 # GET /api/stock/<symbol>/predict
 @stock_routes.route('/stock/<symbol>/predict', methods=['GET'])
+@conditional(prediction_etag_key)
 def predict(symbol):
-    # ✅ only pass symbol
-    return predict_stock_handler(symbol)
+    max_points = request.args.get("max_points", type=int)
+    method = request.args.get("downsample", "lttb")
+    model = request.args.get("model", "linear")
+    horizon = request.args.get("horizon", 30, type=int)
+    return predict_stock_handler(symbol, max_points, method, model=model, horizon=horizon)
+
+# GET /api/stock/<symbol>/sentiment?window=30&rolling=7
+@stock_routes.route('/stock/<symbol>/sentiment', methods=['GET'])
+@conditional(sentiment_history_etag_key)
+def sentiment_history(symbol):
+    window = request.args.get("window", 30, type=int)
+    rolling = request.args.get("rolling", 7, type=int)
+    return get_sentiment_history_handler(symbol, window, rolling)
+
+# GET /api/stock/<symbol>/indicators?names=rsi14,ema20
+@stock_routes.route('/stock/<symbol>/indicators', methods=['GET'])
+@conditional(indicators_etag_key)
+def indicators(symbol):
+    return get_indicators_handler(
+        symbol,
+        request.args.get("names", ""),
+        period=request.args.get("period", "1y"),
+        start=request.args.get("start"),
+        end=request.args.get("end"),
+    )
+
+# GET /api/symbols?q=tat&limit=10
+@stock_routes.route('/symbols', methods=['GET'])
+def get_symbols():
+    return get_symbols_handler(
+        request.args.get("q", ""),
+        limit=request.args.get("limit", 10, type=int),
+    )
+
+# GET /api/correlation?symbols=A,B,C&period=1y&benchmark=NIFTY&window=60
+@stock_routes.route('/correlation', methods=['GET'])
+@conditional(panel_etag_key)
+def correlation():
+    return get_correlation_handler(
+        request.args.get("symbols"),
+        period=request.args.get("period", "1y"),
+        start=request.args.get("start"),
+        end=request.args.get("end"),
+        min_periods=request.args.get("min_periods", 20, type=int),
+        benchmark=request.args.get("benchmark"),
+        window=request.args.get("window", 60, type=int),
+    )
+
+# GET /api/screener?metric=return&period=1mo&top=10&order=desc
+@stock_routes.route('/screener', methods=['GET'])
+@conditional(panel_etag_key)
+def screener():
+    return get_screener_handler(
+        metric=request.args.get("metric", "return"),
+        period=request.args.get("period", "1mo"),
+        start=request.args.get("start"),
+        end=request.args.get("end"),
+        top=request.args.get("top", 10, type=int),
+        order=request.args.get("order", "desc"),
+        symbols=request.args.get("symbols"),
+    )
+
+# GET /api/backtest?predictors=linear,naive&horizon=5&symbols=TCS,INFY
+@stock_routes.route('/backtest', methods=['GET'])
+@conditional(backtest_etag_key)
+def backtest():
+    return get_backtest_handler(
+        request.args.get("symbols"),
+        predictors=request.args.get("predictors", "linear"),
+        horizon=request.args.get("horizon", 5, type=int),
+        min_train=request.args.get("min_train", 60, type=int),
+    )
@@ -0,0 +1,394 @@
+"""
+Walk-forward backtests of the price predictors.
+
+Provides functionality for:
+- Pluggable predictors: vectorized functions that forecast, at every bar,
+  the close ``horizon`` bars later from the bars up to and including it
+- The linear trend used by the prediction endpoint, refitted at every bar
+  from expanding cumulative sums instead of a loop of fits, plus naive
+  (last close) and drift baselines
+- Out-of-sample MAE, MAPE and directional accuracy per symbol and predictor
+- Evaluating symbols in parallel over a process pool
+- Persisting results in SQLite keyed by symbol data version, so a run only
+  re-evaluates symbols whose prices changed
+
+Results live at ``BACKTEST_DB_PATH`` (default ``<STATE_DIR>/backtest.db``).
+``BACKTEST_WORKERS`` sets the pool size (default: the CPU count); the pool
+is started on the first run with more than one chunk of symbols and kept
+for later runs.
+"""
+
+import os
+import json
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .price_store import STATE_DIR, PriceStore, price_store
+from .regression import date_ordinals
+from .symbols import SymbolRegistry, symbol_registry
+
+BACKTEST_DB_PATH = os.getenv("BACKTEST_DB_PATH", os.path.join(STATE_DIR, "backtest.db"))
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", str(os.cpu_count() or 1)))
+DEFAULT_HORIZON = 5
+MAX_HORIZON = 252
+DEFAULT_MIN_TRAIN = 60
+# Symbols per task submitted to the pool; runs with at most one chunk are evaluated inline
+POOL_CHUNK_SYMBOLS = int(os.getenv("BACKTEST_CHUNK_SYMBOLS", "32"))
+
+Predictor = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    symbol TEXT NOT NULL,
+    predictor TEXT NOT NULL,
+    horizon INTEGER NOT NULL,
+    min_train INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    observations INTEGER NOT NULL,
+    mae REAL,
+    mape REAL,
+    directional_accuracy REAL,
+    evaluated_at TEXT NOT NULL,
+    PRIMARY KEY (symbol, predictor, horizon, min_train)
+);
+"""
+
+
+def _forward_fill(y: np.ndarray) -> np.ndarray:
+    """Replace each NaN with the last valid value before it (leading NaNs stay)."""
+    valid = ~np.isnan(y)
+    last = np.maximum.accumulate(np.where(valid, np.arange(len(y)), -1))
+    return np.where(last >= 0, y[np.maximum(last, 0)], np.nan)
+
+
+def linear_trend(x: np.ndarray, y: np.ndarray, target_x: np.ndarray) -> np.ndarray:
+    """
+    Expanding-window least squares trend of price on date, evaluated at the target dates.
+
+    Forecast ``t`` is the OLS line through every valid bar up to ``t`` (the
+    fit ``TrendModel`` makes on the full history), evaluated at
+    ``target_x[t]``. Sums are taken around the first bar, as in
+    ``TrendStats``, to keep large date ordinals from costing precision.
+    """
+    valid = ~np.isnan(y)
+    if not valid.any():
+        return np.full(len(y), np.nan)
+    origin = int(np.argmax(valid))
+    dx = np.where(valid, x - x[origin], 0.0)
+    dy = np.where(valid, y - y[origin], 0.0)
+    n = np.cumsum(valid)
+    sx, sy = np.cumsum(dx), np.cumsum(dy)
+    sxy, sxx = np.cumsum(dx * dy), np.cumsum(dx * dx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x, mean_y = sx / n, sy / n
+        var_x = sxx - sx * mean_x
+        slope = np.where(var_x > 0, (sxy - sx * mean_y) / var_x, 0.0)
+        return y[origin] + mean_y + slope * (target_x - x[origin] - mean_x)
+
+
+def naive(x: np.ndarray, y: np.ndarray, target_x: np.ndarray) -> np.ndarray:
+    """Random-walk baseline: the last known close."""
+    return _forward_fill(y)
+
+
+def drift(x: np.ndarray, y: np.ndarray, target_x: np.ndarray) -> np.ndarray:
+    """
+    Last known close plus the average daily change so far, per calendar day to the target.
+    """
+    last = _forward_fill(y)
+    valid = ~np.isnan(y)
+    if not valid.any():
+        return last
+    origin = int(np.argmax(valid))
+    last_x = _forward_fill(np.where(valid, x, np.nan))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(last_x > x[origin], (last - y[origin]) / (last_x - x[origin]), 0.0)
+    return last + rate * (target_x - last_x)
+
+
+PREDICTORS: Dict[str, Predictor] = {
+    "linear": linear_trend,
+    "naive": naive,
+    "drift": drift,
+}
+
+
+def register_predictor(name: str, predictor: Predictor) -> None:
+    """
+    Make a predictor available to backtests under ``name``.
+
+    ``predictor(x, y, target_x)`` receives date ordinals, closes (NaN where
+    missing) and, for every bar, the ordinal of the bar ``horizon`` later;
+    it returns one forecast per bar using only the bars up to and including
+    it. It must be a module-level function so worker processes can import it.
+    """
+    PREDICTORS[name] = predictor
+
+
+def evaluate(x: np.ndarray, y: np.ndarray, predictor: Predictor, horizon: int,
+             min_train: int) -> Dict[str, float]:
+    """
+    Walk-forward evaluation of one predictor on one series.
+
+    Every bar ``t`` with at least ``min_train`` valid closes up to it forecasts
+    the close at ``t + horizon``; forecasts are scored against the actual
+    closes.
+
+    Args:
+        x (np.ndarray): Date ordinals, ascending
+        y (np.ndarray): Closes, NaN where missing
+        predictor (Predictor): Forecasting function, see ``register_predictor``
+        horizon (int): Bars ahead to forecast
+        min_train (int): Valid closes required before the first forecast
+
+    Returns:
+        Dict[str, float]: observations, mae, mape (percent) and
+        directional_accuracy (fraction of forecast moves with the sign of the
+        actual move); metrics are NaN without observations
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    origins = len(y) - horizon
+    if origins <= 0:
+        return {"observations": 0, "mae": np.nan, "mape": np.nan, "directional_accuracy": np.nan}
+    forecast = predictor(x, y, np.concatenate([x[horizon:], np.full(horizon, np.nan)]))[:origins]
+    current, actual = y[:origins], y[horizon:]
+    trained = np.cumsum(~np.isnan(y))[:origins] >= min_train
+    scored = trained & np.isfinite(forecast) & np.isfinite(actual) & np.isfinite(current)
+    forecast, current, actual = forecast[scored], current[scored], actual[scored]
+    count = len(actual)
+    if count == 0:
+        return {"observations": 0, "mae": np.nan, "mape": np.nan, "directional_accuracy": np.nan}
+
+    errors = np.abs(forecast - actual)
+    nonzero = actual != 0
+    # A forecast of no change, or an unchanged close, has no direction to score
+    moved = (actual != current) & (forecast != current)
+    return {
+        "observations": count,
+        "mae": float(errors.mean()),
+        "mape": float((errors[nonzero] / np.abs(actual[nonzero])).mean() * 100) if nonzero.any() else np.nan,
+        "directional_accuracy": (
+            float((np.sign(forecast[moved] - current[moved]) == np.sign(actual[moved] - current[moved])).mean())
+            if moved.any() else np.nan
+        ),
+    }
+
+
+# One store per data folder in each worker process; load() keeps nothing cached
+_worker_stores: Dict[str, PriceStore] = {}
+
+
+def _evaluate_symbols(data_folder: str, symbols: Sequence[str], predictors: Dict[str, Predictor],
+                      horizon: int, min_train: int) -> List[Tuple]:
+    """
+    Evaluate every predictor on a chunk of symbols; runs in a worker process or inline.
+
+    Returns:
+        List[Tuple]: (symbol, predictor, version, observations, mae, mape,
+        directional_accuracy) rows
+    """
+    store = _worker_stores.get(data_folder)
+    if store is None:
+        store = _worker_stores[data_folder] = PriceStore(data_folder, max_symbols=1)
+    rows = []
+    for symbol in symbols:
+        data = store.load(symbol)
+        if data is None or "Close" not in data:
+            continue
+        x = date_ordinals(data.dates).astype(np.float64)
+        y = np.asarray(data["Close"], dtype=np.float64)
+        for name, predictor in predictors.items():
+            metrics = evaluate(x, y, predictor, horizon, min_train)
+            rows.append((symbol, name, _version_key(data.version), metrics["observations"],
+                         metrics["mae"], metrics["mape"], metrics["directional_accuracy"]))
+    return rows
+
+
+def _version_key(version: Tuple) -> str:
+    return json.dumps(list(version))
+
+
+def _chunks(items: List[str], count: int) -> List[List[str]]:
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class Backtester:
+    """Runs backtests for the registry's symbols and persists their results."""
+
+    def __init__(self, store: PriceStore = price_store, registry: SymbolRegistry = symbol_registry,
+                 db_path: str = BACKTEST_DB_PATH, workers: int = BACKTEST_WORKERS):
+        self.store = store
+        self.registry = registry
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {"runs": 0, "symbols_evaluated": 0, "symbols_reused": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def versions(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Tuple]:
+        """Return the data version of each symbol (default: every registry symbol) that has data."""
+        versions = {}
+        for symbol in (self.registry.symbols() if symbols is None else symbols):
+            version = self.store.version(symbol)
+            if version is not None:
+                versions[symbol] = version
+        return versions
+
+    @staticmethod
+    def fingerprint(versions: Dict[str, Tuple]) -> str:
+        """Digest of symbol data versions; changes whenever a result could."""
+        return hashlib.blake2b(repr(sorted(versions.items())).encode(), digest_size=16).hexdigest()
+
+    def _stored(self, predictors: Sequence[str], horizon: int, min_train: int) -> Dict[Tuple[str, str], Tuple]:
+        placeholders = ",".join("?" * len(predictors))
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT symbol, predictor, version, observations, mae, mape, directional_accuracy "
+                f"FROM results WHERE horizon = ? AND min_train = ? AND predictor IN ({placeholders})",
+                (horizon, min_train, *predictors),
+            )
+            return {(row[0], row[1]): row for row in cursor}
+
+    def _save(self, rows: List[Tuple], horizon: int, min_train: int) -> None:
+        evaluated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(symbol, predictor, horizon, min_train, version, observations,
+                      *(None if np.isnan(value) else value for value in (mae, mape, accuracy)), evaluated_at)
+                     for symbol, predictor, version, observations, mae, mape, accuracy in rows],
+                )
+
+    def _evaluate(self, symbols: List[str], predictors: Dict[str, Predictor], horizon: int,
+                  min_train: int) -> List[Tuple]:
+        folder = self.store.data_folder
+        chunks = math.ceil(len(symbols) / POOL_CHUNK_SYMBOLS)
+        if self.workers == 1 or chunks <= 1:
+            return _evaluate_symbols(folder, symbols, predictors, horizon, min_train)
+        pool = self._executor()
+        futures = [pool.submit(_evaluate_symbols, folder, chunk, predictors, horizon, min_train)
+                   for chunk in _chunks(symbols, chunks)]
+        rows = []
+        for future in futures:
+            rows.extend(future.result())
+        return rows
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use."""
+        with self._lock:
+            if self._pool is None:
+                # Spawned rather than forked: the caller is usually a threaded server process
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def run(self, symbols: Optional[Sequence[str]] = None, predictors: Sequence[str] = ("linear",),
+            horizon: int = DEFAULT_HORIZON, min_train: int = DEFAULT_MIN_TRAIN) -> Dict:
+        """
+        Backtest predictors on symbols, re-evaluating only symbols whose data changed.
+
+        Args:
+            symbols (Optional[Sequence[str]]): Normalized symbols, defaults to every registry symbol
+            predictors (Sequence[str]): Names from PREDICTORS
+            horizon (int): Bars ahead to forecast
+            min_train (int): Valid closes required before the first forecast
+
+        Returns:
+            Dict: ``results`` rows per symbol and predictor, a ``summary`` per
+            predictor, and the number of symbols ``evaluated`` and ``reused``
+        """
+        unknown = [name for name in predictors if name not in PREDICTORS]
+        if unknown:
+            raise ValueError(f"Unknown predictor(s) {', '.join(unknown)}, expected one of {', '.join(PREDICTORS)}")
+        started = time.perf_counter()
+        versions = self.versions(symbols)
+        stored = self._stored(predictors, horizon, min_train)
+        stale = [symbol for symbol, version in versions.items()
+                 if any(stored.get((symbol, name), (None,) * 3)[2] != _version_key(version) for name in predictors)]
+
+        if stale:
+            rows = self._evaluate(stale, {name: PREDICTORS[name] for name in predictors}, horizon, min_train)
+            self._save(rows, horizon, min_train)
+            stored.update({(row[0], row[1]): row for row in rows})
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["symbols_evaluated"] += len(stale)
+            self._stats["symbols_reused"] += len(versions) - len(stale)
+
+        results = [
+            {"symbol": row[0], "predictor": row[1], "observations": row[3],
+             "mae": row[4], "mape": row[5], "directional_accuracy": row[6]}
+            for row in (stored.get((symbol, name)) for symbol in sorted(versions) for name in predictors)
+            if row is not None
+        ]
+        elapsed = time.perf_counter() - started
+        logging.info(f"Backtest of {len(versions)} symbols ({len(stale)} evaluated) took {elapsed:.2f}s")
+        return {
+            "horizon": horizon,
+            "min_train": min_train,
+            "summary": {name: self._summarize([r for r in results if r["predictor"] == name]) for name in predictors},
+            "results": results,
+            "evaluated": len(stale),
+            "reused": len(versions) - len(stale),
+            "seconds": round(elapsed, 3),
+        }
+
+    @staticmethod
+    def _summarize(results: List[Dict]) -> Dict:
+        """Observation-weighted metrics across symbols."""
+        scored = [r for r in results if r["observations"]]
+        weights = np.array([r["observations"] for r in scored], dtype=np.float64)
+
+        def weighted(key: str) -> Optional[float]:
+            values = np.array([np.nan if r[key] is None else r[key] for r in scored], dtype=np.float64)
+            mask = ~np.isnan(values)
+            return float(np.average(values[mask], weights=weights[mask])) if mask.any() else None
+
+        return {
+            "symbols": len(scored),
+            "observations": int(weights.sum()),
+            "mae": weighted("mae"),
+            "mape": weighted("mape"),
+            "directional_accuracy": weighted("directional_accuracy"),
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return run counters."""
+        with self._lock:
+            return dict(self._stats)
+
+
+# Global instance shared by the backtest endpoint
+backtester = Backtester()
@@ -0,0 +1,54 @@
+"""
+Small thread-safe LRU cache shared by the service modules.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Size-bounded mapping that evicts the least recently used key."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = max(1, maxsize)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for ``key`` and mark it recently used."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._data[key]
+            self._stats["misses"] += 1
+            return default
+
+    def peek(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for ``key`` without touching recency or counters."""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of cache counters and current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._data), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
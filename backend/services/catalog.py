@@ -0,0 +1,237 @@
+"""
+Columnar on-disk catalog for curated price data.
+
+Provides functionality for:
+- Writing each symbol's date-sorted columns as raw ``.npy`` files
+- A small JSON manifest describing every published symbol
+- Memory-mapping published columns read-only, so several workers share
+  pages through the OS cache instead of each parsing CSV text
+- Building the catalog from the CSV files in a data folder
+
+Layout::
+
+    <data folder>/catalog/manifest.json
+    <data folder>/catalog/<SYMBOL>-<generation>/<column>.npy
+
+Symbols are published by writing new generation directories and then
+atomically replacing the manifest, so readers never see partial columns.
+Each symbol keeps its previous generation on disk until the next publish
+of that symbol, so a reader that read the manifest just before a swap can
+still open the entry it saw.
+The manifest carries a catalog-wide ``generation`` that increases with
+every publish; a batch such as the nightly ingest becomes visible at once.
+"""
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+CATALOG_DIRNAME = "catalog"
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+_write_lock = threading.Lock()
+
+
+def catalog_dir_for(data_folder: str) -> str:
+    """Return the catalog directory that lives inside a data folder."""
+    return os.path.join(data_folder, CATALOG_DIRNAME)
+
+
+def _column_filename(name: str) -> str:
+    return name.replace(" ", "_") + ".npy"
+
+
+def read_manifest(catalog_dir: str) -> Dict:
+    """
+    Read the catalog manifest.
+
+    Args:
+        catalog_dir (str): Catalog directory
+
+    Returns:
+        Dict: Parsed manifest, or an empty manifest if none has been published
+    """
+    try:
+        with open(os.path.join(catalog_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"format": FORMAT_VERSION, "generation": 0, "symbols": {}}
+
+
+def _write_manifest(catalog_dir: str, manifest: Dict) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=catalog_dir, prefix=".manifest-", suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(catalog_dir, MANIFEST_NAME))
+
+
+def _stage_symbol(catalog_dir: str, symbol: str, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> str:
+    """Write a symbol's columns into a hidden staging directory and return its path."""
+    staging = tempfile.mkdtemp(dir=catalog_dir, prefix=f".{symbol}-")
+    try:
+        np.save(os.path.join(staging, _column_filename("Date")), np.asarray(dates, dtype="datetime64[ns]"))
+        for name, values in columns.items():
+            np.save(os.path.join(staging, _column_filename(name)), np.ascontiguousarray(values))
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return staging
+
+
+def _generations_before(catalog_dir: str, symbol: str, keep_from: int) -> List[str]:
+    """Return a symbol's generation directories numbered below ``keep_from``."""
+    stale = []
+    for name in os.listdir(catalog_dir):
+        prefix, _, number = name.rpartition("-")
+        if prefix == symbol and number.isdigit() and int(number) < keep_from:
+            stale.append(name)
+    return stale
+
+
+def publish_symbols(catalog_dir: str,
+                    symbols: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray], Optional[Dict]]]) -> Dict[str, Dict]:
+    """
+    Publish several symbols as one catalog generation.
+
+    Every symbol's columns are staged first and the manifest is replaced
+    once, so readers switch to all of the new data together. The manifest's
+    catalog-wide ``generation`` is bumped on every publish. The generation
+    each symbol replaces stays on disk for readers still holding the old
+    manifest; older ones are removed.
+
+    Args:
+        catalog_dir (str): Catalog directory (created if missing)
+        symbols (Dict): Normalized symbol -> (ascending ``datetime64`` dates,
+            numeric columns aligned with the dates, identity of the source
+            file such as its mtime/size or None)
+
+    Returns:
+        Dict[str, Dict]: The manifest entry written for each symbol
+    """
+    if not symbols:
+        return {}
+    os.makedirs(catalog_dir, exist_ok=True)
+    staged = {}
+    try:
+        for symbol, (dates, columns, _) in symbols.items():
+            staged[symbol] = _stage_symbol(catalog_dir, symbol, dates, columns)
+
+        entries, stale = {}, []
+        with _write_lock:
+            manifest = read_manifest(catalog_dir)
+            generation = manifest.get("generation", 0) + 1
+            for symbol, (dates, columns, source) in symbols.items():
+                current = manifest["symbols"].get(symbol)
+                symbol_generation = current["generation"] + 1 if current else 1
+                dirname = f"{symbol}-{symbol_generation}"
+                os.rename(staged.pop(symbol), os.path.join(catalog_dir, dirname))
+                stale.extend(_generations_before(catalog_dir, symbol, symbol_generation - 1))
+
+                entries[symbol] = manifest["symbols"][symbol] = {
+                    "path": dirname,
+                    "generation": symbol_generation,
+                    "rows": int(len(dates)),
+                    "columns": list(columns),
+                    "first_date": str(np.datetime_as_string(dates[0], unit="D")) if len(dates) else None,
+                    "last_date": str(np.datetime_as_string(dates[-1], unit="D")) if len(dates) else None,
+                    "source": source or {},
+                }
+            manifest["format"] = FORMAT_VERSION
+            manifest["generation"] = generation
+            _write_manifest(catalog_dir, manifest)
+    finally:
+        for staging in staged.values():
+            shutil.rmtree(staging, ignore_errors=True)
+
+    # Readers that already mapped a removed generation keep their pages
+    for path in stale:
+        shutil.rmtree(os.path.join(catalog_dir, path), ignore_errors=True)
+    return entries
+
+
+def write_symbol(catalog_dir: str, symbol: str, dates: np.ndarray,
+                 columns: Dict[str, np.ndarray], source: Optional[Dict] = None) -> Dict:
+    """
+    Publish one symbol's columns as a new catalog generation.
+
+    Args:
+        catalog_dir (str): Catalog directory (created if missing)
+        symbol (str): Normalized symbol
+        dates (np.ndarray): Ascending ``datetime64`` array
+        columns (Dict[str, np.ndarray]): Numeric columns aligned with ``dates``
+        source (Optional[Dict]): Identity of the source file, e.g. its mtime/size
+
+    Returns:
+        Dict: The manifest entry written for the symbol
+    """
+    return publish_symbols(catalog_dir, {symbol: (dates, columns, source)})[symbol]
+
+
+def open_symbol(catalog_dir: str, entry: Dict) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Memory-map a published symbol's columns read-only.
+
+    Args:
+        catalog_dir (str): Catalog directory
+        entry (Dict): The symbol's manifest entry
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, np.ndarray]]: Dates and numeric columns
+    """
+    base = os.path.join(catalog_dir, entry["path"])
+
+    def _map(name: str) -> np.ndarray:
+        # Plain ndarray views over the mapping, so encoders don't see a memmap subclass
+        return np.asarray(np.load(os.path.join(base, _column_filename(name)), mmap_mode="r"))
+
+    return _map("Date"), {name: _map(name) for name in entry["columns"]}
+
+
+def build_catalog(data_folder: str, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Convert CSV files in a data folder into catalog entries.
+
+    Symbols whose manifest entry already matches the CSV's mtime and size
+    are skipped; the rest are published together as one generation.
+
+    Args:
+        data_folder (str): Folder holding ``<SYMBOL>.csv`` files
+        symbols (Optional[List[str]]): Symbols to convert, defaults to every CSV
+
+    Returns:
+        Dict[str, Dict]: Manifest entries for the symbols that were published
+    """
+    # Imported here because the price store reads from this module
+    from .price_store import load_csv
+
+    catalog_dir = catalog_dir_for(data_folder)
+    if symbols is None:
+        symbols = sorted(name[:-4] for name in os.listdir(data_folder) if name.endswith(".csv"))
+
+    manifest = read_manifest(catalog_dir)
+    loaded = {}
+    for symbol in symbols:
+        csv_path = os.path.join(data_folder, f"{symbol}.csv")
+        stat = os.stat(csv_path)
+        source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        current = manifest["symbols"].get(symbol)
+        if current and current.get("source") == source:
+            continue
+        try:
+            data = load_csv(symbol, csv_path)
+        except ValueError as e:
+            logging.error(f"Skipping {symbol} in catalog build: {e}")
+            continue
+        loaded[symbol] = (data.dates, data.columns, source)
+
+    published = publish_symbols(catalog_dir, loaded)
+    for symbol, entry in published.items():
+        logging.info(f"Catalog published {symbol}: {entry['rows']} rows")
+    return published
@@ -0,0 +1,124 @@
+"""
+Chart payloads for the stock data endpoint.
+
+Provides functionality for:
+- A lean "series" payload carrying the chart's x/y arrays once
+- Server-side Plotly figure JSON, cached by (symbol, rows, data version)
+- Optional downsampling of the chart range to a point budget
+- Vectorized date formatting for price arrays
+
+Plotly is imported only when a figure actually has to be built, so workers
+that serve the series payload never load it.
+"""
+
+import os
+import json
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import PriceData
+from .downsample import select_rows
+
+CHART_MODES = ("figure", "series")
+CHART_WIDTH = 1200
+CHART_HEIGHT = 600
+
+figure_cache = LRUCache(int(os.getenv("FIGURE_CACHE_SIZE", "128")))
+
+# Character positions that turn "YYYY-MM-DD" into "DD-MM-YYYY"
+_DAY_FIRST_ORDER = [8, 9, 4, 5, 6, 7, 0, 1, 2, 3]
+
+
+def format_dates(dates: np.ndarray, day_first: bool = True) -> np.ndarray:
+    """
+    Format a datetime64 array as DD-MM-YYYY (or ISO) strings without a Python loop.
+
+    Args:
+        dates (np.ndarray): ``datetime64`` array
+        day_first (bool): Use DD-MM-YYYY instead of YYYY-MM-DD
+
+    Returns:
+        np.ndarray: Array of 10-character strings
+    """
+    iso = np.datetime_as_string(dates, unit="D").astype("U10")
+    if not day_first or len(iso) == 0:
+        return iso
+    chars = iso.view("U1").reshape(-1, 10)[:, _DAY_FIRST_ORDER]
+    return np.ascontiguousarray(chars).view("U10").ravel()
+
+
+def _chart_arrays(data: PriceData, lo: int, hi: int, max_points: Optional[int],
+                  method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the chart's dates and closes, downsampled when over budget."""
+    rows = select_rows(data, lo, hi, max_points, method)
+    if rows is None:
+        return data.dates[lo:hi], data["Close"][lo:hi]
+    return data.dates[rows], data["Close"][rows]
+
+
+def build_series(data: PriceData, lo: int, hi: int, max_points: Optional[int] = None,
+                 method: str = "lttb") -> Dict:
+    """
+    Return the chart's Date/Close arrays once, for the client to plot itself.
+
+    Args:
+        data (PriceData): Symbol price data
+        lo (int): First row of the chart range
+        hi (int): Row to stop before
+        max_points (Optional[int]): Point budget, None keeps every row
+        method (str): Downsampling method, "lttb" or "minmax"
+
+    Returns:
+        Dict: ``{"x": [...ISO dates], "y": [...closes]}``
+    """
+    dates, closes = _chart_arrays(data, lo, hi, max_points, method)
+    return {
+        "x": format_dates(dates, day_first=False).tolist(),
+        "y": closes.tolist(),
+    }
+
+
+def build_figures(data: PriceData, lo: int, hi: int, max_points: Optional[int] = None,
+                  method: str = "lttb") -> Tuple[str, str]:
+    """
+    Return the line and area figure JSON for a chart range, building it once per data version.
+
+    Args:
+        data (PriceData): Symbol price data
+        lo (int): First row of the chart range
+        hi (int): Row to stop before
+        max_points (Optional[int]): Point budget, None keeps every row
+        method (str): Downsampling method, "lttb" or "minmax"
+
+    Returns:
+        Tuple[str, str]: Serialized line chart and area chart
+    """
+    key = (data.symbol, lo, hi, max_points, method, data.version)
+    cached = figure_cache.get(key)
+    if cached is not None:
+        return cached
+
+    import plotly
+    import plotly.express as px
+
+    dates, closes = _chart_arrays(data, lo, hi, max_points, method)
+    chart_data = {"Date": format_dates(dates), "Close": closes}
+
+    # Generate line chart
+    fig1 = px.line(chart_data, x="Date", y="Close",
+                   title=f"{data.symbol} Stock Price Over Time", markers=True)
+    fig1.update_layout(width=CHART_WIDTH, height=CHART_HEIGHT)
+    fig1.update_xaxes(autorange="reversed")
+    graphJSON1 = json.dumps(fig1, cls=plotly.utils.PlotlyJSONEncoder)
+
+    # Generate area chart
+    fig2 = px.area(chart_data, x="Date", y="Close",
+                   title=f"{data.symbol} Stock Price Area Chart", markers=True)
+    fig2.update_layout(width=CHART_WIDTH, height=CHART_HEIGHT)
+    fig2.update_xaxes(autorange="reversed")
+    graphJSON2 = json.dumps(fig2, cls=plotly.utils.PlotlyJSONEncoder)
+
+    figure_cache.put(key, (graphJSON1, graphJSON2))
+    return graphJSON1, graphJSON2
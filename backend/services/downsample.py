@@ -0,0 +1,186 @@
+"""
+Shape-preserving downsampling for chart series.
+
+Provides functionality for:
+- Largest-Triangle-Three-Buckets (LTTB) point selection
+- Per-bucket min/max point selection, fully vectorized
+- Caching the selected row indices per (symbol, range, points, method, data version)
+
+Both methods return row indices rather than values, so the same selection
+can be applied to the dates and to any price column.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import PriceData
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+MIN_POINTS = 4
+# LTTB scores width**2 areas per bucket in table mode; wider buckets use the per-bucket loop
+TABLE_MAX_WIDTH = 16
+TABLE_MAX_CELLS = 1 << 20
+
+index_cache = LRUCache(int(os.getenv("DOWNSAMPLE_CACHE_SIZE", "256")))
+
+
+def _lttb_loop(x: np.ndarray, y: np.ndarray, starts: np.ndarray, stops: np.ndarray,
+               avg_x: np.ndarray, avg_y: np.ndarray, selected: np.ndarray) -> None:
+    """Pick each bucket's point in turn, scoring the whole bucket against the previous pick."""
+    a = 0
+    for i in range(len(starts)):
+        lo, hi = starts[i], stops[i]
+        next_x, next_y = avg_x[i + 1], avg_y[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        areas = np.abs((x[a] - next_x) * (by - y[a]) - (x[a] - bx) * (next_y - y[a]))
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+
+
+def _lttb_table(x: np.ndarray, y: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                avg_x: np.ndarray, avg_y: np.ndarray, selected: np.ndarray) -> None:
+    """
+    Pick every bucket's point from a table of winners, one per possible previous pick.
+
+    Buckets are padded to the widest one by repeating their last point,
+    which never wins a tie against it. The triangle areas for every pair of
+    (candidate in the previous bucket, candidate in this bucket) are scored
+    at once; only following the chain of winners is sequential.
+    """
+    buckets, width = len(starts), int(counts.max())
+    grid = starts[:, None] + np.minimum(np.arange(width), counts[:, None] - 1)
+    grid_x, grid_y = x[grid], y[grid]
+    # Candidates for the previous pick: the first point, then each earlier bucket
+    prev_x = np.concatenate((np.full((1, width), x[0]), grid_x[:-1]))[:, :, None]
+    prev_y = np.concatenate((np.full((1, width), y[0]), grid_y[:-1]))[:, :, None]
+    next_x, next_y = avg_x[1:, None, None], avg_y[1:, None, None]
+
+    winners = np.empty((buckets, width), dtype=np.int64)
+    chunk = max(1, TABLE_MAX_CELLS // (width * width))
+    for lo in range(0, buckets, chunk):
+        hi = min(lo + chunk, buckets)
+        ax, ay, nx, ny = prev_x[lo:hi], prev_y[lo:hi], next_x[lo:hi], next_y[lo:hi]
+        bx, by = grid_x[lo:hi, None, :], grid_y[lo:hi, None, :]
+        winners[lo:hi] = np.argmax(np.abs((ax - nx) * (by - ay) - (ax - bx) * (ny - ay)), axis=2)
+
+    picks = np.empty(buckets, dtype=np.int64)
+    pick = 0
+    for i, row in enumerate(winners.tolist()):
+        pick = picks[i] = row[pick]
+    selected[1:-1] = grid[np.arange(buckets), picks]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Select ``max_points`` indices with Largest-Triangle-Three-Buckets.
+
+    Bucket averages are computed in one vectorized pass. Each bucket's pick
+    depends on the previous one, so with narrow buckets (the usual chart
+    case, a few rows per point) the areas for every possible previous pick
+    are scored together and the chain is followed afterwards; wider buckets
+    are scored one at a time, where the per-bucket work already dominates.
+
+    Args:
+        x (np.ndarray): Ascending x values
+        y (np.ndarray): Values aligned with ``x``
+        max_points (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Ascending indices into ``x``/``y``
+    """
+    n = len(y)
+    if max_points >= n or max_points < MIN_POINTS:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+
+    # max_points - 2 buckets over the interior points; the last point is its own bucket
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts = edges[:-1]
+    stops = edges[1:]
+    counts = stops - starts
+    avg_x = np.append(np.add.reduceat(x, starts) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y, starts) / counts, y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    if counts.max() <= TABLE_MAX_WIDTH:
+        _lttb_table(x, y, starts, counts, avg_x, avg_y, selected)
+    else:
+        _lttb_loop(x, y, starts, stops, avg_x, avg_y, selected)
+    return selected
+
+
+def minmax_indices(y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Keep the first, last, minimum and maximum points of equal-width buckets.
+
+    Args:
+        y (np.ndarray): Values to downsample
+        max_points (int): Upper bound on the number of points kept
+
+    Returns:
+        np.ndarray: Ascending, de-duplicated indices into ``y``
+    """
+    n = len(y)
+    if max_points >= n or max_points < MIN_POINTS:
+        return np.arange(n)
+
+    buckets = max(1, (max_points - 2) // 2)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(buckets, size)
+
+    offsets = np.arange(buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(grid), np.inf, grid), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(grid), -np.inf, grid), axis=1)
+    picked = np.concatenate(([0, n - 1], np.minimum(lows, n - 1), np.minimum(highs, n - 1)))
+    return np.unique(picked)
+
+
+def validate(max_points: Optional[int], method: str) -> None:
+    """Raise ValueError for an unusable ``max_points`` or ``method``."""
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Invalid downsample method '{method}', expected one of {', '.join(DOWNSAMPLE_METHODS)}")
+    if max_points is not None and max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+
+
+def select_rows(data: PriceData, lo: int, hi: int, max_points: Optional[int],
+                method: str = "lttb", column: str = "Close") -> Optional[np.ndarray]:
+    """
+    Return absolute row indices that represent ``[lo, hi)`` in at most ``max_points`` points.
+
+    Args:
+        data (PriceData): Symbol price data
+        lo (int): First row of the range
+        hi (int): Row to stop before
+        max_points (Optional[int]): Point budget, None disables downsampling
+        method (str): "lttb" or "minmax"
+        column (str): Column whose shape should be preserved
+
+    Returns:
+        Optional[np.ndarray]: Row indices, or None when the range already fits
+    """
+    if max_points is None or hi - lo <= max_points:
+        return None
+
+    key = (data.symbol, lo, hi, max_points, method, column, data.version)
+    rows = index_cache.get(key)
+    if rows is None:
+        y = data[column][lo:hi]
+        if method == "minmax":
+            rows = minmax_indices(y, max_points)
+        else:
+            x = data.dates[lo:hi].astype("datetime64[D]").astype(np.int64)
+            rows = lttb_indices(x, y, max_points)
+        rows = rows + lo
+        rows.flags.writeable = False
+        index_cache.put(key, rows)
+    return rows
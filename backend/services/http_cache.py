@@ -0,0 +1,144 @@
+"""
+Conditional GET and precompressed bodies for read-only API routes.
+
+Provides functionality for:
+- Strong ETags derived from the route, symbol, data version and query
+  string, suffixed with the body's content coding (``"<digest>-gzip"``)
+  so each encoded representation has its own validator
+- ``304 Not Modified`` answers before any price data is loaded
+- gzip (and brotli, when installed) bodies cached per ETag, so repeat
+  hits cost a dictionary lookup instead of a rebuild and recompression
+
+A route opts in with the ``conditional`` decorator and a key function that
+returns the cheap identity of the response, e.g. the symbol and its
+``price_store.version``. The key function must cover everything the body
+depends on apart from the query string, which is always included.
+"""
+
+import os
+import gzip
+import hashlib
+import functools
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, current_app, request
+
+from .cache import LRUCache
+from .telemetry import profiling
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# (etag, negotiated encoding) -> (body bytes, mimetype, content-encoding)
+body_cache = LRUCache(int(os.getenv("RESPONSE_CACHE_SIZE", "256")))
+
+
+def make_etag(*parts) -> str:
+    """Return a stable hex digest of the given hashable parts."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def _coded_etag(etag: str, encoding: str) -> str:
+    """Return the ETag of the representation sent with the given content coding."""
+    return etag if encoding == "identity" else f"{etag}-{encoding}"
+
+
+def _negotiate_encoding() -> str:
+    """Pick the best encoding the client accepts: br, gzip or identity."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return "identity"
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+def _cached_response(etag: str, body: bytes, mimetype: str, encoding: str) -> Response:
+    response = Response(body, status=200, mimetype=mimetype)
+    _set_validators(response, _coded_etag(etag, encoding))
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _set_validators(response: Response, etag: str) -> None:
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+
+
+def conditional(key_func: Callable[..., Optional[Tuple]]):
+    """
+    Decorate a Flask view with ETag validation and compressed body caching.
+
+    Args:
+        key_func (Callable): Called with the view's keyword arguments and the
+            request args; returns the parts identifying the response body,
+            or None to bypass caching for this request
+
+    Returns:
+        Callable: The decorator
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            def current_etag() -> Optional[str]:
+                parts = key_func(request.args, **kwargs)
+                if parts is None:
+                    return None
+                return make_etag(view.__name__, parts, tuple(sorted(request.args.items(multi=True))))
+
+            # Profiled requests must run the view, not replay a cached body
+            etag = None if profiling() else current_etag()
+            if etag is None:
+                return view(**kwargs)
+
+            # Bodies below MIN_COMPRESS_BYTES go out unencoded whatever was
+            # negotiated, so the identity tag also validates
+            negotiated = _negotiate_encoding()
+            for encoding in dict.fromkeys((negotiated, "identity")):
+                if request.if_none_match.contains(_coded_etag(etag, encoding)) or request.if_none_match.star_tag:
+                    not_modified = Response(status=304)
+                    _set_validators(not_modified, _coded_etag(etag, encoding))
+                    return not_modified
+
+            cached = body_cache.get((etag, negotiated))
+            if cached is not None:
+                return _cached_response(etag, *cached)
+
+            response = current_app.make_response(view(**kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            # News may have been fetched while building the body, so key the
+            # cached body on the state it was actually built from
+            etag = current_etag() or etag
+            body = response.get_data()
+            encoding = negotiated if len(body) >= MIN_COMPRESS_BYTES else "identity"
+            entry = (_compress(body, encoding), response.mimetype, encoding)
+            body_cache.put((etag, negotiated), entry)
+            return _cached_response(etag, *entry)
+
+        return wrapper
+    return decorator
+
+
+def get_stats() -> Dict[str, int]:
+    """Return body cache counters."""
+    return body_cache.get_stats()
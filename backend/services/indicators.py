@@ -0,0 +1,496 @@
+"""
+Technical indicators over the shared price arrays.
+
+Provides functionality for:
+- SMA, EMA, RSI, MACD, Bollinger Bands and VWAP, computed with NumPy over a
+  symbol's full history
+- O(1) per-bar updates when bars are appended, from state kept with each result
+- Results cached per (symbol, indicator, params) and validated by data version
+- Parsing indicator names such as ``rsi14``, ``ema20``, ``macd12_26_9``,
+  ``bb20_2`` and ``vwap`` / ``vwap20``
+
+Exponential averages follow ``pandas.Series.ewm(adjust=False)``; RSI uses
+Wilder's smoothing (``alpha = 1 / n``) with the first ``n`` rows empty, and
+Bollinger Bands use the population standard deviation. Missing prices are
+carried forward from the previous bar.
+"""
+
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import PriceData
+
+INDICATOR_NAMES = ("sma", "ema", "rsi", "macd", "bb", "vwap")
+MAX_INDICATOR_WINDOW = 1000
+_NAME_PATTERN = re.compile(r"^(sma|ema|rsi|macd|bb|vwap)(\d+(?:\.\d+)?(?:_\d+(?:\.\d+)?)*)?$")
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Carry the last valid value forward over NaNs; leading NaNs stay NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    if valid.all():
+        return values
+    index = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    filled[:np.argmax(valid) if valid.any() else len(values)] = np.nan
+    return filled
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    ``y[0] = x[0]; y[t] = alpha * x[t] + (1 - alpha) * y[t - 1]`` over NaN-free input.
+
+    Evaluated in closed form, ``y[s + j] = d**j * (y[s] + sum(alpha * x[s + i] / d**i))``
+    with ``d = 1 - alpha``, over blocks short enough that ``d**-j`` stays far
+    from overflow, so a whole history costs a few vectorized passes.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    # Keep decay ** -block below about 1e100
+    block = max(1, int(230.0 / -np.log(decay)))
+    powers = decay ** np.arange(1, min(block, len(values)) + 1)
+    previous = values[0]
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        scale = powers[:len(chunk)]
+        out[start:start + len(chunk)] = scale * (previous + np.cumsum(alpha * chunk / scale))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sums over ``window`` rows; NaN until ``window`` rows past any leading NaNs."""
+    out = np.full(len(values), np.nan)
+    start = _valid_start(values)
+    if len(values) - start >= window:
+        cumulative = np.concatenate(([0.0], np.cumsum(values[start:])))
+        out[start + window - 1:] = cumulative[window:] - cumulative[:-window]
+    return out
+
+
+def _valid_start(values: np.ndarray) -> int:
+    valid = ~np.isnan(values)
+    return int(np.argmax(valid)) if valid.any() else len(values)
+
+
+class Indicator(ABC):
+    """
+    One parameterized indicator.
+
+    ``compute`` returns every output column for the full history plus the
+    state needed to continue; ``step`` advances that state by one bar.
+    """
+
+    inputs: Tuple[str, ...] = ("Close",)
+    outputs: Tuple[str, ...] = ()
+
+    @abstractmethod
+    def compute(self, columns: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], dict]:
+        """Return every output column for the full history and the state after its last bar."""
+
+    @abstractmethod
+    def step(self, state: dict, bar: Dict[str, float]) -> Tuple[Tuple[float, ...], dict]:
+        """Advance the state by one bar and return the outputs for it."""
+
+
+class SMA(Indicator):
+    outputs = ("sma",)
+
+    def __init__(self, window: int = 20):
+        self.window = window
+
+    def compute(self, columns):
+        close = _ffill(columns["Close"])
+        sma = _rolling_sum(close, self.window) / self.window
+        tail = close[max(_valid_start(close), len(close) - self.window):]
+        state = {"buffer": deque(tail.tolist(), maxlen=self.window), "sum": float(np.sum(tail)),
+                 "last": float(close[-1]) if len(close) else np.nan}
+        return {"sma": sma}, state
+
+    def step(self, state, bar):
+        value = bar["Close"] if not np.isnan(bar["Close"]) else state["last"]
+        if np.isnan(value):
+            return (np.nan,), state
+        buffer = state["buffer"]
+        if len(buffer) == self.window:
+            state["sum"] -= buffer[0]
+        buffer.append(value)
+        state["sum"] += value
+        state["last"] = value
+        return (state["sum"] / self.window if len(buffer) == self.window else np.nan,), state
+
+
+class EMA(Indicator):
+    outputs = ("ema",)
+
+    def __init__(self, span: int = 20):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+
+    def compute(self, columns):
+        close = _ffill(columns["Close"])
+        ema = np.full(len(close), np.nan)
+        start = _valid_start(close)
+        ema[start:] = _ewm(close[start:], self.alpha)
+        state = {"ema": float(ema[-1]) if len(ema) else np.nan,
+                 "last": float(close[-1]) if len(close) else np.nan}
+        return {"ema": ema}, state
+
+    def step(self, state, bar):
+        value = bar["Close"] if not np.isnan(bar["Close"]) else state["last"]
+        state["last"] = value
+        if not np.isnan(value):
+            previous = state["ema"]
+            state["ema"] = value if np.isnan(previous) else self.alpha * value + (1 - self.alpha) * previous
+        return (state["ema"],), state
+
+
+class RSI(Indicator):
+    outputs = ("rsi",)
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.alpha = 1.0 / window
+
+    @staticmethod
+    def _rsi(gain, loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def compute(self, columns):
+        close = _ffill(columns["Close"])
+        rsi = np.full(len(close), np.nan)
+        start = _valid_start(close)
+        delta = np.diff(close[start:])
+        state = {"last": float(close[-1]) if len(close) else np.nan, "gain": np.nan, "loss": np.nan, "count": 0}
+        if len(delta):
+            gain = _ewm(np.clip(delta, 0, None), self.alpha)
+            loss = _ewm(np.clip(-delta, 0, None), self.alpha)
+            values = self._rsi(gain, loss)
+            values[:self.window - 1] = np.nan
+            rsi[start + 1:] = values
+            state.update(gain=float(gain[-1]), loss=float(loss[-1]), count=len(delta))
+        return {"rsi": rsi}, state
+
+    def step(self, state, bar):
+        value = bar["Close"] if not np.isnan(bar["Close"]) else state["last"]
+        if np.isnan(state["last"]):
+            state["last"] = value
+            return (np.nan,), state
+        delta = value - state["last"]
+        state["last"] = value
+        up, down = max(delta, 0.0), max(-delta, 0.0)
+        if state["count"] == 0:
+            state["gain"], state["loss"] = up, down
+        else:
+            state["gain"] = self.alpha * up + (1 - self.alpha) * state["gain"]
+            state["loss"] = self.alpha * down + (1 - self.alpha) * state["loss"]
+        state["count"] += 1
+        if state["count"] < self.window:
+            return (np.nan,), state
+        return (float(self._rsi(np.float64(state["gain"]), np.float64(state["loss"]))),), state
+
+
+class MACD(Indicator):
+    outputs = ("macd", "signal", "histogram")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+
+    def compute(self, columns):
+        fast, fast_state = self.fast.compute(columns)
+        slow, slow_state = self.slow.compute(columns)
+        macd = fast["ema"] - slow["ema"]
+        signal, signal_state = self.signal.compute({"Close": macd})
+        state = {"fast": fast_state, "slow": slow_state, "signal": signal_state}
+        return {"macd": macd, "signal": signal["ema"], "histogram": macd - signal["ema"]}, state
+
+    def step(self, state, bar):
+        (fast,), state["fast"] = self.fast.step(state["fast"], bar)
+        (slow,), state["slow"] = self.slow.step(state["slow"], bar)
+        macd = fast - slow
+        (signal,), state["signal"] = self.signal.step(state["signal"], {"Close": macd})
+        return (macd, signal, macd - signal), state
+
+
+class Bollinger(Indicator):
+    outputs = ("middle", "upper", "lower")
+
+    def __init__(self, window: int = 20, width: float = 2.0):
+        self.window = window
+        self.width = width
+
+    def compute(self, columns):
+        close = _ffill(columns["Close"])
+        start = _valid_start(close)
+        # Shift by the first price so the running sums of squares keep their precision
+        origin = float(close[start]) if start < len(close) else 0.0
+        shifted = close - origin
+        mean = _rolling_sum(shifted, self.window) / self.window
+        variance = np.maximum(_rolling_sum(shifted * shifted, self.window) / self.window - mean * mean, 0.0)
+        std = np.sqrt(variance)
+        middle = mean + origin
+        tail = shifted[max(start, len(shifted) - self.window):]
+        state = {"origin": origin, "buffer": deque(tail.tolist(), maxlen=self.window),
+                 "sum": float(np.sum(tail)), "sumsq": float(np.sum(tail * tail)),
+                 "last": float(close[-1]) if len(close) else np.nan}
+        return {"middle": middle, "upper": middle + self.width * std, "lower": middle - self.width * std}, state
+
+    def step(self, state, bar):
+        value = bar["Close"] if not np.isnan(bar["Close"]) else state["last"]
+        if np.isnan(value):
+            return (np.nan, np.nan, np.nan), state
+        if np.isnan(state["last"]):
+            # First price after an all-missing prefix
+            state["origin"] = value
+        state["last"] = value
+        shifted = value - state["origin"]
+        buffer = state["buffer"]
+        if len(buffer) == self.window:
+            old = buffer[0]
+            state["sum"] -= old
+            state["sumsq"] -= old * old
+        buffer.append(shifted)
+        state["sum"] += shifted
+        state["sumsq"] += shifted * shifted
+        if len(buffer) < self.window:
+            return (np.nan, np.nan, np.nan), state
+        mean = state["sum"] / self.window
+        std = max(state["sumsq"] / self.window - mean * mean, 0.0) ** 0.5
+        middle = mean + state["origin"]
+        return (middle, middle + self.width * std, middle - self.width * std), state
+
+
+class VWAP(Indicator):
+    """Volume-weighted typical price, over the whole history or a trailing window."""
+
+    inputs = ("High", "Low", "Close", "Volume")
+    outputs = ("vwap",)
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window
+
+    @staticmethod
+    def _flows(high, low, close, volume):
+        typical = (high + low + close) / 3.0
+        volume = np.where(np.isnan(typical), 0.0, volume)
+        return np.nan_to_num(typical) * volume, volume
+
+    def compute(self, columns):
+        price_volume, volume = self._flows(columns["High"], columns["Low"], columns["Close"],
+                                           np.asarray(columns["Volume"], dtype=np.float64))
+        if self.window is None:
+            pv_sum, v_sum = np.cumsum(price_volume), np.cumsum(volume)
+            state = {"pv": float(pv_sum[-1]) if len(pv_sum) else 0.0, "v": float(v_sum[-1]) if len(v_sum) else 0.0}
+        else:
+            pv_sum, v_sum = _rolling_sum(price_volume, self.window), _rolling_sum(volume, self.window)
+            state = {"buffer": deque(zip(price_volume[-self.window:].tolist(), volume[-self.window:].tolist()),
+                                     maxlen=self.window),
+                     "pv": float(np.sum(price_volume[-self.window:])), "v": float(np.sum(volume[-self.window:]))}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vwap = np.where(v_sum > 0, pv_sum / v_sum, np.nan)
+        return {"vwap": vwap}, state
+
+    def step(self, state, bar):
+        pv, v = self._flows(*(np.float64(bar[name]) for name in self.inputs))
+        pv, v = float(pv), float(v)
+        if self.window is not None:
+            buffer = state["buffer"]
+            if len(buffer) == self.window:
+                old_pv, old_v = buffer[0]
+                state["pv"] -= old_pv
+                state["v"] -= old_v
+            buffer.append((pv, v))
+            if len(buffer) < self.window:
+                state["pv"] += pv
+                state["v"] += v
+                return (np.nan,), state
+        state["pv"] += pv
+        state["v"] += v
+        return (state["pv"] / state["v"] if state["v"] > 0 else np.nan,), state
+
+
+def parse_indicator(name: str) -> Tuple[str, Indicator]:
+    """
+    Build an indicator from a name like ``rsi14`` or ``macd12_26_9``.
+
+    Returns:
+        Tuple[str, Indicator]: Canonical name and the indicator
+
+    Raises:
+        ValueError: If the name or its parameters are invalid
+    """
+    match = _NAME_PATTERN.match(name.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid indicator '{name}', expected one of {', '.join(INDICATOR_NAMES)} "
+                         f"followed by parameters, e.g. rsi14 or macd12_26_9")
+    kind, raw = match.group(1), match.group(2)
+    params = [float(p) for p in raw.split("_")] if raw else []
+
+    def window(value: float) -> int:
+        if value != int(value) or not 1 <= value <= MAX_INDICATOR_WINDOW:
+            raise ValueError(f"Invalid window {value:g} in '{name}', expected 1-{MAX_INDICATOR_WINDOW}")
+        return int(value)
+
+    if kind in ("sma", "ema", "rsi") and len(params) > 1:
+        raise ValueError(f"'{name}' takes a single window")
+    if kind == "sma":
+        n = window(params[0]) if params else 20
+        return f"sma{n}", SMA(n)
+    if kind == "ema":
+        n = window(params[0]) if params else 20
+        return f"ema{n}", EMA(n)
+    if kind == "rsi":
+        n = window(params[0]) if params else 14
+        return f"rsi{n}", RSI(n)
+    if kind == "macd":
+        if len(params) not in (0, 3):
+            raise ValueError(f"'{name}' takes fast, slow and signal windows, e.g. macd12_26_9")
+        fast, slow, signal = (window(p) for p in params) if params else (12, 26, 9)
+        return f"macd{fast}_{slow}_{signal}", MACD(fast, slow, signal)
+    if kind == "bb":
+        if len(params) > 2:
+            raise ValueError(f"'{name}' takes a window and a width, e.g. bb20_2")
+        n = window(params[0]) if params else 20
+        width = params[1] if len(params) > 1 else 2.0
+        return f"bb{n}_{width:g}", Bollinger(n, width)
+    if len(params) > 1:
+        raise ValueError(f"'{name}' takes at most one window")
+    if params:
+        n = window(params[0])
+        return f"vwap{n}", VWAP(n)
+    return "vwap", VWAP()
+
+
+class _Buffer:
+    """Growable float64 array with amortized O(1) append."""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, values: np.ndarray):
+        self.size = len(values)
+        self.data = np.empty(max(16, int(self.size * 1.25)), dtype=np.float64)
+        self.data[:self.size] = values
+
+    def append(self, value: float) -> None:
+        if self.size == len(self.data):
+            grown = np.empty(len(self.data) * 2, dtype=np.float64)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self) -> np.ndarray:
+        out = self.data[:self.size]
+        out.flags.writeable = False
+        return out
+
+
+class _Entry:
+    __slots__ = ("version", "rows", "digest", "buffers", "state", "lock")
+
+    def __init__(self, version, rows, digest, buffers, state):
+        self.version = version
+        self.rows = rows
+        self.digest = digest
+        self.buffers = buffers
+        self.state = state
+        self.lock = threading.Lock()
+
+
+class IndicatorEngine:
+    """Per-symbol indicator results, memoized by data version and extended in place on appends."""
+
+    def __init__(self, max_entries: int = 512):
+        self._entries = LRUCache(max_entries)
+        self._stats = {"memoized": 0, "incremental": 0, "full": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def compute(self, data: PriceData, name: str) -> Dict[str, np.ndarray]:
+        """
+        Return an indicator's output columns aligned with ``data.dates``.
+
+        Args:
+            data (PriceData): Symbol price data
+            name (str): Indicator name, e.g. ``rsi14``
+
+        Returns:
+            Dict[str, np.ndarray]: Read-only output arrays, NaN where undefined
+
+        Raises:
+            ValueError: If the name is invalid or the data lacks a required column
+        """
+        canonical, indicator = parse_indicator(name)
+        missing = [column for column in indicator.inputs if column not in data]
+        if missing:
+            raise ValueError(f"{canonical} needs column(s): {', '.join(missing)}")
+
+        key = (data.symbol, canonical)
+        rows = len(data)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            with entry.lock:
+                if entry.version == data.version:
+                    self._count("memoized")
+                    return {out: buf.view() for out, buf in zip(indicator.outputs, entry.buffers)}
+                # Extend only if the bars already computed are unchanged
+                appended = (
+                    rows >= entry.rows > 0
+                    and entry.buffers[0].size == entry.rows
+                    and data.prefix_digest(entry.rows, indicator.inputs) == entry.digest
+                )
+                if appended:
+                    self._count("incremental")
+                    columns = {column: data[column] for column in indicator.inputs}
+                    for i in range(entry.rows, rows):
+                        values, entry.state = indicator.step(
+                            entry.state, {column: float(columns[column][i]) for column in indicator.inputs}
+                        )
+                        for buf, value in zip(entry.buffers, values):
+                            buf.append(value)
+                    entry.version, entry.rows = data.version, rows
+                    entry.digest = data.prefix_digest(rows, indicator.inputs)
+                    return {out: buf.view() for out, buf in zip(indicator.outputs, entry.buffers)}
+
+        self._count("full")
+        outputs, state = indicator.compute({column: data[column] for column in indicator.inputs})
+        buffers = [_Buffer(outputs[out]) for out in indicator.outputs]
+        self._entries.put(key, _Entry(data.version, rows, data.prefix_digest(rows, indicator.inputs), buffers, state))
+        return {out: buf.view() for out, buf in zip(indicator.outputs, buffers)}
+
+    def compute_many(self, data: PriceData, names: List[str]) -> Dict[str, Dict[str, np.ndarray]]:
+        """Compute several indicators, keyed by their canonical names."""
+        return {parse_indicator(name)[0]: self.compute(data, name) for name in names}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counts of memoized, incremental and full computations."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+
+
+# Global instance shared by the indicators endpoint
+indicator_engine = IndicatorEngine(int(os.getenv("INDICATOR_CACHE_SIZE", "512")))
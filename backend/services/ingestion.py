@@ -0,0 +1,369 @@
+"""
+Incremental market data ingestion into the data folder.
+
+Provides functionality for:
+- Pluggable data sources: yfinance, or a local fixture folder for offline runs
+  and tests
+- A per-symbol high-watermark (last stored date), so each run fetches and
+  appends only newer rows
+- Schema and date validation of fetched and stored data
+- Publishing by writing a temp file in the data folder and renaming it over
+  the CSV, so readers never see a partially written file
+- Ingesting many tickers with bounded parallelism
+
+Watermarks are kept in ``<data folder>/watermarks/<SYMBOL>.json``; when one
+is missing the stored CSV's last date is used instead. A watermark also
+records the provider ticker the symbol was downloaded as (``TCS.NS`` for
+``TCS.csv``), so scheduled runs refresh the same listing.
+
+The source is chosen by the ``INGEST_SOURCE`` environment variable and
+defaults to ``yfinance`` everywhere: ``generate_csvs.py``, the Airflow DAG
+and ``make_source``. Set ``INGEST_SOURCE=fixture`` (with
+``INGEST_FIXTURE_DIR``) for offline runs.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .price_store import PRICE_COLUMNS, VOLUME_COLUMN, parse_dates
+from .symbols import normalize_symbol
+
+REQUIRED_COLUMNS = ("Date", "Open", "High", "Low", "Close", "Volume")
+OUTPUT_COLUMNS = ("Date", "Open", "High", "Low", "Close", "Adj Close", "Volume")
+WATERMARK_DIRNAME = "watermarks"
+DEFAULT_HISTORY_YEARS = 5
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+SOURCE_NAMES = ("yfinance", "fixture")
+DEFAULT_SOURCE = "yfinance"
+# Provider tickers for symbols that have not been ingested yet
+DEFAULT_TICKERS = (
+    "TCS.NS", "INFY.NS", "RELIANCE.NS", "TCS.BO", "INFY.BO", "RELIANCE.BO", "SBIN.BO", "HDFCBANK.BO",
+    "ITC.BO", "LT.BO", "BHARTIARTL.BO", "KOTAKBANK.BO", "AXISBANK.BO", "HINDUNILVR.BO", "BAJFINANCE.BO",
+    "MARUTI.BO", "SUNPHARMA.BO", "WIPRO.BO",
+)
+
+
+class IngestError(ValueError):
+    """Raised when fetched or stored data fails validation."""
+
+
+def symbol_for(ticker: str) -> str:
+    """Return the data-folder symbol for a ticker, e.g. TCS.NS -> TCS."""
+    return normalize_symbol(ticker)
+
+
+class DataSource(ABC):
+    """Interface for daily OHLCV providers."""
+
+    name = "base"
+
+    @abstractmethod
+    def fetch(self, ticker: str, start: date) -> pd.DataFrame:
+        """
+        Return daily bars for a ticker from ``start`` (inclusive) onwards.
+
+        Args:
+            ticker (str): Provider ticker, e.g. TCS.NS
+            start (date): First date wanted
+
+        Returns:
+            pd.DataFrame: Date, Open, High, Low, Close, Volume and optionally
+            Adj Close columns; may be empty
+        """
+
+
+class YFinanceSource(DataSource):
+    """Fetches bars from Yahoo Finance; yfinance is imported on first use."""
+
+    name = "yfinance"
+
+    def fetch(self, ticker: str, start: date) -> pd.DataFrame:
+        import yfinance as yf
+
+        frame = yf.download(ticker, start=start.isoformat(), interval="1d", auto_adjust=False,
+                            multi_level_index=False, progress=False)
+        if frame is None or frame.empty:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+        return frame.reset_index()
+
+
+class FixtureSource(DataSource):
+    """
+    Serves bars from ``<folder>/<ticker or symbol>.csv`` files, for offline runs and tests.
+
+    The fixture files may use any date format the loader accepts.
+    """
+
+    name = "fixture"
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def tickers(self) -> List[str]:
+        """Return every ticker with a fixture file."""
+        return sorted(name[:-4] for name in os.listdir(self.folder) if name.endswith(".csv"))
+
+    def fetch(self, ticker: str, start: date) -> pd.DataFrame:
+        for name in (ticker, symbol_for(ticker)):
+            path = os.path.join(self.folder, f"{name}.csv")
+            if os.path.exists(path):
+                frame = pd.read_csv(path)
+                dates = parse_dates(frame["Date"]) if "Date" in frame.columns else None
+                if dates is None:
+                    return frame
+                return frame[dates >= pd.Timestamp(start)]
+        raise FileNotFoundError(f"No fixture for {ticker} in {self.folder}")
+
+
+def make_source(name: Optional[str] = None, fixture_dir: Optional[str] = None) -> DataSource:
+    """
+    Build a data source by name ("yfinance" or "fixture").
+
+    Defaults come from the INGEST_SOURCE (else ``DEFAULT_SOURCE``) and
+    INGEST_FIXTURE_DIR environment variables.
+    """
+    name = name or os.getenv("INGEST_SOURCE", DEFAULT_SOURCE)
+    if name == "yfinance":
+        return YFinanceSource()
+    if name == "fixture":
+        return FixtureSource(fixture_dir or os.getenv("INGEST_FIXTURE_DIR", "fixtures"))
+    raise ValueError(f"Unknown data source '{name}', expected one of {', '.join(SOURCE_NAMES)}")
+
+
+def validate_frame(frame: pd.DataFrame, after: Optional[date] = None) -> pd.DataFrame:
+    """
+    Check a bar frame and return it normalized: parsed dates, numeric columns, sorted.
+
+    Args:
+        frame (pd.DataFrame): Bars from a source or a stored CSV
+        after (Optional[date]): If given, rows on or before this date are dropped
+
+    Returns:
+        pd.DataFrame: Validated frame with OUTPUT_COLUMNS (Adj Close filled from Close)
+
+    Raises:
+        IngestError: On missing columns, unparseable or future dates, duplicate
+            dates, non-positive prices or High below Low
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in frame.columns]
+    if missing:
+        raise IngestError(f"Missing column(s): {', '.join(missing)}")
+
+    out = pd.DataFrame({"Date": parse_dates(frame["Date"]).to_numpy()})
+    if out["Date"].isna().any():
+        raise IngestError(f"{int(out['Date'].isna().sum())} row(s) with unparseable dates")
+    for name in PRICE_COLUMNS:
+        source = frame[name] if name in frame.columns else frame["Close"]
+        out[name] = pd.to_numeric(source, errors="coerce").to_numpy(dtype=np.float64)
+    out[VOLUME_COLUMN] = pd.to_numeric(frame[VOLUME_COLUMN], errors="coerce").fillna(0).to_numpy().astype(np.int64)
+
+    if after is not None:
+        out = out[out["Date"] > pd.Timestamp(after)]
+    out = out.sort_values("Date", kind="stable").reset_index(drop=True)
+
+    if out.empty:
+        return out[list(OUTPUT_COLUMNS)]
+    if out["Date"].duplicated().any():
+        raise IngestError("Duplicate dates")
+    if out["Date"].iloc[-1].date() > datetime.now(timezone.utc).date() + timedelta(days=1):
+        raise IngestError(f"Date in the future: {out['Date'].iloc[-1].date()}")
+    prices = out[["Open", "High", "Low", "Close"]].to_numpy()
+    if (prices[~np.isnan(prices)] <= 0).any():
+        raise IngestError("Non-positive prices")
+    if (out["High"] < out["Low"]).any():
+        raise IngestError("High below Low")
+    return out[list(OUTPUT_COLUMNS)]
+
+
+def _atomic_write(path: str, write) -> None:
+    """Write via ``write(file)`` to a temp file beside ``path``, then rename over it."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(path)}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class Ingestor:
+    """Appends new bars from a data source to the CSVs in a data folder."""
+
+    def __init__(self, data_folder: str, source: DataSource,
+                 history_years: int = DEFAULT_HISTORY_YEARS, update_catalog: bool = True):
+        self.data_folder = data_folder
+        self.source = source
+        self.history_years = history_years
+        self.update_catalog = update_catalog
+        self._catalog_lock = threading.Lock()
+
+    def csv_path(self, symbol: str) -> str:
+        return os.path.join(self.data_folder, f"{symbol}.csv")
+
+    def _watermark_path(self, symbol: str) -> str:
+        return os.path.join(self.data_folder, WATERMARK_DIRNAME, f"{symbol}.json")
+
+    def watermark(self, symbol: str) -> Optional[date]:
+        """Return the last stored date for a symbol, or None if nothing is stored."""
+        try:
+            with open(self._watermark_path(symbol)) as f:
+                state = json.load(f)
+            stored = os.stat(self.csv_path(symbol))
+            # Trust the watermark only while it describes the current CSV
+            if state.get("size") == stored.st_size and state.get("mtime_ns") == stored.st_mtime_ns:
+                return date.fromisoformat(state["watermark"])
+        except (OSError, ValueError, KeyError):
+            pass
+        stored_frame = self._read_stored(symbol)
+        if stored_frame is None or stored_frame.empty:
+            return None
+        return stored_frame["Date"].iloc[-1].date()
+
+    def _read_stored(self, symbol: str) -> Optional[pd.DataFrame]:
+        path = self.csv_path(symbol)
+        if not os.path.exists(path):
+            return None
+        return validate_frame(pd.read_csv(path))
+
+    def _write_watermark(self, symbol: str, ticker: str, watermark: date, rows: int) -> None:
+        os.makedirs(os.path.join(self.data_folder, WATERMARK_DIRNAME), exist_ok=True)
+        stored = os.stat(self.csv_path(symbol))
+        state = {
+            "ticker": ticker,
+            "watermark": watermark.isoformat(),
+            "rows": rows,
+            "size": stored.st_size,
+            "mtime_ns": stored.st_mtime_ns,
+            "source": self.source.name,
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        _atomic_write(self._watermark_path(symbol), lambda f: json.dump(state, f, indent=2))
+
+    def tickers(self, fallback: Iterable[str] = DEFAULT_TICKERS) -> List[str]:
+        """
+        Return the provider ticker to refresh for each symbol, one per symbol.
+
+        Symbols use the ticker recorded in their watermark; ``fallback``
+        tickers cover symbols not ingested yet. A stored CSV with neither is
+        skipped, since its file name has lost the exchange suffix.
+
+        Args:
+            fallback (Iterable[str]): Tickers for symbols without a recorded one
+
+        Returns:
+            List[str]: Tickers sorted by symbol
+        """
+        chosen: Dict[str, str] = {}
+        folder = os.path.join(self.data_folder, WATERMARK_DIRNAME)
+        names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(folder, name)) as f:
+                    ticker = json.load(f).get("ticker")
+            except (OSError, ValueError, AttributeError):
+                continue
+            if ticker:
+                chosen[name[:-5]] = ticker
+        for ticker in fallback:
+            chosen.setdefault(symbol_for(ticker), ticker)
+
+        if os.path.isdir(self.data_folder):
+            for name in os.listdir(self.data_folder):
+                if name.endswith(".csv") and symbol_for(name[:-4]) not in chosen:
+                    logging.warning(f"Skipping {name}: no ticker recorded for it")
+        return [chosen[symbol] for symbol in sorted(chosen)]
+
+    def ingest(self, ticker: str) -> Dict:
+        """
+        Fetch bars newer than the symbol's watermark and publish the merged CSV.
+
+        Args:
+            ticker (str): Provider ticker, e.g. TCS.NS
+
+        Returns:
+            Dict: symbol, status ("updated", "unchanged" or "failed"),
+            new_rows, watermark and, on failure, error
+        """
+        symbol = symbol_for(ticker)
+        result = {"ticker": ticker, "symbol": symbol, "status": "unchanged", "new_rows": 0}
+        try:
+            watermark = self.watermark(symbol)
+            start = (watermark + timedelta(days=1) if watermark
+                     else date.today() - timedelta(days=365 * self.history_years))
+            fetched = validate_frame(self.source.fetch(ticker, start), after=watermark)
+            result["watermark"] = watermark.isoformat() if watermark else None
+            if fetched.empty:
+                return result
+
+            stored = self._read_stored(symbol) if watermark else None
+            merged = fetched if stored is None else pd.concat([stored, fetched], ignore_index=True)
+            out = merged.copy()
+            out["Date"] = out["Date"].dt.strftime("%Y-%m-%d")
+            _atomic_write(self.csv_path(symbol), lambda f: out.to_csv(f, index=False))
+
+            new_watermark = merged["Date"].iloc[-1].date()
+            self._write_watermark(symbol, ticker, new_watermark, len(merged))
+            if self.update_catalog:
+                from .catalog import build_catalog
+
+                with self._catalog_lock:
+                    build_catalog(self.data_folder, [symbol])
+
+            result.update(status="updated", new_rows=len(fetched), watermark=new_watermark.isoformat())
+            logging.info(f"Ingested {len(fetched)} new row(s) for {symbol} up to {new_watermark}")
+        except Exception as e:
+            logging.error(f"Ingestion failed for {ticker}: {e}")
+            result.update(status="failed", error=str(e))
+        return result
+
+    def ingest_all(self, tickers: Iterable[str], max_workers: int = INGEST_MAX_WORKERS) -> List[Dict]:
+        """
+        Ingest many tickers with at most ``max_workers`` in flight.
+
+        Tickers mapping to the same symbol (TCS.NS and TCS.BO) are ingested
+        once, using the first one listed.
+        """
+        unique: Dict[str, str] = {}
+        for ticker in tickers:
+            symbol = symbol_for(ticker)
+            if symbol in unique:
+                logging.warning(f"Skipping {ticker}: {symbol} already ingested from {unique[symbol]}")
+                continue
+            unique[symbol] = ticker
+
+        os.makedirs(self.data_folder, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="ingest") as pool:
+            return list(pool.map(self.ingest, unique.values()))
+
+
+def validate_folder(data_folder: str) -> Dict[str, str]:
+    """
+    Validate every CSV in a data folder.
+
+    Returns:
+        Dict[str, str]: Error message per invalid symbol (empty if all are valid)
+    """
+    errors = {}
+    for name in sorted(os.listdir(data_folder)):
+        if not name.endswith(".csv"):
+            continue
+        try:
+            validate_frame(pd.read_csv(os.path.join(data_folder, name)))
+        except (IngestError, pd.errors.ParserError) as e:
+            errors[name[:-4]] = str(e)
+    return errors
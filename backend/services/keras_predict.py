@@ -0,0 +1,209 @@
+"""
+CPU-only, micro-batched inference for the bundled Keras LSTM model.
+
+Provides functionality for:
+- Loading the ``tf.keras`` archive lazily, once per worker process
+- Preparing scaled 100-step input windows from the shared price store
+- Coalescing windows from concurrent requests into one ``predict`` call
+- Autoregressive multi-day forecasts, cached per data version
+
+The model (built in ``stock-prediction.ipynb``) maps the last 100 closes,
+min-max scaled over the symbol's history, to the next scaled close. Keras
+and a backend (TensorFlow or JAX) are optional dependencies, listed in
+``requirements-keras.txt``; without them ``available()`` is False and the
+``model=keras`` predict mode answers 503 before loading any data.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+import importlib.util
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import PriceData
+
+# Keep inference on the CPU even on hosts that expose a GPU
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+MODEL_PATH = os.getenv(
+    "KERAS_MODEL_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "tf.keras")
+)
+WINDOW = 100
+MAX_BATCH = int(os.getenv("KERAS_MAX_BATCH", "32"))
+MAX_WAIT_MS = float(os.getenv("KERAS_MAX_WAIT_MS", "5"))
+DEFAULT_HORIZON = 30
+MAX_HORIZON = 90
+
+forecast_cache = LRUCache(int(os.getenv("KERAS_FORECAST_CACHE_SIZE", "256")))
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when Keras or the model archive cannot be loaded."""
+
+
+def available() -> bool:
+    """Return whether Keras and its configured backend are installed, without importing them."""
+    backend = os.getenv("KERAS_BACKEND", "tensorflow")
+    return importlib.util.find_spec("keras") is not None and importlib.util.find_spec(backend) is not None
+
+
+class MicroBatcher:
+    """
+    Collects single input windows from many threads into batched predict calls.
+
+    A worker thread takes the first queued window, waits up to ``max_wait_ms``
+    for up to ``max_batch - 1`` more, and runs them through the model together.
+    Forecasts in progress register with ``forecasting()`` and keep at most one
+    window queued each, so the worker stops waiting as soon as every one of
+    them has submitted its next step; a lone forecast never waits at all.
+    Batches are zero-padded to ``max_batch`` rows so the backend compiles the
+    graph for one input shape only.
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH, max_batch: int = MAX_BATCH,
+                 max_wait_ms: float = MAX_WAIT_MS):
+        self.model_path = model_path
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self._model = None
+        self._load_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._forecasting = 0
+        self._stats = {"batches": 0, "windows": 0, "max_batch_seen": 0}
+
+    def _load(self):
+        """Load the model once; later calls reuse it or re-raise the load failure."""
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            if self._load_error is not None:
+                raise ModelUnavailableError(str(self._load_error))
+            try:
+                import keras
+
+                model = keras.saving.load_model(self.model_path, compile=False)
+            except Exception as e:
+                self._load_error = e
+                logging.error(f"Keras model unavailable: {e}")
+                raise ModelUnavailableError(str(e))
+            logging.info(f"Loaded Keras model from {self.model_path}")
+            self._model = model
+            self._worker = threading.Thread(target=self._run, name="keras-batcher", daemon=True)
+            self._worker.start()
+            return model
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            # Only forecasts still in progress can add to this batch
+            while len(batch) < min(self.max_batch, self._forecasting):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._predict(batch)
+
+    def _predict(self, batch: List) -> None:
+        inputs = np.zeros((self.max_batch, WINDOW, 1), dtype=np.float32)
+        for i, (window, _) in enumerate(batch):
+            inputs[i, :, 0] = window
+        try:
+            outputs = np.asarray(self._model.predict_on_batch(inputs)).reshape(self.max_batch, -1)[:, 0]
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["windows"] += len(batch)
+            self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+        for i, (_, future) in enumerate(batch):
+            future.set_result(float(outputs[i]))
+
+    @contextmanager
+    def forecasting(self):
+        """Mark a forecast in progress for the duration of the block, so batches wait for its steps."""
+        with self._lock:
+            self._forecasting += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._forecasting -= 1
+
+    def submit(self, window: np.ndarray) -> Future:
+        """Queue one scaled ``(WINDOW,)`` window and return a future for its output."""
+        self._load()
+        future: Future = Future()
+        self._queue.put((np.asarray(window, dtype=np.float32), future))
+        return future
+
+    def warmup(self) -> None:
+        """Load the model and run one padded batch so the first request is not slowed by compilation."""
+        self.submit(np.zeros(WINDOW, dtype=np.float32)).result()
+
+    def get_stats(self) -> Dict:
+        """Return batch counters and whether the model is loaded."""
+        with self._lock:
+            return {**self._stats, "loaded": self._model is not None, "max_batch": self.max_batch,
+                    "forecasting": self._forecasting}
+
+
+batcher = MicroBatcher()
+
+
+def forecast(data: PriceData, horizon: int = DEFAULT_HORIZON, column: str = "Close") -> np.ndarray:
+    """
+    Forecast the next ``horizon`` closes by feeding each prediction back as input.
+
+    Args:
+        data (PriceData): Symbol price data with at least ``WINDOW`` valid closes
+        horizon (int): Number of trading days to forecast
+        column (str): Price column the model reads
+
+    Returns:
+        np.ndarray: Forecast prices in the column's units
+
+    Raises:
+        ValueError: If there is not enough history
+        ModelUnavailableError: If the model cannot be loaded
+    """
+    key = (data.symbol, column, horizon, data.version)
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    closes = data[column]
+    closes = closes[~np.isnan(closes)]
+    if len(closes) < WINDOW:
+        raise ValueError(f"Keras model needs at least {WINDOW} closes, found {len(closes)}")
+
+    # Min-max scale over the symbol's history, as in the training notebook
+    low, high = float(closes.min()), float(closes.max())
+    span = (high - low) or 1.0
+    window = (closes[-WINDOW:] - low) / span
+
+    outputs = np.empty(horizon, dtype=np.float64)
+    with batcher.forecasting():
+        for step in range(horizon):
+            outputs[step] = batcher.submit(window).result()
+            window = np.append(window[1:], outputs[step])
+
+    result = outputs * span + low
+    result.flags.writeable = False
+    forecast_cache.put(key, result)
+    return result
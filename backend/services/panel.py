@@ -0,0 +1,340 @@
+"""
+Aligned multi-symbol price panel and cross-asset analytics.
+
+Provides functionality for:
+- One date axis (the union of every symbol's dates) with a symbols x dates
+  float array per column (Close and Volume), NaN where a symbol has no bar
+- Incremental refresh: only symbols whose data version changed are reloaded,
+  and dates newer than the axis are appended instead of rebuilding it
+- Correlation matrices of daily log returns over pairwise-complete
+  observations, computed with a few matrix products
+- Rolling beta of every symbol against a benchmark symbol, from cumulative sums
+- Screens ranking symbols by period return, volatility, drawdown or volume
+- A fingerprint of every symbol's data version, for caching results
+
+The panel checks the symbols' versions at most once per ``PANEL_REFRESH_SECONDS``.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import VOLUME_COLUMN, PriceStore, price_store
+from .symbols import SymbolRegistry, symbol_registry
+
+PANEL_COLUMNS = ("Close", VOLUME_COLUMN)
+REFRESH_SECONDS = float(os.getenv("PANEL_REFRESH_SECONDS", "1.0"))
+TRADING_DAYS = 252
+SCREEN_METRICS = ("return", "volatility", "drawdown", "volume")
+
+panel_results = LRUCache(int(os.getenv("PANEL_RESULT_CACHE_SIZE", "128")))
+
+
+class Panel:
+    """
+    Immutable snapshot of the aligned panel.
+
+    Attributes:
+        symbols (List[str]): Row labels, sorted
+        dates (np.ndarray): Ascending ``datetime64[ns]`` axis shared by every row
+        values (Dict[str, np.ndarray]): Column -> ``(len(symbols), len(dates))`` float array
+        revision (int): Increases whenever this process's panel changes
+        fingerprint (str): Digest of every symbol's data version; equal in
+            every worker process that sees the same data
+    """
+
+    def __init__(self, symbols: List[str], dates: np.ndarray, values: Dict[str, np.ndarray],
+                 revision: int, fingerprint: str = ""):
+        self.symbols = symbols
+        self.dates = dates
+        self.values = values
+        self.revision = revision
+        self.fingerprint = fingerprint
+        self.rows = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.values[column]
+
+    def select(self, symbols: Sequence[str]) -> np.ndarray:
+        """Return the row indices of the given symbols."""
+        return np.fromiter((self.rows[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+
+def _place(axis: np.ndarray, dates: np.ndarray, values: np.ndarray, out: np.ndarray) -> None:
+    """Write one symbol's values into its row at the positions of its dates on the axis."""
+    out[:] = np.nan
+    out[np.searchsorted(axis, dates)] = values
+
+
+class MarketPanel:
+    """Maintains the aligned panel for every symbol known to the registry."""
+
+    def __init__(self, store: PriceStore = price_store, registry: SymbolRegistry = symbol_registry,
+                 columns: Sequence[str] = PANEL_COLUMNS, refresh_seconds: float = REFRESH_SECONDS):
+        self.store = store
+        self.registry = registry
+        self.columns = tuple(columns)
+        self.refresh_seconds = refresh_seconds
+        self._panel = Panel([], np.array([], dtype="datetime64[ns]"),
+                            {column: np.empty((0, 0)) for column in self.columns}, 0)
+        self._versions: Dict[str, Tuple] = {}
+        # (monotonic time, versions, fingerprint) of the last version scan
+        self._scanned: Optional[Tuple[float, Dict[str, Tuple], str]] = None
+        self._lock = threading.Lock()
+        self._stats = {"refreshes": 0, "appends": 0, "rebuilds": 0, "symbols_loaded": 0}
+
+    def _scan(self) -> Tuple[Dict[str, Tuple], str]:
+        """Return every symbol's data version and their digest, re-read at most once per check interval."""
+        scanned = self._scanned
+        now = time.monotonic()
+        if scanned is not None and now - scanned[0] < self.refresh_seconds:
+            return scanned[1], scanned[2]
+        versions = {}
+        for symbol in self.registry.symbols():
+            version = self.store.version(symbol)
+            if version is not None:
+                versions[symbol] = version
+        fingerprint = hashlib.blake2b(repr(sorted(versions.items())).encode(), digest_size=16).hexdigest()
+        self._scanned = (now, versions, fingerprint)
+        return versions, fingerprint
+
+    def fingerprint(self) -> str:
+        """
+        Return the digest of every symbol's current data version.
+
+        Costs a ``stat`` per symbol at most once per check interval and never
+        loads prices, so it suits ETag checks that may end in a 304.
+        """
+        return self._scan()[1]
+
+    def current(self) -> Panel:
+        """Return the panel, first bringing it up to date if any symbol's data version changed."""
+        versions, fingerprint = self._scan()
+        if fingerprint == self._panel.fingerprint:
+            return self._panel
+        with self._lock:
+            if fingerprint != self._panel.fingerprint:
+                self._refresh(versions, fingerprint)
+            return self._panel
+
+    def _refresh(self, versions: Dict[str, Tuple], fingerprint: str) -> None:
+        changed = [symbol for symbol, version in versions.items() if self._versions.get(symbol) != version]
+        loaded = {}
+        for symbol in changed:
+            data = self.store.load(symbol)
+            if data is not None and "Close" in data:
+                loaded[symbol] = data
+
+        old = self._panel
+        removed = set(old.symbols) - set(versions)
+        axis = old.dates
+        appendable = not removed and len(axis) > 0 and all(
+            self._on_axis_or_after(axis, data.dates) for data in loaded.values()
+        )
+        if appendable:
+            self._append(old, versions, loaded, fingerprint)
+        else:
+            self._rebuild(versions, loaded, fingerprint)
+        self._versions = versions
+        self._stats["refreshes"] += 1
+        logging.info(f"Market panel revision {self._panel.revision}: {len(self._panel.symbols)} symbols, "
+                     f"{len(self._panel.dates)} dates, {len(loaded)} reloaded")
+
+    @staticmethod
+    def _on_axis_or_after(axis: np.ndarray, dates: np.ndarray) -> bool:
+        """True if every date is already on the axis or later than its last date."""
+        known = dates[dates <= axis[-1]]
+        positions = np.searchsorted(axis, known)
+        return bool(np.all(positions < len(axis)) and np.array_equal(axis[positions], known))
+
+    def _append(self, old: Panel, versions: Dict[str, Tuple], loaded: Dict, fingerprint: str) -> None:
+        """Extend the axis with newer dates, keep unchanged rows and refill changed ones."""
+        newer = [data.dates[data.dates > old.dates[-1]] for data in loaded.values()]
+        extra = np.unique(np.concatenate(newer)) if newer else old.dates[:0]
+        axis = np.concatenate([old.dates, extra])
+        symbols = sorted(symbol for symbol in versions if symbol in loaded or symbol in old.rows)
+
+        values = {}
+        for column in self.columns:
+            grid = np.full((len(symbols), len(axis)), np.nan)
+            kept = [(i, old.rows[symbol]) for i, symbol in enumerate(symbols)
+                    if symbol in old.rows and symbol not in loaded]
+            if kept:
+                new_rows, old_rows = map(list, zip(*kept))
+                grid[new_rows, :len(old.dates)] = old.values[column][old_rows]
+            values[column] = grid
+        self._fill(symbols, axis, values, loaded)
+        self._panel = Panel(symbols, axis, values, old.revision + 1, fingerprint)
+        self._stats["appends"] += 1
+
+    def _rebuild(self, versions: Dict[str, Tuple], loaded: Dict, fingerprint: str) -> None:
+        """Build the axis and every row from scratch."""
+        for symbol in versions:
+            if symbol not in loaded:
+                data = self.store.load(symbol)
+                if data is not None and "Close" in data:
+                    loaded[symbol] = data
+        symbols = sorted(loaded)
+        axis = (np.unique(np.concatenate([loaded[symbol].dates for symbol in symbols]))
+                if symbols else np.array([], dtype="datetime64[ns]"))
+        values = {column: np.full((len(symbols), len(axis)), np.nan) for column in self.columns}
+        self._fill(symbols, axis, values, loaded)
+        self._panel = Panel(symbols, axis, values, self._panel.revision + 1, fingerprint)
+        self._stats["rebuilds"] += 1
+
+    def _fill(self, symbols: List[str], axis: np.ndarray, values: Dict[str, np.ndarray], loaded: Dict) -> None:
+        for i, symbol in enumerate(symbols):
+            data = loaded.get(symbol)
+            if data is None:
+                continue
+            self._stats["symbols_loaded"] += 1
+            for column in self.columns:
+                if column in data:
+                    _place(axis, data.dates, data[column], values[column][i])
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return refresh counters and the panel's shape."""
+        with self._lock:
+            return {**self._stats, "symbols": len(self._panel.symbols), "dates": len(self._panel.dates)}
+
+
+# Global instance shared by the correlation and screener endpoints
+market_panel = MarketPanel()
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    """
+    Daily log returns along the date axis, aligned with the prices.
+
+    The first column, and any return whose price or previous price is
+    missing, is NaN.
+    """
+    returns = np.full(prices.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[:, 1:] = np.diff(np.log(prices), axis=1)
+    return returns
+
+
+def correlation_matrix(returns: np.ndarray, min_periods: int = 20) -> np.ndarray:
+    """
+    Pearson correlation between rows over their pairwise-complete observations.
+
+    Equivalent to ``DataFrame.corr(min_periods=...)`` on the transposed
+    returns, but computed with matrix products over zero-filled values and
+    validity masks instead of a loop over pairs.
+
+    Args:
+        returns (np.ndarray): ``(symbols, dates)`` returns, NaN where missing
+        min_periods (int): Pairs with fewer common observations get NaN
+
+    Returns:
+        np.ndarray: ``(symbols, symbols)`` correlation matrix
+    """
+    valid = ~np.isnan(returns)
+    mask = valid.astype(np.float64)
+    x = np.where(valid, returns, 0.0)
+    n = mask @ mask.T
+    # sx[i, j]: sum of row i over the dates where rows i and j are both present
+    sx = x @ mask.T
+    sxx = (x * x) @ mask.T
+    sxy = x @ x.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = n * sxy - sx * sx.T
+        var = (n * sxx - sx * sx) * (n * sxx - sx * sx).T
+        corr = cov / np.sqrt(var)
+    corr[(n < max(min_periods, 2)) | ~np.isfinite(corr)] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+    diagonal = np.diag(n) >= max(min_periods, 2)
+    corr[np.diag_indices_from(corr)] = np.where(diagonal, 1.0, np.nan)
+    return corr
+
+
+def rolling_beta(returns: np.ndarray, benchmark: np.ndarray, window: int,
+                 min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling beta of each row against a benchmark return series.
+
+    beta = cov(r, b) / var(b) over the trailing ``window`` dates, using only
+    dates where both returns are present.
+
+    Args:
+        returns (np.ndarray): ``(symbols, dates)`` returns
+        benchmark (np.ndarray): ``(dates,)`` benchmark returns
+        window (int): Trailing window length in dates
+        min_periods (Optional[int]): Fewer common observations give NaN,
+            defaults to half the window
+
+    Returns:
+        np.ndarray: ``(symbols, dates)`` beta ending at each date
+    """
+    min_periods = max(2, min_periods if min_periods is not None else window // 2)
+    valid = ~np.isnan(returns) & ~np.isnan(benchmark)[None, :]
+    x = np.where(valid, returns, 0.0)
+    y = np.where(valid, benchmark[None, :], 0.0)
+
+    def trailing(values: np.ndarray) -> np.ndarray:
+        totals = np.zeros((values.shape[0], values.shape[1] + 1))
+        np.cumsum(values, axis=1, out=totals[:, 1:])
+        hi = np.arange(1, values.shape[1] + 1)
+        return totals[:, hi] - totals[:, np.maximum(0, hi - window)]
+
+    n = trailing(valid.astype(np.float64))
+    sx, sy, sxy, syy = trailing(x), trailing(y), trailing(x * y), trailing(y * y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (n * sxy - sx * sy) / (n * syy - sy * sy)
+    beta[(n < min_periods) | ~np.isfinite(beta)] = np.nan
+    return beta
+
+
+def _first_last_valid(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return each row's first and last non-NaN value (NaN for empty rows)."""
+    valid = ~np.isnan(values)
+    has = valid.any(axis=1)
+    rows = np.arange(values.shape[0])
+    first = values[rows, np.argmax(valid, axis=1)]
+    last = values[rows, values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)]
+    return np.where(has, first, np.nan), np.where(has, last, np.nan)
+
+
+def screen_values(panel: Panel, metric: str, lo: int, hi: int) -> np.ndarray:
+    """
+    Compute a screening metric for every panel row over dates ``[lo, hi)``.
+
+    Metrics: "return" (last over first close, minus one), "volatility"
+    (annualized standard deviation of daily log returns), "drawdown" (worst
+    fall from a running peak, as a negative fraction) and "volume" (mean
+    daily volume).
+
+    Returns:
+        np.ndarray: One value per row, NaN where it cannot be computed
+    """
+    if metric not in SCREEN_METRICS:
+        raise ValueError(f"Invalid metric '{metric}', expected one of {', '.join(SCREEN_METRICS)}")
+    close = panel["Close"][:, lo:hi]
+    if close.shape[1] == 0:
+        return np.full(close.shape[0], np.nan)
+    # Reductions are written out so all-NaN rows give NaN without RuntimeWarnings
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metric == "return":
+            first, last = _first_last_valid(close)
+            return last / first - 1
+        if metric == "volatility":
+            returns = log_returns(close)[:, 1:]
+            valid = ~np.isnan(returns)
+            counts = valid.sum(axis=1)
+            mean = np.where(valid, returns, 0.0).sum(axis=1) / counts
+            deviations = np.where(valid, returns - mean[:, None], 0.0)
+            variance = (deviations * deviations).sum(axis=1) / (counts - 1)
+            return np.where(counts >= 2, np.sqrt(variance) * np.sqrt(TRADING_DAYS), np.nan)
+        if metric == "drawdown":
+            peaks = np.fmax.accumulate(close, axis=1)
+            return np.fmin.reduce(close / peaks - 1, axis=1)
+        volume = panel[VOLUME_COLUMN][:, lo:hi]
+        valid = ~np.isnan(volume)
+        return np.where(valid, volume, 0.0).sum(axis=1) / valid.sum(axis=1)
@@ -0,0 +1,90 @@
+"""
+Period handling for date-sorted price arrays.
+
+Resolves yfinance-style periods ("5d", "1mo", "1y", "ytd", "max", ...) and
+explicit start/end dates into row bounds with a binary search on the sorted
+date array, so callers can slice views instead of filtering whole frames.
+"""
+
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_PERIOD = "1mo"
+
+_PERIOD = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def _parse_date(value: str, name: str) -> np.datetime64:
+    # pandas accepts more date spellings than numpy; it is only needed for explicit ranges
+    import pandas as pd
+
+    try:
+        return np.datetime64(pd.Timestamp(value).normalize().to_datetime64(), "ns")
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid {name} date '{value}', expected YYYY-MM-DD")
+
+
+def period_bounds(dates: np.ndarray, period: Optional[str] = DEFAULT_PERIOD,
+                  start: Optional[str] = None, end: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Resolve a period or an explicit date range into ``[lo, hi)`` row bounds.
+
+    Day periods count trading rows (``"5d"`` is the last five bars); week,
+    month and year periods are calendar offsets back from the latest bar.
+    Explicit ``start``/``end`` dates (inclusive) take precedence over the period.
+
+    Args:
+        dates (np.ndarray): Ascending ``datetime64[ns]`` array
+        period (Optional[str]): Period such as "5d", "1mo", "1y", "ytd" or "max"
+        start (Optional[str]): First date to include, YYYY-MM-DD
+        end (Optional[str]): Last date to include, YYYY-MM-DD
+
+    Returns:
+        Tuple[int, int]: Row bounds suitable for slicing
+
+    Raises:
+        ValueError: If the period or a date cannot be parsed
+    """
+    n = len(dates)
+    if start or end:
+        lo = int(np.searchsorted(dates, _parse_date(start, "start"), side="left")) if start else 0
+        if end:
+            end_exclusive = _parse_date(end, "end") + np.timedelta64(1, "D")
+            hi = int(np.searchsorted(dates, end_exclusive, side="left"))
+        else:
+            hi = n
+        return lo, max(lo, hi)
+
+    period = (period or DEFAULT_PERIOD).strip().lower()
+    if period == "max" or n == 0:
+        return 0, n
+
+    anchor = dates[-1]
+    if period == "ytd":
+        cutoff = anchor.astype("datetime64[Y]").astype(dates.dtype)
+        return int(np.searchsorted(dates, cutoff, side="left")), n
+
+    match = _PERIOD.match(period)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid period '{period}'")
+    count, unit = int(match.group(1)), match.group(2)
+
+    if unit == "d":
+        return max(0, n - count), n
+    if unit == "wk":
+        cutoff = anchor - np.timedelta64(7 * count, "D")
+    else:
+        cutoff = _months_before(anchor, count if unit == "mo" else 12 * count)
+    return int(np.searchsorted(dates, cutoff, side="right")), n
+
+
+def _months_before(anchor: np.datetime64, months: int) -> np.datetime64:
+    """Shift a date back by whole months, clamping the day to the target month's end like ``pd.DateOffset``."""
+    day = anchor.astype("datetime64[D]")
+    month = day.astype("datetime64[M]")
+    day_of_month = int((day - month.astype("datetime64[D]")).astype(np.int64))
+    target = (month - months).astype("datetime64[D]")
+    month_length = int(((month - months + 1).astype("datetime64[D]") - target).astype(np.int64))
+    return (target + min(day_of_month, month_length - 1)).astype(anchor.dtype) + (anchor - day)
@@ -0,0 +1,376 @@
+"""
+Shared in-process price store for the stock services.
+
+Provides functionality for:
+- Loading a symbol's OHLCV history once into compact, date-sorted NumPy arrays
+- Keeping recently used symbols in a size-bounded LRU cache
+- Preferring memory-mapped catalog columns over CSV parsing when published
+- Invalidating cached entries when the backing file's mtime or size changes,
+  and releasing swapped-out catalog mappings when a new generation is published
+- Preloading the whole catalog, e.g. in a WSGI master before it forks workers
+- Reporting hit/miss/eviction counters for the cache
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from config import Config
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from .catalog import MANIFEST_NAME, build_catalog, catalog_dir_for, open_symbol, read_manifest
+from .telemetry import stage
+
+DATA_FOLDER = Config.DATA_DIR
+# Runtime databases live outside the package, in an ignored ``backend/var`` by default
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "var"))
+MAX_SYMBOLS = int(os.getenv("PRICE_STORE_MAX_SYMBOLS", "64"))
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Adj Close")
+VOLUME_COLUMN = "Volume"
+
+_ISO_DATE = re.compile(r"^\s*\d{4}-\d{1,2}-\d{1,2}")
+
+
+class PriceDataError(ValueError):
+    """Raised when a symbol's source file cannot be turned into price data."""
+
+
+class PriceData:
+    """
+    Read-only, date-sorted OHLCV arrays for a single symbol.
+
+    Attributes:
+        symbol (str): Normalized symbol the data was loaded for
+        dates (np.ndarray): Ascending ``datetime64[ns]`` array
+        columns (Dict[str, np.ndarray]): Numeric columns aligned with ``dates``
+        version (Tuple): Identity of the source the data was loaded from
+    """
+
+    def __init__(self, symbol: str, dates: np.ndarray, columns: Dict[str, np.ndarray], version: Tuple):
+        self.symbol = symbol
+        self.dates = dates
+        self.columns = columns
+        self.version = version
+        for array in (dates, *columns.values()):
+            array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def latest(self) -> Dict[str, float]:
+        """Return the most recent bar as a plain dict of Python scalars."""
+        return {name: values[-1].item() for name, values in self.columns.items()}
+
+    def prefix_digest(self, rows: int, columns: Optional[Iterable[str]] = None) -> bytes:
+        """
+        Return a digest of the dates and columns of the first ``rows`` bars.
+
+        Comparing it with the digest taken before an update tells an append
+        (earlier bars unchanged) from a rewrite such as a re-download or a
+        split adjustment.
+
+        Args:
+            rows (int): Number of leading bars to cover
+            columns (Optional[Iterable[str]]): Columns to include, defaults to all
+
+        Returns:
+            bytes: 16-byte digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.dates[:rows].view(np.int64))
+        for name in (self.columns if columns is None else columns):
+            digest.update(self.columns[name][:rows])
+        return digest.digest()
+
+    def to_frame(self, start: int = 0, stop: Optional[int] = None) -> "pd.DataFrame":
+        """
+        Build a DataFrame with a ``Date`` column for rows ``[start, stop)``.
+
+        Args:
+            start (int): First row to include
+            stop (Optional[int]): Row to stop before, defaults to the end
+
+        Returns:
+            pd.DataFrame: Frame in the same column order as the source file
+        """
+        import pandas as pd
+
+        frame = {"Date": self.dates[start:stop]}
+        for name, values in self.columns.items():
+            frame[name] = values[start:stop]
+        return pd.DataFrame(frame)
+
+
+def parse_dates(values: "pd.Series") -> "pd.Series":
+    """
+    Parse a column of dates written either as ISO (YYYY-MM-DD) or DD-MM-YYYY.
+
+    Time and timezone suffixes on ISO dates are ignored, since the data is
+    daily. Unparseable values become NaT.
+    """
+    import pandas as pd
+
+    text = values.astype(str)
+    sample = text[values.notna()]
+    if not sample.empty and _ISO_DATE.match(sample.iloc[0]):
+        return pd.to_datetime(text.str.strip().str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    return pd.to_datetime(text, dayfirst=True, errors="coerce")
+
+
+def load_csv(symbol: str, path: str, version: Tuple = ()) -> PriceData:
+    """
+    Parse a symbol's CSV into date-sorted numeric arrays.
+
+    Args:
+        symbol (str): Normalized symbol
+        path (str): Path to the CSV file
+        version (Tuple): Source file identity to record on the result
+
+    Returns:
+        PriceData: Loaded price data (may be empty if no row has a valid date)
+    """
+    # pandas is only needed to parse CSVs; catalog-backed symbols never import it
+    import pandas as pd
+
+    with stage("csv_read"):
+        df = pd.read_csv(path)
+    if "Date" not in df.columns:
+        raise PriceDataError("CSV missing 'Date' column")
+
+    with stage("parse_dates"):
+        dates = parse_dates(df["Date"])
+    valid = dates.notna().to_numpy()
+    order = np.argsort(dates.to_numpy()[valid], kind="stable")
+
+    columns = {}
+    for name in df.columns:
+        if name in PRICE_COLUMNS:
+            values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+        elif name == VOLUME_COLUMN:
+            values = pd.to_numeric(df[name], errors="coerce").fillna(0).to_numpy().astype(np.int64)
+        else:
+            continue
+        columns[name] = np.ascontiguousarray(values[valid][order])
+
+    sorted_dates = np.ascontiguousarray(dates.to_numpy()[valid][order]).astype("datetime64[ns]")
+    return PriceData(symbol, sorted_dates, columns, version)
+
+
+class PriceStore:
+    """
+    Size-bounded LRU of PriceData keyed by normalized symbol.
+
+    A symbol is served from the columnar catalog when it has been published
+    there and still matches its CSV; otherwise the CSV is parsed.
+    """
+
+    def __init__(self, data_folder: str = DATA_FOLDER, max_symbols: int = MAX_SYMBOLS):
+        self.data_folder = data_folder
+        self.max_symbols = max(1, max_symbols)
+        self._entries: "OrderedDict[str, PriceData]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._manifest_key: Optional[Tuple] = None
+        self._manifest_symbols: Dict[str, Dict] = {}
+        self._generation = 0
+        self._file_names: Dict[str, str] = {}
+
+    @property
+    def catalog_dir(self) -> str:
+        return catalog_dir_for(self.data_folder)
+
+    def path_for(self, symbol: str) -> str:
+        """Return the CSV path backing a normalized symbol."""
+        return os.path.join(self.data_folder, self._file_names.get(symbol) or f"{symbol}.csv")
+
+    def set_file_names(self, file_names: Dict[str, str]) -> None:
+        """
+        Record CSVs whose file name is not ``<SYMBOL>.csv``, e.g. ``TCS.NS.csv`` for TCS.
+
+        Args:
+            file_names (Dict[str, str]): Normalized symbol -> file name in the data folder
+        """
+        self._file_names = dict(file_names)
+
+    def _refresh_manifest(self) -> bool:
+        """Re-read the manifest if it changed; return False if none is published."""
+        try:
+            stat = os.stat(os.path.join(self.catalog_dir, MANIFEST_NAME))
+        except FileNotFoundError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key != self._manifest_key:
+                manifest = read_manifest(self.catalog_dir)
+                self._manifest_symbols = manifest.get("symbols", {})
+                self._generation = manifest.get("generation", 0)
+                self._manifest_key = key
+                self._release_swapped()
+        return True
+
+    def _catalog_entry(self, symbol: str) -> Optional[Dict]:
+        """Return the symbol's manifest entry, re-reading the manifest only when it changes."""
+        if not self._refresh_manifest():
+            return None
+        with self._lock:
+            return self._manifest_symbols.get(symbol)
+
+    def _release_swapped(self) -> None:
+        """Drop cached catalog entries whose generation was replaced, unmapping the old files."""
+        for symbol, data in list(self._entries.items()):
+            entry = self._manifest_symbols.get(symbol)
+            if data.version[0] == "catalog" and (entry is None or entry["generation"] != data.version[1]):
+                del self._entries[symbol]
+                self._stats["invalidations"] += 1
+
+    def generation(self) -> int:
+        """Return the catalog-wide generation last seen (0 if nothing is published)."""
+        self._refresh_manifest()
+        with self._lock:
+            return self._generation
+
+    def _resolve(self, symbol: str) -> Optional[Tuple]:
+        """Pick the freshest source for a symbol and return (version, loader)."""
+        try:
+            stat = os.stat(self.path_for(symbol))
+        except FileNotFoundError:
+            stat = None
+
+        entry = self._catalog_entry(symbol)
+        if entry is not None:
+            fresh = stat is None or entry.get("source") == {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            if fresh:
+                version = ("catalog", entry["generation"])
+                return version, lambda: PriceData(symbol, *open_symbol(self.catalog_dir, entry), version)
+
+        if stat is None:
+            return None
+        version = ("csv", stat.st_mtime_ns, stat.st_size)
+        return version, lambda: load_csv(symbol, self.path_for(symbol), version)
+
+    def version(self, symbol: str) -> Optional[Tuple]:
+        """
+        Return the current data version of a symbol without loading it.
+
+        Costs one or two ``stat`` calls; None means the symbol has no data.
+        """
+        resolved = self._resolve(symbol)
+        return resolved[0] if resolved else None
+
+    def get(self, symbol: str) -> Optional[PriceData]:
+        """
+        Return the price data for a normalized symbol, loading it if needed.
+
+        Args:
+            symbol (str): Normalized symbol matching the CSV filename
+
+        Returns:
+            Optional[PriceData]: Cached or freshly loaded data, or None if the
+            symbol has neither a catalog entry nor a data file
+        """
+        resolved = self._resolve(symbol)
+        if resolved is None:
+            with self._lock:
+                self._entries.pop(symbol, None)
+            return None
+        version, loader = resolved
+
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(symbol)
+                self._stats["hits"] += 1
+                return entry
+            if entry is not None:
+                del self._entries[symbol]
+                self._stats["invalidations"] += 1
+            self._stats["misses"] += 1
+
+        data = loader()
+        logging.info(f"Price store loaded {symbol} from {version[0]}: {len(data)} rows")
+
+        with self._lock:
+            self._entries[symbol] = data
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_symbols:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return data
+
+    def load(self, symbol: str) -> Optional[PriceData]:
+        """
+        Return a symbol's data without adding it to the cache.
+
+        For bulk readers such as the market panel, so scanning every symbol
+        does not evict the ones being served. A cached entry is still reused.
+        """
+        resolved = self._resolve(symbol)
+        if resolved is None:
+            return None
+        version, loader = resolved
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is not None and entry.version == version:
+            return entry
+        return loader()
+
+    def preload(self, build: bool = True) -> Dict[str, int]:
+        """
+        Map every published symbol into the store.
+
+        Meant for a WSGI master started with ``preload_app``: workers forked
+        afterwards inherit the read-only mappings and share their pages
+        instead of each parsing CSVs into private memory. The store grows to
+        hold every symbol, so none is evicted and re-mapped.
+
+        Args:
+            build (bool): First publish CSVs that are newer than their catalog entry
+
+        Returns:
+            Dict[str, int]: Catalog generation, symbols mapped and bytes mapped
+        """
+        if build and os.path.isdir(self.data_folder):
+            build_catalog(self.data_folder)
+        self._refresh_manifest()
+        with self._lock:
+            symbols = sorted(self._manifest_symbols)
+            self.max_symbols = max(self.max_symbols, len(symbols))
+
+        mapped = 0
+        for symbol in symbols:
+            data = self.get(symbol)
+            if data is not None:
+                mapped += data.dates.nbytes + sum(values.nbytes for values in data.columns.values())
+        summary = {"generation": self.generation(), "symbols": len(symbols), "bytes": mapped}
+        logging.info(f"Price store preloaded catalog generation {summary['generation']}: "
+                     f"{summary['symbols']} symbols, {mapped / 1e6:.1f} MB mapped")
+        return summary
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of cache counters and current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_symbols": self.max_symbols,
+                    "generation": self._generation}
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance shared by the stock services
+price_store = PriceStore()
@@ -0,0 +1,350 @@
+"""
+Push channel for new price bars over WebSocket.
+
+Provides functionality for:
+- Subscriptions to a set of symbols per connection, answered with each
+  symbol's latest quote
+- Sending only the bars added since the last update (and the last bar, if
+  it was revised) instead of clients re-downloading full histories
+- One asyncio hub that checks the subscribed symbols' data versions once per
+  ``PUSH_POLL_SECONDS``, encodes each update once and fans the same message
+  out to every subscriber of the symbol
+- Backpressure per subscriber: messages wait in a bounded queue; when a slow
+  consumer's queue is full, its backlog is replaced by a single "resync"
+  message naming the symbols to refetch, so it never holds up the hub or
+  other subscribers
+
+Protocol (JSON text frames):
+
+- Connect to ``ws://<host>:<PUSH_PORT>/?symbols=TCS,INFY`` (the query is optional)
+- Send ``{"action": "subscribe" | "unsubscribe", "symbols": [...]}``
+- Receive ``{"type": "subscribed", "symbols", "unknown", "quotes"}`` after subscribing;
+  ``{"type": "bars", "symbol", "dates", "<column>": [...], "quote"}`` when bars
+  are added or revised (clients upsert by date); ``{"type": "reset", "symbol"}``
+  when a history was rewritten and should be refetched over the REST API;
+  ``{"type": "resync", "symbols"}`` after updates were dropped; and
+  ``{"type": "error", "error"}`` for invalid requests
+
+``GET /stats`` on the same port returns the hub's counters.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from websockets.asyncio.server import ServerConnection, serve as websocket_serve
+from websockets.exceptions import ConnectionClosed
+
+from .price_store import PRICE_COLUMNS, VOLUME_COLUMN, PriceData, PriceStore, price_store
+from .serialization import dumps
+from .symbols import SymbolRegistry, normalize_symbol, symbol_registry
+
+POLL_SECONDS = float(os.getenv("PUSH_POLL_SECONDS", "0.5"))
+QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "64"))
+MAX_SUBSCRIPTIONS = int(os.getenv("PUSH_MAX_SYMBOLS", "50"))
+BAR_COLUMNS = PRICE_COLUMNS + (VOLUME_COLUMN,)
+
+
+def _encode(payload: Dict) -> str:
+    return dumps(payload).decode()
+
+
+def _quote(data: PriceData) -> Optional[Dict]:
+    """Latest close with its change from the previous bar."""
+    if not len(data) or "Close" not in data:
+        return None
+    close = data["Close"]
+    last = float(close[-1])
+    previous = float(close[-2]) if len(data) > 1 else float("nan")
+    change = last - previous
+    return {
+        "date": str(np.datetime_as_string(data.dates[-1], unit="D")),
+        "close": last,
+        "change": change,
+        "change_pct": change / previous * 100 if previous else None,
+        "volume": float(data[VOLUME_COLUMN][-1]) if VOLUME_COLUMN in data else None,
+    }
+
+
+class _Tail:
+    """What subscribers of a symbol have been sent: its version, length, earlier bars' digest and last bar."""
+
+    __slots__ = ("version", "rows", "digest", "last_date", "last_bar", "quote")
+
+    def __init__(self, data: PriceData):
+        self.version = data.version
+        self.rows = len(data)
+        # The last bar may still be revised, so only the bars before it are fixed
+        self.digest = self._digest(data, self.rows - 1) if len(data) else None
+        self.last_date = data.dates[-1] if len(data) else None
+        self.last_bar = self._bar(data, len(data) - 1) if len(data) else None
+        self.quote = _quote(data)
+
+    @staticmethod
+    def _digest(data: PriceData, rows: int) -> bytes:
+        return data.prefix_digest(rows, [column for column in BAR_COLUMNS if column in data])
+
+    @staticmethod
+    def _bar(data: PriceData, row: int) -> np.ndarray:
+        return np.array([data[column][row] for column in BAR_COLUMNS if column in data], dtype=np.float64)
+
+    def delta(self, data: PriceData) -> Optional[Dict]:
+        """
+        Return the message taking a subscriber from this tail to ``data``, or None if nothing changed.
+
+        Bars appended after the last sent bar, plus that bar if its values
+        changed, are sent; any other rewrite of the history, including a
+        change to an earlier bar, is a reset.
+        """
+        rows = len(data)
+        appended = (
+            0 < self.rows <= rows
+            and data.dates[self.rows - 1] == self.last_date
+            and self._digest(data, self.rows - 1) == self.digest
+        )
+        if not appended:
+            return {"type": "reset", "symbol": data.symbol}
+        revised = not np.array_equal(self._bar(data, self.rows - 1), self.last_bar, equal_nan=True)
+        start = self.rows - 1 if revised else self.rows
+        if start == rows:
+            return None
+        message = {
+            "type": "bars",
+            "symbol": data.symbol,
+            "dates": np.datetime_as_string(data.dates[start:], unit="D"),
+        }
+        for column in BAR_COLUMNS:
+            if column in data:
+                message[column] = data[column][start:]
+        message["quote"] = _quote(data)
+        return message
+
+
+class Subscriber:
+    """One connection's subscriptions and its bounded queue of outgoing messages."""
+
+    def __init__(self, websocket: ServerConnection, queue_size: int = QUEUE_SIZE):
+        self.websocket = websocket
+        self.queue_size = max(1, queue_size)
+        self.symbols: Set[str] = set()
+        # (symbol, message); replies to the client's own requests have no symbol
+        self._pending: Deque[Tuple[Optional[str], str]] = deque()
+        self._resync: Set[str] = set()
+        self._ready = asyncio.Event()
+
+    def offer(self, symbol: Optional[str], message: str) -> bool:
+        """
+        Queue a message without waiting; returns False if the backlog had to be dropped.
+
+        On overflow every queued update is discarded and its symbol, with
+        this one, is sent in one "resync" message instead. Replies (no
+        symbol) are never dropped.
+        """
+        dropped = False
+        if symbol is not None and len(self._pending) >= self.queue_size:
+            self._resync.update(queued for queued, _ in self._pending if queued is not None)
+            self._pending = deque(item for item in self._pending if item[0] is None)
+            dropped = True
+        if symbol is not None and (dropped or symbol in self._resync):
+            # The client refetches the symbol after the resync, so the update is not needed
+            self._resync.add(symbol)
+        else:
+            self._pending.append((symbol, message))
+        self._ready.set()
+        return not dropped
+
+    async def drain(self) -> None:
+        """Send queued messages until the connection closes."""
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            if self._resync:
+                symbols, self._resync = sorted(self._resync), set()
+                await self.websocket.send(_encode({"type": "resync", "symbols": symbols}))
+            while self._pending and not self._resync:
+                _, message = self._pending.popleft()
+                await self.websocket.send(message)
+            if self._resync or self._pending:
+                self._ready.set()
+
+
+class PushHub:
+    """Fans out new bars for every subscribed symbol."""
+
+    def __init__(self, store: PriceStore = price_store, registry: SymbolRegistry = symbol_registry,
+                 poll_seconds: float = POLL_SECONDS, queue_size: int = QUEUE_SIZE,
+                 max_subscriptions: int = MAX_SUBSCRIPTIONS):
+        self.store = store
+        self.registry = registry
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.max_subscriptions = max_subscriptions
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._tails: Dict[str, _Tail] = {}
+        self._connections: Set[Subscriber] = set()
+        self._stats = {"polls": 0, "updates": 0, "messages": 0, "resyncs": 0, "resets": 0}
+
+    def _baseline(self, symbols: List[str]) -> Dict[str, _Tail]:
+        """Load the current tail of each symbol; runs in a worker thread."""
+        tails = {}
+        for symbol in symbols:
+            data = self.store.load(symbol)
+            if data is not None:
+                tails[symbol] = _Tail(data)
+        return tails
+
+    async def subscribe(self, subscriber: Subscriber, symbols: Iterable[str]) -> None:
+        """Add symbols to a subscriber and reply with their latest quotes."""
+        requested = [symbol for symbol in dict.fromkeys(symbols) if symbol.strip()]
+        resolved = await asyncio.to_thread(lambda: {symbol: self.registry.resolve(symbol) for symbol in requested})
+        known = [clean for clean in dict.fromkeys(resolved.values()) if clean is not None]
+        if len(subscriber.symbols | set(known)) > self.max_subscriptions:
+            subscriber.offer(None, _encode({"type": "error",
+                                            "error": f"At most {self.max_subscriptions} symbols per connection"}))
+            return
+
+        missing = [symbol for symbol in known if symbol not in self._tails]
+        if missing:
+            for symbol, tail in (await asyncio.to_thread(self._baseline, missing)).items():
+                self._tails.setdefault(symbol, tail)
+        known = [symbol for symbol in known if symbol in self._tails]
+        for symbol in known:
+            self._subscribers.setdefault(symbol, set()).add(subscriber)
+        subscriber.symbols.update(known)
+        subscriber.offer(None, _encode({
+            "type": "subscribed",
+            "symbols": sorted(subscriber.symbols),
+            "unknown": [symbol for symbol, clean in resolved.items() if clean is None],
+            "quotes": {symbol: self._tails[symbol].quote for symbol in known},
+        }))
+
+    def unsubscribe(self, subscriber: Subscriber, symbols: Optional[Iterable[str]] = None) -> None:
+        """Remove symbols (default: all of them) from a subscriber."""
+        removed = set(subscriber.symbols if symbols is None else map(normalize_symbol, symbols))
+        for symbol in removed & subscriber.symbols:
+            watchers = self._subscribers.get(symbol)
+            if watchers is not None:
+                watchers.discard(subscriber)
+                if not watchers:
+                    del self._subscribers[symbol]
+                    self._tails.pop(symbol, None)
+        subscriber.symbols -= removed
+
+    def _scan(self, tails: Dict[str, _Tail]) -> List[Tuple[str, _Tail, Optional[Dict]]]:
+        """Find symbols whose data changed; runs in a worker thread."""
+        changes = []
+        for symbol, tail in tails.items():
+            if self.store.version(symbol) == tail.version:
+                continue
+            data = self.store.load(symbol)
+            if data is None:
+                continue
+            changes.append((symbol, _Tail(data), tail.delta(data)))
+        return changes
+
+    async def poll_once(self) -> int:
+        """Check every subscribed symbol once and publish its changes; returns the number of updates."""
+        tails = dict(self._tails)
+        changes = await asyncio.to_thread(self._scan, tails) if tails else []
+        updates = 0
+        for symbol, tail, message in changes:
+            # Skip symbols unsubscribed, or re-baselined, while the scan ran
+            if self._tails.get(symbol) is not tails[symbol]:
+                continue
+            self._tails[symbol] = tail
+            if message is not None:
+                self.publish(symbol, _encode(message))
+                updates += 1
+                if message["type"] == "reset":
+                    self._stats["resets"] += 1
+        self._stats["polls"] += 1
+        self._stats["updates"] += updates
+        return updates
+
+    def publish(self, symbol: str, message: str) -> None:
+        """Queue one encoded message for every subscriber of a symbol."""
+        for subscriber in list(self._subscribers.get(symbol, ())):
+            if not subscriber.offer(symbol, message):
+                self._stats["resyncs"] += 1
+            self._stats["messages"] += 1
+
+    async def run(self) -> None:
+        """Poll for changes forever."""
+        while True:
+            try:
+                await self.poll_once()
+            except Exception:
+                logging.exception("Push hub poll failed")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _command(self, subscriber: Subscriber, raw) -> None:
+        try:
+            request = json.loads(raw)
+            action, symbols = request["action"], request["symbols"]
+            if action not in ("subscribe", "unsubscribe") or not isinstance(symbols, list) \
+                    or not all(isinstance(symbol, str) for symbol in symbols):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            subscriber.offer(None, _encode({
+                "type": "error",
+                "error": 'Expected {"action": "subscribe" or "unsubscribe", "symbols": [...]}',
+            }))
+            return
+        if action == "subscribe":
+            await self.subscribe(subscriber, symbols)
+        else:
+            self.unsubscribe(subscriber, symbols)
+            subscriber.offer(None, _encode({"type": "subscribed", "symbols": sorted(subscriber.symbols),
+                                            "unknown": [], "quotes": {}}))
+
+    async def handle(self, websocket: ServerConnection) -> None:
+        """Serve one WebSocket connection."""
+        subscriber = Subscriber(websocket, self.queue_size)
+        self._connections.add(subscriber)
+        writer = asyncio.create_task(subscriber.drain())
+        try:
+            query = parse_qs(urlsplit(websocket.request.path).query).get("symbols")
+            if query:
+                await self.subscribe(subscriber, query[0].split(","))
+            async for raw in websocket:
+                await self._command(subscriber, raw)
+        except ConnectionClosed:
+            pass
+        finally:
+            self.unsubscribe(subscriber)
+            self._connections.discard(subscriber)
+            writer.cancel()
+            # Let the writer finish before returning, and retrieve its outcome (e.g. ConnectionClosed from a send)
+            await asyncio.gather(writer, return_exceptions=True)
+
+    def process_request(self, connection: ServerConnection, request):
+        """Answer ``GET /stats`` over plain HTTP; other paths continue the WebSocket handshake."""
+        if urlsplit(request.path).path == "/stats":
+            response = connection.respond(200, json.dumps(self.get_stats()))
+            response.headers["Content-Type"] = "application/json"
+            return response
+        return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return fan-out counters, connections and watched symbols."""
+        return {**self._stats, "connections": len(self._connections), "symbols": len(self._tails)}
+
+
+# Global instance served by push_server.py
+push_hub = PushHub()
+
+
+async def serve(host: str, port: int, hub: PushHub = push_hub) -> None:
+    """Run the WebSocket server and the hub's poll loop until cancelled."""
+    async with websocket_serve(hub.handle, host, port, process_request=hub.process_request) as server:
+        poller = asyncio.create_task(hub.run())
+        logging.info(f"Push server listening on {host}:{port}")
+        try:
+            await server.serve_forever()
+        finally:
+            poller.cancel()
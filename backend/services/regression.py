@@ -0,0 +1,193 @@
+"""
+Incremental least-squares trend model for the prediction endpoint.
+
+Provides functionality for:
+- Running sufficient statistics (n, Σx, Σy, Σxy, Σx²) for a price-vs-date fit
+- Folding in only the appended bars when a symbol's earlier bars are
+  unchanged, as checked by a digest of the fitted rows
+- Coefficients memoized per symbol and data version
+- Vectorized evaluation of the fitted line at any number of dates
+
+The fit is the same ordinary least squares line that
+``sklearn.linear_model.LinearRegression`` produces for a single feature.
+Sums are accumulated around a fixed per-symbol origin so that large date
+ordinals do not cost precision.
+"""
+
+import os
+import threading
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import PriceData
+
+# datetime.toordinal() of the NumPy epoch (1970-01-01)
+EPOCH_ORDINAL = 719163
+
+
+def date_ordinals(dates: np.ndarray) -> np.ndarray:
+    """Convert a datetime64 array to ``datetime.toordinal()`` day numbers."""
+    return dates.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+class TrendStats:
+    """
+    Immutable sufficient statistics for a one-feature OLS fit.
+
+    Attributes:
+        x0 (float): Origin subtracted from every x before accumulating
+        y0 (float): Origin subtracted from every y before accumulating
+        n (int): Number of observations
+        sx, sy, sxy, sxx (float): Sums of the shifted x, y, x*y and x*x
+    """
+
+    __slots__ = ("x0", "y0", "n", "sx", "sy", "sxy", "sxx")
+
+    def __init__(self, x0: float, y0: float, n: int = 0, sx: float = 0.0, sy: float = 0.0,
+                 sxy: float = 0.0, sxx: float = 0.0):
+        self.x0, self.y0 = x0, y0
+        self.n, self.sx, self.sy, self.sxy, self.sxx = n, sx, sy, sxy, sxx
+
+    @classmethod
+    def from_arrays(cls, x: np.ndarray, y: np.ndarray) -> "TrendStats":
+        """Accumulate statistics for a full history, skipping missing prices."""
+        x, y = _valid(x, y)
+        if len(x) == 0:
+            return cls(0.0, 0.0)
+        return cls(float(x[0]), float(y[0])).update(x, y)
+
+    def update(self, x: np.ndarray, y: np.ndarray) -> "TrendStats":
+        """Return new statistics with the observations ``(x, y)`` added."""
+        x, y = _valid(x, y)
+        if len(x) == 0:
+            return self
+        dx = x - self.x0
+        dy = y - self.y0
+        return TrendStats(
+            self.x0, self.y0,
+            self.n + len(dx),
+            self.sx + float(dx.sum()),
+            self.sy + float(dy.sum()),
+            self.sxy + float(dx @ dy),
+            self.sxx + float(dx @ dx),
+        )
+
+    def coefficients(self) -> Tuple[float, float]:
+        """
+        Return ``(slope, intercept)`` of the least squares line in unshifted units.
+
+        A single observation (or a constant x) gives a flat line through the mean.
+        """
+        if self.n == 0:
+            return 0.0, float("nan")
+        mean_x = self.sx / self.n
+        mean_y = self.sy / self.n
+        var_x = self.sxx - self.sx * mean_x
+        slope = (self.sxy - self.sx * mean_y) / var_x if var_x > 0 else 0.0
+        intercept = (self.y0 + mean_y) - slope * (self.x0 + mean_x)
+        return slope, intercept
+
+
+def _valid(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mask = ~np.isnan(y)
+    if mask.all():
+        return x, y
+    return x[mask], y[mask]
+
+
+class _FitState:
+    __slots__ = ("version", "rows", "digest", "stats", "coef")
+
+    def __init__(self, version, rows, digest, stats, coef):
+        self.version = version
+        self.rows = rows
+        self.digest = digest
+        self.stats = stats
+        self.coef = coef
+
+
+class TrendModel:
+    """Per-symbol incremental trend fits, memoized by data version."""
+
+    def __init__(self, max_symbols: int = 256):
+        self._states = LRUCache(max_symbols)
+        self._stats = {"memoized": 0, "incremental": 0, "full": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _fit(self, data: PriceData, column: str) -> _FitState:
+        key = (data.symbol, column)
+        state = self._states.get(key)
+        values = data[column]
+        rows = len(data)
+
+        if state is not None and state.version == data.version:
+            self._count("memoized")
+            return state
+
+        # Only bars added after the fitted ones are folded in; any change to
+        # the fitted rows (a correction, a split adjustment) refits from scratch
+        appended = (
+            state is not None
+            and rows >= state.rows > 0
+            and data.prefix_digest(state.rows, (column,)) == state.digest
+        )
+        if appended:
+            self._count("incremental")
+            new_x = date_ordinals(data.dates[state.rows:])
+            stats = state.stats.update(new_x, values[state.rows:])
+        else:
+            self._count("full")
+            stats = TrendStats.from_arrays(date_ordinals(data.dates), values)
+
+        state = _FitState(data.version, rows, data.prefix_digest(rows, (column,)), stats, stats.coefficients())
+        self._states.put(key, state)
+        return state
+
+    def coefficients(self, data: PriceData, column: str = "Close") -> Tuple[float, float]:
+        """
+        Return ``(slope, intercept)`` of the price-vs-ordinal-date trend.
+
+        Args:
+            data (PriceData): Symbol price data
+            column (str): Price column to fit
+
+        Returns:
+            Tuple[float, float]: Slope per day and intercept at ordinal 0
+        """
+        return self._fit(data, column).coef
+
+    def predict(self, data: PriceData, ordinals: np.ndarray, column: str = "Close") -> np.ndarray:
+        """
+        Evaluate the fitted trend at ``datetime.toordinal()`` day numbers in one step.
+
+        Args:
+            data (PriceData): Symbol price data
+            ordinals (np.ndarray): Day numbers to evaluate
+            column (str): Price column to fit
+
+        Returns:
+            np.ndarray: Predicted prices
+        """
+        slope, intercept = self.coefficients(data, column)
+        return intercept + slope * np.asarray(ordinals, dtype=np.float64)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return counts of memoized, incremental and full fits."""
+        with self._lock:
+            return {**self._stats, "symbols": len(self._states)}
+
+    def clear(self) -> None:
+        """Drop every memoized fit."""
+        self._states.clear()
+
+
+# Global instance shared by the prediction handler
+trend_model = TrendModel(int(os.getenv("TREND_MODEL_MAX_SYMBOLS", "256")))
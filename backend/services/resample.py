@@ -0,0 +1,101 @@
+"""
+Weekly and monthly OHLCV bars built from the daily price arrays.
+
+Provides functionality for:
+- Grouping the sorted daily rows into Monday-based weeks or calendar months
+- Aggregating each group with first Open, max High, min Low, last Close and
+  Adj Close, and summed Volume, using ``reduceat`` over group boundaries
+- Caching the resampled data per symbol, interval and data version
+
+Each bar is dated by the first trading day of its period, and the current
+(incomplete) period is included. Missing prices are skipped, so a group's
+Open is its first available open and its Close its last available close.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+
+from .cache import LRUCache
+from .price_store import VOLUME_COLUMN, PriceData
+
+INTERVALS = ("1d", "1wk", "1mo")
+
+resample_cache = LRUCache(int(os.getenv("RESAMPLE_CACHE_SIZE", "128")))
+
+_FIRST = ("Open",)
+_LAST = ("Close", "Adj Close")
+
+
+def _group_starts(dates: np.ndarray, interval: str) -> np.ndarray:
+    """Return the first row of each week or month in a sorted date array."""
+    if interval == "1wk":
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+        keys = (days + 3) // 7
+    else:
+        keys = dates.astype("datetime64[M]").astype(np.int64)
+    return np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+
+
+def _first_valid(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    index = np.where(np.isnan(values), len(values), np.arange(len(values)))
+    first = np.minimum.reduceat(index, starts)
+    out = np.full(len(starts), np.nan)
+    found = first < len(values)
+    out[found] = values[first[found]]
+    return out
+
+
+def _last_valid(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    index = np.where(np.isnan(values), -1, np.arange(len(values)))
+    last = np.maximum.reduceat(index, starts)
+    out = np.full(len(starts), np.nan)
+    found = last >= 0
+    out[found] = values[last[found]]
+    return out
+
+
+def resample(data: PriceData, interval: str = "1d") -> PriceData:
+    """
+    Aggregate daily bars to a coarser interval.
+
+    Args:
+        data (PriceData): Daily price data
+        interval (str): "1d" (returned unchanged), "1wk" or "1mo"
+
+    Returns:
+        PriceData: Resampled bars; its version extends the daily version with
+        the interval, so downstream caches keep the two apart
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Invalid interval '{interval}', expected one of {', '.join(INTERVALS)}")
+    if interval == "1d" or len(data) == 0:
+        return data
+
+    key = (data.symbol, interval)
+    cached = resample_cache.get(key)
+    if cached is not None and cached.version[:-1] == data.version:
+        return cached
+
+    starts = _group_starts(data.dates, interval)
+    columns: Dict[str, np.ndarray] = {}
+    for name, values in data.columns.items():
+        if name in _FIRST:
+            columns[name] = _first_valid(values, starts)
+        elif name in _LAST:
+            columns[name] = _last_valid(values, starts)
+        elif name == "High":
+            columns[name] = np.fmax.reduceat(values, starts)
+        elif name == "Low":
+            columns[name] = np.fmin.reduceat(values, starts)
+        elif name == VOLUME_COLUMN:
+            columns[name] = np.add.reduceat(values, starts)
+
+    result = PriceData(data.symbol, data.dates[starts].copy(), columns, (*data.version, interval))
+    resample_cache.put(key, result)
+    return result
@@ -0,0 +1,233 @@
+"""
+Persistent history of scored news articles.
+
+Provides functionality for:
+- Storing every scored article in SQLite, deduplicated by URL per symbol
+  and indexed by (symbol, published_at)
+- Per-day aggregates (article count, sentiment distribution, score and
+  confidence sums) updated in the same transaction as each new article
+- Reading a window of days, with a trailing rolling index, from the daily
+  aggregates alone, in O(window + rolling) rows and without rescoring
+- A per-symbol revision number, bumped on every insert, for cache validation
+
+The database lives at ``SENTIMENT_DB_PATH`` (default ``<STATE_DIR>/sentiment.db``,
+where ``STATE_DIR`` defaults to ``backend/var``) and is opened lazily in WAL
+mode, so several worker processes can share it.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .price_store import STATE_DIR
+
+SENTIMENT_DB_PATH = os.getenv("SENTIMENT_DB_PATH", os.path.join(STATE_DIR, "sentiment.db"))
+DEFAULT_WINDOW = 30
+DEFAULT_ROLLING = 7
+MAX_WINDOW = 365
+SENTIMENTS = ("positive", "negative", "neutral")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    symbol TEXT NOT NULL,
+    url TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    title TEXT,
+    source TEXT,
+    sentiment TEXT NOT NULL,
+    score REAL NOT NULL,
+    confidence REAL NOT NULL,
+    PRIMARY KEY (symbol, url)
+);
+CREATE INDEX IF NOT EXISTS articles_symbol_published ON articles (symbol, published_at);
+CREATE TABLE IF NOT EXISTS daily (
+    symbol TEXT NOT NULL,
+    day TEXT NOT NULL,
+    articles INTEGER NOT NULL DEFAULT 0,
+    positive INTEGER NOT NULL DEFAULT 0,
+    negative INTEGER NOT NULL DEFAULT 0,
+    neutral INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    confidence_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, day)
+);
+CREATE TABLE IF NOT EXISTS revisions (
+    symbol TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+"""
+
+
+def _article_day(published_at: Optional[str]) -> str:
+    """Return the UTC day of a NewsAPI ``publishedAt`` timestamp, or today if it is missing."""
+    if published_at and len(published_at) >= 10:
+        return published_at[:10]
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+class SentimentHistory:
+    """SQLite-backed article history with incrementally maintained daily aggregates."""
+
+    def __init__(self, db_path: str = SENTIMENT_DB_PATH):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def record(self, symbol: str, articles: List[Dict]) -> int:
+        """
+        Store scored articles and fold new ones into the daily aggregates.
+
+        Articles without a URL, or already stored for the symbol, are skipped.
+
+        Args:
+            symbol (str): Symbol the articles were fetched for
+            articles (List[Dict]): Articles as returned by ``analyze_news_articles``
+
+        Returns:
+            int: Number of newly stored articles
+        """
+        inserted = 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for article in articles:
+                    url = article.get("url")
+                    if not url or article.get("sentiment") not in SENTIMENTS:
+                        continue
+                    published_at = article.get("publishedAt") or ""
+                    day = _article_day(published_at)
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (symbol, url, published_at or day, day, article.get("title"),
+                         (article.get("source") or {}).get("name"), article["sentiment"],
+                         float(article.get("sentiment_score", 0.0)),
+                         float(article.get("sentiment_confidence", 0.0))),
+                    )
+                    if cursor.rowcount == 0:
+                        continue
+                    sentiment = article["sentiment"]
+                    conn.execute(
+                        f"""INSERT INTO daily (symbol, day, articles, {sentiment}, score_sum, confidence_sum)
+                            VALUES (?, ?, 1, 1, ?, ?)
+                            ON CONFLICT (symbol, day) DO UPDATE SET
+                                articles = articles + 1,
+                                {sentiment} = {sentiment} + 1,
+                                score_sum = score_sum + excluded.score_sum,
+                                confidence_sum = confidence_sum + excluded.confidence_sum""",
+                        (symbol, day, float(article.get("sentiment_score", 0.0)),
+                         float(article.get("sentiment_confidence", 0.0))),
+                    )
+                    inserted += 1
+                if inserted:
+                    conn.execute(
+                        """INSERT INTO revisions VALUES (?, 1)
+                           ON CONFLICT (symbol) DO UPDATE SET revision = revision + 1""",
+                        (symbol,),
+                    )
+        return inserted
+
+    def revision(self, symbol: str) -> int:
+        """Return how many times the symbol's history has changed (0 if never)."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT revision FROM revisions WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def history(self, symbol: str, window: int = DEFAULT_WINDOW, rolling: int = DEFAULT_ROLLING,
+                end: Optional[date] = None) -> Dict:
+        """
+        Return daily sentiment for the last ``window`` days, ending today.
+
+        Args:
+            symbol (str): Symbol to read
+            window (int): Number of calendar days to return
+            rolling (int): Trailing days averaged into each day's rolling index
+            end (Optional[date]): Last day, defaults to today (UTC)
+
+        Returns:
+            Dict: Per-day entries (oldest first) and a summary over the window
+        """
+        end = end or datetime.now(timezone.utc).date()
+        span = window + rolling - 1
+        first = end - timedelta(days=span - 1)
+        with self._lock:
+            rows = self._connection().execute(
+                """SELECT day, articles, positive, negative, neutral, score_sum, confidence_sum
+                   FROM daily WHERE symbol = ? AND day BETWEEN ? AND ? ORDER BY day""",
+                (symbol, first.isoformat(), end.isoformat()),
+            ).fetchall()
+
+        # Lay the stored days onto a dense calendar so rolling sums are cumsum differences
+        counts = np.zeros((span, 6))
+        for day, *values in rows:
+            counts[(date.fromisoformat(day) - first).days] = values
+        cumulative = np.vstack([np.zeros((1, 6)), np.cumsum(counts, axis=0)])
+        rolling_sums = cumulative[rolling:] - cumulative[:-rolling]
+        days = counts[rolling - 1:]
+
+        entries = []
+        for i, (n, pos, neg, neu, score_sum, conf_sum) in enumerate(days.tolist()):
+            rolled_n, rolled_score = float(rolling_sums[i, 0]), float(rolling_sums[i, 4])
+            entries.append({
+                "date": (first + timedelta(days=rolling - 1 + i)).isoformat(),
+                "articles": int(n),
+                "sentiment_distribution": {"positive": int(pos), "negative": int(neg), "neutral": int(neu)},
+                "sentiment_index": round(score_sum / n, 3) if n else None,
+                "average_confidence": round(conf_sum / n, 3) if n else None,
+                "rolling_index": round(rolled_score / rolled_n, 3) if rolled_n else None,
+            })
+
+        total = days.sum(axis=0).tolist()
+        n = int(total[0])
+        return {
+            "symbol": symbol,
+            "window": window,
+            "rolling": rolling,
+            "days": entries,
+            "summary": {
+                "total_articles": n,
+                "sentiment_distribution": {name: int(total[1 + i]) for i, name in enumerate(SENTIMENTS)},
+                "sentiment_percentages": {
+                    name: round(total[1 + i] / n * 100, 1) if n else 0 for i, name in enumerate(SENTIMENTS)
+                },
+                "sentiment_index": round(total[4] / n, 3) if n else 0.0,
+                "average_confidence": round(total[5] / n, 3) if n else 0.0,
+            },
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global instance shared by the news fetcher and the history endpoint
+sentiment_history = SentimentHistory()
+
+
+def record_articles(symbol: str, articles: List[Dict]) -> None:
+    """Persist scored articles, logging instead of raising so news responses never fail on storage."""
+    try:
+        inserted = sentiment_history.record(symbol, articles)
+        if inserted:
+            logging.info(f"Sentiment history stored {inserted} new article(s) for {symbol}")
+    except sqlite3.Error as e:
+        logging.error(f"Could not store sentiment history for {symbol}: {e}")
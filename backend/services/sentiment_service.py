@@ -6,20 +6,112 @@ Provides functionality for:
 - Enhanced sentiment metrics and confidence scoring
 - Financial-specific keyword analysis
 - Detailed sentiment breakdowns
+- Cached NewsAPI fetches over a pooled HTTP session with strict timeouts
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from textblob import TextBlob
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 import re
+import hashlib
+from .cache import LRUCache
+from .singleflight import SingleFlight
+from .telemetry import stage, upstream_errors
+from .sentiment_history import record_articles, sentiment_history
+
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "4096"))
+
+# Inflected forms matched for each financial keyword, besides the keyword itself
+KEYWORD_INFLECTIONS = {
+    'growth': ['growths'],
+    'profit': ['profits', 'profited', 'profiting', 'profitable', 'profitability'],
+    'revenue': ['revenues'],
+    'increase': ['increases', 'increased', 'increasing'],
+    'strong': ['stronger', 'strongest', 'strongly'],
+    'outperform': ['outperforms', 'outperformed', 'outperforming', 'outperformance'],
+    'beat': ['beats', 'beating', 'beaten'],
+    'exceed': ['exceeds', 'exceeded', 'exceeding'],
+    'surge': ['surges', 'surged', 'surging'],
+    'rally': ['rallies', 'rallied', 'rallying'],
+    'gain': ['gains', 'gained', 'gaining'],
+    'rise': ['rises', 'rose', 'risen', 'rising'],
+    'success': ['successes', 'successful', 'successfully'],
+    'win': ['wins', 'won', 'winning', 'winner', 'winners'],
+    'opportunity': ['opportunities'],
+    'expansion': ['expansions'],
+    'innovation': ['innovations'],
+    'breakthrough': ['breakthroughs'],
+    'loss': ['losses'],
+    'decline': ['declines', 'declined', 'declining'],
+    'drop': ['drops', 'dropped', 'dropping'],
+    'fall': ['falls', 'fell', 'fallen', 'falling'],
+    'weak': ['weaker', 'weakest', 'weakness', 'weakened', 'weakening'],
+    'poor': ['poorer', 'poorest', 'poorly'],
+    'underperform': ['underperforms', 'underperformed', 'underperforming', 'underperformance'],
+    'miss': ['misses', 'missed', 'missing'],
+    'decrease': ['decreases', 'decreased', 'decreasing'],
+    'crash': ['crashes', 'crashed', 'crashing'],
+    'plunge': ['plunges', 'plunged', 'plunging'],
+    'downturn': ['downturns'],
+    'risk': ['risks', 'risky', 'riskier'],
+    'failure': ['failures'],
+    'problem': ['problems'],
+    'issue': ['issues', 'issued', 'issuing'],
+    'concern': ['concerns', 'concerned'],
+    'worry': ['worries', 'worried', 'worrying'],
+    'threat': ['threats', 'threaten', 'threatens', 'threatened', 'threatening'],
+    'challenge': ['challenges', 'challenged', 'challenging'],
+    'announce': ['announces', 'announced', 'announcing', 'announcement', 'announcements'],
+    'report': ['reports', 'reported', 'reporting'],
+    'release': ['releases', 'released', 'releasing'],
+    'statement': ['statements'],
+    'comment': ['comments', 'commented', 'commenting'],
+    'note': ['notes', 'noted', 'noting'],
+    'update': ['updates', 'updated', 'updating'],
+    'maintain': ['maintains', 'maintained', 'maintaining'],
+    'hold': ['holds', 'held', 'holding'],
+    'steady': ['steadied', 'steadily'],
+    'consistent': ['consistently'],
+    'regular': ['regularly'],
+    'routine': ['routines'],
+}
+
+
+def _prefix_alternation(words) -> str:
+    """
+    Return a regex matching any of ``words``, factored by shared prefixes.
+
+    ``re`` tries a flat alternation's branches one by one at every position;
+    nesting them as a trie ("ris(?:e|es|en|ing)") lets a single character
+    rule out every branch that does not start with it.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy, so the longest form is tried first
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
 
 class EnhancedSentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache_size: int = SENTIMENT_CACHE_SIZE):
         """Initialize the enhanced sentiment analyzer with TextBlob and financial context."""
-        self.analyzer = TextBlob
         self.financial_keywords = {
             'positive': [
                 'growth', 'profit', 'revenue', 'increase', 'strong', 'positive', 'bullish',
@@ -36,132 +128,156 @@ class EnhancedSentimentAnalyzer:
                 'maintain', 'hold', 'stable', 'steady', 'consistent', 'regular', 'routine'
             ]
         }
+        self._compile_matcher()
+        # Content hash -> scored result, so repeated articles skip TextBlob
+        self._results = LRUCache(cache_size)
         logging.info("Enhanced sentiment analyzer initialized with financial context")
-    
-    def analyze_text_sentiment(self, text: str) -> Dict:
+
+    @property
+    def analyzer(self):
+        """TextBlob, imported on first use because it pulls in nltk, scipy and scikit-learn."""
+        from textblob import TextBlob
+
+        return TextBlob
+
+    def _compile_matcher(self) -> None:
         """
-        Enhanced sentiment analysis with financial context and confidence scoring.
-        
-        Args:
-            text (str): Text to analyze
-            
-        Returns:
-            Dict: Enhanced sentiment analysis results
+        Build the whole-word keyword matcher.
+
+        Every keyword and its forms from ``KEYWORD_INFLECTIONS`` ("profits",
+        "rising", "dropped") are compiled into one prefix-factored
+        alternation, so a text is scanned once. Forms must be whole words:
+        "up" does not match "support".
         """
-        if not text or len(text.strip()) < 10:
-            return {
-                "sentiment": "neutral",
-                "confidence": 0.5,
-                "score": 0.0,
-                "label": "neutral",
-                "financial_context": 0.0,
-                "keyword_matches": 0
-            }
-        
-        try:
-            # Use TextBlob for base sentiment analysis
-            blob = self.analyzer(text)
-            polarity = blob.sentiment.polarity
-            subjectivity = blob.sentiment.subjectivity
-            
-            # Analyze financial context
-            financial_context = self._analyze_financial_context(text.lower())
-            
-            # Combine base sentiment with financial context
-            adjusted_polarity = self._adjust_polarity_with_context(polarity, financial_context)
-            
-            # Determine sentiment based on adjusted polarity
-            if adjusted_polarity > 0.1:
-                sentiment = "positive"
-                confidence = min(abs(adjusted_polarity) + 0.2, 1.0)
-            elif adjusted_polarity < -0.1:
-                sentiment = "negative"
-                confidence = min(abs(adjusted_polarity) + 0.2, 1.0)
-            else:
-                sentiment = "neutral"
-                confidence = 0.5
-            
-            # Calculate keyword matches
-            keyword_matches = self._count_keyword_matches(text.lower())
-            
-            return {
-                "sentiment": sentiment,
-                "confidence": round(confidence, 3),
-                "score": round(adjusted_polarity, 3),
-                "label": sentiment,
-                "financial_context": round(financial_context, 3),
-                "keyword_matches": keyword_matches,
-                "base_polarity": round(polarity, 3),
-                "subjectivity": round(subjectivity, 3)
-            }
-                
-        except Exception as e:
-            logging.error(f"Error in enhanced sentiment analysis: {e}")
-            return {
-                "sentiment": "neutral",
-                "confidence": 0.5,
-                "score": 0.0,
-                "label": "neutral",
-                "financial_context": 0.0,
-                "keyword_matches": 0
-            }
-    
-    def _analyze_financial_context(self, text: str) -> float:
+        self._keyword_forms = {}
+        for category, words in self.financial_keywords.items():
+            for word in words:
+                for form in (word, *KEYWORD_INFLECTIONS.get(word, ())):
+                    self._keyword_forms.setdefault(form, (word, category))
+        alternatives = _prefix_alternation(self._keyword_forms)
+        self._keyword_pattern = re.compile(rf"(?<![a-z])({alternatives})(?![a-z])")
+
+    def _keyword_counts(self, text: str) -> Dict[str, int]:
         """
-        Analyze financial context of the text using keyword analysis.
-        
+        Count the distinct keywords of each category found in the text, in one scan.
+
         Args:
-            text (str): Lowercase text to analyze
-            
+            text (str): Text to analyze
+
         Returns:
-            float: Financial context score (-1 to 1)
+            Dict: Count of keyword matches
         """
-        positive_count = sum(1 for word in self.financial_keywords['positive'] if word in text)
-        negative_count = sum(1 for word in self.financial_keywords['negative'] if word in text)
-        neutral_count = sum(1 for word in self.financial_keywords['neutral'] if word in text)
-        
-        total_keywords = positive_count + negative_count + neutral_count
-        
-        if total_keywords == 0:
-            return 0.0
-        
-        # Calculate weighted score
-        score = (positive_count - negative_count) / total_keywords
-        
-        # Normalize to -1 to 1 range
-        return np.clip(score, -1.0, 1.0)
-    
-    def _adjust_polarity_with_context(self, base_polarity: float, financial_context: float) -> float:
+        forms = self._keyword_forms
+        counts = {category: 0 for category in self.financial_keywords}
+        found = {forms[form] for form in self._keyword_pattern.findall(text.lower())}
+        for _, category in found:
+            counts[category] += 1
+        return counts
+
+    @staticmethod
+    def _neutral_result() -> Dict:
+        return {
+            "sentiment": "neutral",
+            "confidence": 0.5,
+            "score": 0.0,
+            "label": "neutral",
+            "financial_context": 0.0,
+            "keyword_matches": {"positive": 0, "negative": 0, "neutral": 0},
+            "base_polarity": 0.0,
+            "subjectivity": 0.0
+        }
+
+    def analyze_text_sentiment(self, text: str) -> Dict:
         """
-        Adjust base polarity using financial context.
-        
+        Enhanced sentiment analysis with financial context and confidence scoring.
+
         Args:
-            base_polarity (float): Base TextBlob polarity
-            financial_context (float): Financial context score
-            
+            text (str): Text to analyze
+
         Returns:
-            float: Adjusted polarity
+            Dict: Enhanced sentiment analysis results
         """
-        # Weight: 70% base polarity, 30% financial context
-        adjusted = (0.7 * base_polarity) + (0.3 * financial_context)
-        return np.clip(adjusted, -1.0, 1.0)
-    
-    def _count_keyword_matches(self, text: str) -> Dict[str, int]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict]:
         """
-        Count keyword matches for each sentiment category.
-        
+        Score many texts at once.
+
+        Each distinct text is parsed by TextBlob and scanned by the keyword
+        matcher once; results are cached by content hash, and the polarity
+        adjustment and labelling run as array operations over the batch.
+
         Args:
-            text (str): Lowercase text to analyze
-            
+            texts (List[str]): Texts to analyze
+
         Returns:
-            Dict: Count of keyword matches
+            List[Dict]: One result per text, in input order
         """
-        return {
-            'positive': sum(1 for word in self.financial_keywords['positive'] if word in text),
-            'negative': sum(1 for word in self.financial_keywords['negative'] if word in text),
-            'neutral': sum(1 for word in self.financial_keywords['neutral'] if word in text)
-        }
-    
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 10:
+                results[i] = self._neutral_result()
+                continue
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            cached = self._results.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            keys = list(pending)
+            polarity = np.zeros(len(keys))
+            subjectivity = np.zeros(len(keys))
+            failed = np.zeros(len(keys), dtype=bool)
+            counts = np.zeros((len(keys), 3))
+            keyword_matches = []
+            for j, key in enumerate(keys):
+                text = texts[pending[key][0]]
+                try:
+                    # Use TextBlob for base sentiment analysis
+                    sentiment = self.analyzer(text).sentiment
+                    polarity[j], subjectivity[j] = sentiment.polarity, sentiment.subjectivity
+                except Exception as e:
+                    logging.error(f"Error in enhanced sentiment analysis: {e}")
+                    failed[j] = True
+                matches = self._keyword_counts(text)
+                keyword_matches.append(matches)
+                counts[j] = matches["positive"], matches["negative"], matches["neutral"]
+
+            # Financial context: (positive - negative) / all keywords, 0 without keywords
+            total = counts.sum(axis=1)
+            context = np.divide(counts[:, 0] - counts[:, 1], total, out=np.zeros(len(keys)), where=total > 0)
+            # Weight: 70% base polarity, 30% financial context
+            adjusted = np.clip(0.7 * polarity + 0.3 * context, -1.0, 1.0)
+            labels = np.where(adjusted > 0.1, "positive", np.where(adjusted < -0.1, "negative", "neutral"))
+            confidence = np.where(labels == "neutral", 0.5, np.minimum(np.abs(adjusted) + 0.2, 1.0))
+
+            for j, key in enumerate(keys):
+                if failed[j]:
+                    result = self._neutral_result()
+                else:
+                    result = {
+                        "sentiment": str(labels[j]),
+                        "confidence": round(float(confidence[j]), 3),
+                        "score": round(float(adjusted[j]), 3),
+                        "label": str(labels[j]),
+                        "financial_context": round(float(context[j]), 3),
+                        "keyword_matches": keyword_matches[j],
+                        "base_polarity": round(float(polarity[j]), 3),
+                        "subjectivity": round(float(subjectivity[j]), 3)
+                    }
+                    self._results.put(key, result)
+                for i in pending[key]:
+                    results[i] = result
+
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return result cache counters."""
+        return self._results.get_stats()
+
     def analyze_news_articles(self, articles: List[Dict]) -> Tuple[List[Dict], Dict]:
         """
         Enhanced analysis of news articles with detailed sentiment metrics.
@@ -182,17 +298,18 @@ class EnhancedSentimentAnalyzer:
         financial_context_scores = []
         keyword_totals = {"positive": 0, "negative": 0, "neutral": 0}
         
+        # Combine title and description for analysis
+        texts = []
         for article in articles:
-            # Combine title and description for analysis
             text_to_analyze = ""
             if article.get('title'):
                 text_to_analyze += article['title'] + ". "
             if article.get('description'):
                 text_to_analyze += article['description']
-            
-            # Analyze sentiment with enhanced features
-            sentiment_result = self.analyze_text_sentiment(text_to_analyze)
-            
+            texts.append(text_to_analyze)
+
+        # Analyze sentiment with enhanced features, all articles in one batch
+        for article, sentiment_result in zip(articles, self.analyze_batch(texts)):
             # Add enhanced sentiment info to article
             article_with_sentiment = {
                 **article,
@@ -304,61 +421,233 @@ class EnhancedSentimentAnalyzer:
             "sentiment_strength": "weak"
         }
 
-def fetch_stock_news_with_sentiment(ticker: str) -> Dict:
-    """
-    Fetch news articles for a stock ticker and analyze their sentiment.
-    No yfinance dependency – ticker itself is used for query.
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
+NEWS_PAGE_SIZE = 5
+NEWS_CONNECT_TIMEOUT = float(os.getenv("NEWS_CONNECT_TIMEOUT", "2"))
+NEWS_READ_TIMEOUT = float(os.getenv("NEWS_READ_TIMEOUT", "5"))
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "900"))
+NEWS_STALE_TTL = float(os.getenv("NEWS_STALE_TTL", "3600"))
+NEWS_ERROR_TTL = float(os.getenv("NEWS_ERROR_TTL", "60"))
+
+
+def _create_session() -> requests.Session:
+    """Create a pooled HTTP session for NewsAPI calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _create_session()
+
+
+def _empty_news_result() -> Dict:
+    return {
+        "articles": [],
+        "sentiment_summary": enhanced_sentiment_analyzer._get_empty_sentiment_summary()
+    }
+
+
+def _news_query(ticker: str) -> str:
+    """Clean a ticker for a better NewsAPI search, e.g. RELIANCE.BO -> RELIANCE."""
+    search_query = ticker.split(".")[0]
+    return search_query.replace("&", "and").replace("'", "").replace('"', "")
+
+
+def _fetch_news(search_query: str, api_key: str) -> Dict:
     """
-    try:
-        # Clean ticker for better NewsAPI search
-        search_query = ticker.split(".")[0]  # e.g. RELIANCE.BO -> RELIANCE
-        search_query = search_query.replace("&", "and").replace("'", "").replace('"', "")
-
-
-        NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-        if not NEWS_API_KEY:
-            logging.warning("NEWS_API_KEY not set. Returning empty news result.")
-            return {
-                "articles": [],
-                "sentiment_summary": EnhancedSentimentAnalyzer()._get_empty_sentiment_summary()
-            }
+    Fetch and score the latest articles for a query from NewsAPI.
 
-        # Fetch news from NewsAPI
-        url = (
-            f'https://newsapi.org/v2/everything?q={search_query}'
-            f'&apiKey={NEWS_API_KEY}&language=en&sortBy=publishedAt&pageSize=5'
+    Raises:
+        requests.RequestException: On connection errors, timeouts or error responses
+    """
+    with stage("newsapi"):
+        response = _session.get(
+            NEWS_API_URL,
+            params={
+                "q": search_query,
+                "language": "en",
+                "sortBy": "publishedAt",
+                "pageSize": NEWS_PAGE_SIZE,
+            },
+            headers={"X-Api-Key": api_key},
+            timeout=(NEWS_CONNECT_TIMEOUT, NEWS_READ_TIMEOUT),
         )
-        response = requests.get(url)
         news_data = response.json()
 
-        # Debug logs
-        logging.info(f"NewsAPI query: {search_query}")
-        logging.info(f"NewsAPI response status: {news_data.get('status')}")
-        logging.info(f"NewsAPI articles found: {len(news_data.get('articles', []))}")
-
-        if news_data.get("status") == "ok":
-            articles = news_data.get("articles", [])
-            if articles:
-                analyzer = EnhancedSentimentAnalyzer()
-                analyzed_articles, sentiment_summary = analyzer.analyze_news_articles(articles)
-                return {
-                    "articles": analyzed_articles,
-                    "sentiment_summary": sentiment_summary
-                }
-
-        # fallback if no articles
-        return {
-            "articles": [],
-            "sentiment_summary": EnhancedSentimentAnalyzer()._get_empty_sentiment_summary()
-        }
+    # Debug logs
+    logging.info(f"NewsAPI query: {search_query}")
+    logging.info(f"NewsAPI response status: {news_data.get('status')}")
+    logging.info(f"NewsAPI articles found: {len(news_data.get('articles', []))}")
+
+    if news_data.get("status") != "ok":
+        raise requests.RequestException(f"NewsAPI error: {news_data.get('message', news_data.get('status'))}")
 
-    except Exception as e:
-        logging.error(f"Error fetching news: {e}")
+    articles = news_data.get("articles", [])
+    if articles:
+        with stage("sentiment"):
+            analyzed_articles, sentiment_summary = enhanced_sentiment_analyzer.analyze_news_articles(articles)
+        record_articles(search_query, analyzed_articles)
         return {
-            "articles": [],
-            "sentiment_summary": EnhancedSentimentAnalyzer()._get_empty_sentiment_summary()
+            "articles": analyzed_articles,
+            "sentiment_summary": sentiment_summary
         }
 
+    # fallback if no articles
+    return _empty_news_result()
+
+
+class NewsCache:
+    """
+    Per-query TTL cache with stale-while-revalidate refresh.
+
+    Entries younger than ``ttl`` are served as-is. Entries older than that but
+    within ``ttl + stale_ttl`` are served immediately while a background
+    refresh runs. Failed fetches are cached for ``error_ttl`` so an unhealthy
+    upstream is not hammered. Concurrent fetches of one query are coalesced.
+    """
+
+    def __init__(self, ttl: float = NEWS_CACHE_TTL, stale_ttl: float = NEWS_STALE_TTL,
+                 error_ttl: float = NEWS_ERROR_TTL, max_entries: int = 512, max_workers: int = 2):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self._entries = LRUCache(max_entries)
+        self._pending = set()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-refresh")
+        self._stats = {"fresh": 0, "stale": 0, "misses": 0, "fetches": 0, "errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _refresh(self, search_query: str, api_key: str) -> Dict:
+        """Fetch a query and store the result, keeping stale data if the fetch fails."""
+        self._count("fetches")
+        try:
+            result = _fetch_news(search_query, api_key)
+            self._entries.put(search_query, (time.monotonic(), self.ttl, result))
+            return result
+        except Exception as e:
+            self._count("errors")
+            upstream_errors.inc(upstream="newsapi")
+            logging.error(f"Error fetching news: {e}")
+            previous = self._entries.get(search_query)
+            result = previous[2] if previous else _empty_news_result()
+            self._entries.put(search_query, (time.monotonic(), self.error_ttl, result))
+            return result
+        finally:
+            with self._lock:
+                self._pending.discard(search_query)
+
+    def _schedule_refresh(self, search_query: str, api_key: str) -> None:
+        with self._lock:
+            if search_query in self._pending:
+                return
+            self._pending.add(search_query)
+        self._executor.submit(self._flight.do, search_query, self._refresh, search_query, api_key)
+
+    def get(self, search_query: str, api_key: str, block: bool = True) -> Dict:
+        """
+        Return news for a query, fetching or refreshing it as needed.
+
+        Args:
+            search_query (str): Cleaned NewsAPI query
+            api_key (str): NewsAPI key
+            block (bool): Wait for the fetch on a cache miss; otherwise return
+                an empty result and fetch in the background
+
+        Returns:
+            Dict: Articles and sentiment summary
+        """
+        entry = self._entries.get(search_query)
+        if entry is not None:
+            fetched_at, ttl, result = entry
+            age = time.monotonic() - fetched_at
+            if age < ttl:
+                self._count("fresh")
+                return result
+            if age < ttl + self.stale_ttl:
+                self._count("stale")
+                self._schedule_refresh(search_query, api_key)
+                return result
+
+        self._count("misses")
+        if not block:
+            self._schedule_refresh(search_query, api_key)
+            return _empty_news_result()
+        return self._flight.do(search_query, self._refresh, search_query, api_key)
+
+    def version(self, search_query: str, api_key: str) -> Optional[float]:
+        """
+        Return when the served result for a query was fetched, without fetching.
+
+        Stale entries schedule a background refresh, so the version changes
+        once fresh news arrives. None means nothing usable is cached.
+        """
+        entry = self._entries.peek(search_query)
+        if entry is None:
+            return None
+        fetched_at, ttl, _ = entry
+        age = time.monotonic() - fetched_at
+        if age >= ttl + self.stale_ttl:
+            return None
+        if age >= ttl:
+            self._schedule_refresh(search_query, api_key)
+        return fetched_at
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return a snapshot of cache counters and current size."""
+        with self._lock:
+            stats = {**self._stats, "size": len(self._entries)}
+        flight = self._flight.get_stats()
+        stats["coalesced"] = flight["coalesced"]
+        return stats
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+
+news_cache = NewsCache()
+
+
+def fetch_stock_news_with_sentiment(ticker: str, block: bool = True) -> Dict:
+    """
+    Fetch news articles for a stock ticker and analyze their sentiment.
+    No yfinance dependency – ticker itself is used for query.
+
+    Results are cached per query. With block=False a cache miss returns an
+    empty result immediately and the fetch continues in the background.
+    """
+    NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+    if not NEWS_API_KEY:
+        logging.warning("NEWS_API_KEY not set. Returning empty news result.")
+        return _empty_news_result()
+
+    return news_cache.get(_news_query(ticker), NEWS_API_KEY, block=block)
+
+
+def news_version(ticker: str) -> Optional[float]:
+    """Return the fetch time of the cached news for a ticker, or None if none is cached."""
+    NEWS_API_KEY = os.getenv("NEWS_API_KEY")
+    if not NEWS_API_KEY:
+        return None
+    return news_cache.version(_news_query(ticker), NEWS_API_KEY)
+
+
+def get_sentiment_history(ticker: str, window: int, rolling: int) -> Dict:
+    """Return stored daily sentiment for a ticker; never fetches or rescores."""
+    return sentiment_history.history(_news_query(ticker), window, rolling)
+
+
+def sentiment_history_revision(ticker: str) -> int:
+    """Return the change counter of a ticker's stored sentiment history."""
+    return sentiment_history.revision(_news_query(ticker))
+
 
 # Global instance for reuse
 enhanced_sentiment_analyzer = EnhancedSentimentAnalyzer()
\ No newline at end of file
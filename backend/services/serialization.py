@@ -0,0 +1,106 @@
+"""
+Fast JSON encoding for API responses.
+
+Provides functionality for:
+- Encoding payloads with orjson, including NumPy arrays without ``tolist()``
+- Columnar table payloads built straight from the price arrays
+- Streaming table rows as NDJSON in fixed-size chunks
+
+orjson is optional; without it the standard library encoder is used.
+"""
+
+import json
+import math
+from typing import Dict, Iterator
+
+import numpy as np
+from flask import Response
+
+from .charts import format_dates
+from .price_store import PriceData
+from .telemetry import stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+TABLE_FORMATS = ("records", "columnar", "ndjson")
+NDJSON_CHUNK_ROWS = 500
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj):
+    """Copy a payload with NaN and infinities replaced by None, as orjson encodes them."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        obj = obj.tolist()
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def dumps(payload) -> bytes:
+    """
+    Serialize a payload to JSON bytes.
+
+    NumPy arrays and scalars are encoded natively, and NaN becomes null.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        return json.dumps(payload, default=_default, allow_nan=False).encode()
+    except ValueError:
+        # Only payloads holding NaN or infinity pay for the copy
+        return json.dumps(_finite(payload), default=_default, allow_nan=False).encode()
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Build a Flask JSON response using the fast encoder."""
+    with stage("encode"):
+        body = dumps(payload)
+    return Response(body, status=status, mimetype="application/json")
+
+
+def columnar_table(data: PriceData, lo: int, hi: int) -> Dict[str, object]:
+    """
+    Return rows ``[lo, hi)`` as ``{"Date": [...], "Close": [...], ...}``.
+
+    Numeric columns are array views, so no per-row objects are created.
+    """
+    table = {"Date": format_dates(data.dates[lo:hi]).tolist()}
+    for name, values in data.columns.items():
+        table[name] = np.asarray(values[lo:hi])
+    return table
+
+
+def ndjson_rows(data: PriceData, lo: int, hi: int, chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Yield rows ``[lo, hi)`` as newline-delimited JSON objects, one chunk at a time.
+
+    Args:
+        data (PriceData): Symbol price data
+        lo (int): First row
+        hi (int): Row to stop before
+        chunk_rows (int): Rows encoded per yielded chunk
+
+    Yields:
+        bytes: Encoded lines for one chunk
+    """
+    names = ["Date", *data.columns]
+    for start in range(lo, hi, chunk_rows):
+        stop = min(start + chunk_rows, hi)
+        columns = [format_dates(data.dates[start:stop]).tolist()]
+        columns.extend(values[start:stop].tolist() for values in data.columns.values())
+        yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in zip(*columns))
@@ -0,0 +1,78 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key wait on one in-flight
+computation and share its result (or its exception) instead of each
+repeating the work. Nothing is cached once the computation finishes;
+pair this with the service caches for that.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one computation per key at a time and share its outcome."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call ``fn(*args, **kwargs)`` unless an identical call is already running.
+
+        Args:
+            key (Hashable): Identity of the computation, e.g. (handler, symbol, params)
+            fn (Callable): Computation to run
+
+        Returns:
+            Any: The computation's result, shared by every coalesced caller
+
+        Raises:
+            Exception: Whatever the computation raised, re-raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return executed/coalesced counters and the number of calls in flight."""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+# Shared by the request handlers; keys start with the handler name
+request_flight = SingleFlight()
@@ -1,74 +1,227 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from flask import jsonify
-import pandas as pd
-import os
+from .price_store import DATA_FOLDER, PriceDataError, price_store
+from .singleflight import request_flight
+from .regression import trend_model
+from . import downsample
+from .telemetry import stage
+from .symbols import normalize_symbol, symbol_registry
+from .serialization import json_response
+from .backtest import DEFAULT_MIN_TRAIN, MAX_HORIZON, PREDICTORS, backtester
+from . import keras_predict
 
-DATA_FOLDER = os.path.join(os.path.dirname(__file__), "data")
+PREDICTION_MODELS = ("linear", "keras")
 
-def normalize_symbol(symbol: str) -> str:
-    """Remove exchange suffix like .NS or .BO to match CSV filenames."""
-    return symbol.split(".")[0].upper()
+def prediction_etag_key(args, symbol):
+    """
+    Return the cheap identity of a prediction response, or None if there is no data.
+
+    Predicted dates are counted from today, so the date is part of the key.
+    """
+    clean_symbol = symbol_registry.resolve(symbol)
+    version = price_store.version(clean_symbol) if clean_symbol else None
+    if version is None:
+        return None
+    return clean_symbol, version, date.today().isoformat()
+
+def _backtest_symbols(symbols):
+    """Normalize a comma-separated symbols parameter; None means every symbol."""
+    if not symbols:
+        return None
+    return sorted({normalize_symbol(s) for s in symbols.split(",") if s.strip()})
+
+def backtest_etag_key(args):
+    """Return the identity of a backtest response: the data versions of the symbols it covers."""
+    return (backtester.fingerprint(backtester.versions(_backtest_symbols(args.get("symbols")))),)
+
+def _build_prediction(symbol, max_points, method):
+    """
+    Compute the prediction response body for a normalized symbol.
+
+    Returns:
+        Tuple[Dict, int]: JSON-serializable body and HTTP status
+    """
+    # Load date-sorted price data from the shared store
+    with stage("load"):
+        data = price_store.get(symbol)
+    if data is None:
+        return {'error': f'CSV data not found for {symbol}'}, 404
+
+    # Expecting standard headers
+    if 'Close' not in data:
+        return {'error': 'CSV must contain Date and Close columns'}, 400
+
+    y = data['Close']
+
+    # Predict next 10 years from the memoized trend fit in one vectorized step
+    now = datetime.now()
+    future_dates = [now + timedelta(days=365 * i) for i in range(1, 11)]
+    future_ordinals = np.array([d.toordinal() for d in future_dates])
+    with stage("fit"):
+        predictions = trend_model.predict(data, future_ordinals)
+    predicted_dates = [d.strftime('%Y-%m-%d') for d in future_dates]
+
+    # Project returns
+    stocks = [10, 20, 50, 100]
+    current_price = y[-1]
+    returns = [
+        {
+            'stocks_bought': stock,
+            'current_price': round(current_price * stock, 2),
+            'after_1_year': round(predictions[0] * stock, 2),
+            'after_5_years': round(predictions[4] * stock, 2),
+            'after_10_years': round(predictions[9] * stock, 2),
+        }
+        for stock in stocks
+    ]
+
+    # Downsample the actual series for display
+    with stage("downsample"):
+        rows = downsample.select_rows(data, 0, len(data), max_points, method)
+    actual = y if rows is None else y[rows]
+    actual_dates = data.dates if rows is None else data.dates[rows]
+
+    return {
+        'predictions': predictions.tolist(),
+        'predicted_dates': predicted_dates,
+        'actual': actual.tolist(),
+        'actual_dates': np.datetime_as_string(actual_dates, unit='D').tolist(),
+        'returns': returns
+    }, 200
+
+def _build_keras_prediction(symbol, max_points, method, horizon):
+    """
+    Compute a next-days forecast from the bundled Keras model.
+
+    Returns:
+        Tuple[Dict, int]: JSON-serializable body and HTTP status
+    """
+    with stage("load"):
+        data = price_store.get(symbol)
+    if data is None:
+        return {'error': f'CSV data not found for {symbol}'}, 404
 
-def predict_stock_handler(symbol):
+    if 'Close' not in data:
+        return {'error': 'CSV must contain Date and Close columns'}, 400
+
+    try:
+        with stage("keras"):
+            predictions = keras_predict.forecast(data, horizon)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    except keras_predict.ModelUnavailableError as e:
+        return {'error': f'Keras model unavailable: {e}'}, 503
+
+    last_day = data.dates[-1].astype('datetime64[D]')
+    future_days = np.busday_offset(last_day, np.arange(1, horizon + 1), roll='forward')
+    y = data['Close']
+
+    # Project returns over the forecast horizon
+    stocks = [10, 20, 50, 100]
+    current_price = y[-1]
+    returns = [
+        {
+            'stocks_bought': stock,
+            'current_price': round(current_price * stock, 2),
+            'after_horizon': round(predictions[-1] * stock, 2),
+        }
+        for stock in stocks
+    ]
+
+    # Downsample the actual series for display
+    with stage("downsample"):
+        rows = downsample.select_rows(data, 0, len(data), max_points, method)
+    actual = y if rows is None else y[rows]
+    actual_dates = data.dates if rows is None else data.dates[rows]
+
+    return {
+        'model': 'keras',
+        'horizon_days': horizon,
+        'predictions': predictions.tolist(),
+        'predicted_dates': np.datetime_as_string(future_days, unit='D').tolist(),
+        'actual': actual.tolist(),
+        'actual_dates': np.datetime_as_string(actual_dates, unit='D').tolist(),
+        'returns': returns
+    }, 200
+
+def predict_stock_handler(symbol, max_points=None, method="lttb", model="linear",
+                          horizon=keras_predict.DEFAULT_HORIZON):
     """
     Handles prediction request based on historical stock data.
+    The returned actual series is downsampled to max_points when given.
+    model="keras" forecasts the next `horizon` trading days with the bundled
+    LSTM model instead of the 10-year linear trend.
+    Concurrent identical requests share a single model fit.
     """
     try:
+        try:
+            downsample.validate(max_points, method)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if model not in PREDICTION_MODELS:
+            return jsonify({'error': f"Invalid model '{model}', expected one of {', '.join(PREDICTION_MODELS)}"}), 400
+
         # Normalize symbol (remove .NS or .BO)
         symbol = normalize_symbol(symbol)
-
-        # Load CSV
-        file_path = os.path.join(DATA_FOLDER, f"{symbol}.csv")
-        if not os.path.exists(file_path):
+        if symbol_registry.resolve(symbol) is None:
             return jsonify({'error': f'CSV data not found for {symbol}'}), 404
 
-        data = pd.read_csv(file_path)
-
-        # Expecting standard headers
-        if 'Date' not in data.columns or 'Close' not in data.columns:
-            return jsonify({'error': 'CSV must contain Date and Close columns'}), 400
-
-        # Preprocess
-        data['Date'] = pd.to_datetime(data['Date'])
-        data = data.sort_values('Date')
-        data.set_index('Date', inplace=True)
-
-        X = data.index.map(datetime.toordinal).values.reshape(-1, 1)
-        y = data['Close'].values.flatten()
-
-        # Train model
-        model = LinearRegression()
-        model.fit(X, y)
-
-        # Predict next 10 years
-        future_dates = [datetime.now() + timedelta(days=365 * i) for i in range(1, 11)]
-        future_ordinals = [d.toordinal() for d in future_dates]
-        predictions = model.predict(np.array(future_ordinals).reshape(-1, 1))
-        predicted_dates = [d.strftime('%Y-%m-%d') for d in future_dates]
-
-        # Project returns
-        stocks = [10, 20, 50, 100]
-        current_price = y[-1]
-        returns = [
-            {
-                'stocks_bought': stock,
-                'current_price': round(current_price * stock, 2),
-                'after_1_year': round(predictions[0] * stock, 2),
-                'after_5_years': round(predictions[4] * stock, 2),
-                'after_10_years': round(predictions[9] * stock, 2),
-            }
-            for stock in stocks
-        ]
-
-        return jsonify({
-            'predictions': predictions.tolist(),
-            'predicted_dates': predicted_dates,
-            'actual': y.tolist(),
-            'actual_dates': data.index.strftime('%Y-%m-%d').tolist(),
-            'returns': returns
-        })
+        if model == 'keras':
+            if not keras_predict.available():
+                return jsonify({'error': 'Keras model unavailable: install the packages in '
+                                         'requirements-keras.txt to enable model=keras'}), 503
+            if not 1 <= horizon <= keras_predict.MAX_HORIZON:
+                return jsonify({'error': f'horizon must be between 1 and {keras_predict.MAX_HORIZON}'}), 400
+            payload, status = request_flight.do(
+                ('predict', symbol, (max_points, method, model, horizon)),
+                _build_keras_prediction, symbol, max_points, method, horizon
+            )
+        else:
+            payload, status = request_flight.do(
+                ('predict', symbol, (max_points, method)), _build_prediction, symbol, max_points, method
+            )
+        return json_response(payload, status)
+
+    except PriceDataError:
+        return jsonify({'error': 'CSV must contain Date and Close columns'}), 400
+
+    except Exception as e:
+        return jsonify({'error': f'Internal Server Error: {str(e)}'}), 500
+
+def get_backtest_handler(symbols=None, predictors="linear", horizon=5, min_train=DEFAULT_MIN_TRAIN):
+    """
+    Handles GET request for walk-forward backtest results.
+    Each predictor (comma-separated names from PREDICTORS) forecasts the
+    close `horizon` trading days ahead at every bar once `min_train` bars are
+    available, and is scored by MAE, MAPE and directional accuracy per symbol
+    (default: every symbol). Results are persisted; only symbols whose data
+    changed since the last run are re-evaluated.
+    """
+    try:
+        names = [name.strip() for name in predictors.split(",") if name.strip()]
+        unknown = [name for name in names if name not in PREDICTORS]
+        if not names or unknown:
+            return jsonify({'error': f"Invalid predictor(s) {', '.join(unknown)}, "
+                                     f"expected one of {', '.join(PREDICTORS)}"}), 400
+        if horizon is None or not 1 <= horizon <= MAX_HORIZON:
+            return jsonify({'error': f'horizon must be between 1 and {MAX_HORIZON}'}), 400
+        if min_train is None or min_train < 2:
+            return jsonify({'error': 'min_train must be at least 2'}), 400
+
+        selected = _backtest_symbols(symbols)
+        if selected is not None:
+            unknown = [s for s in selected if symbol_registry.resolve(s) is None]
+            if unknown:
+                return jsonify({'error': f"CSV data not found for {', '.join(unknown)}"}), 404
+
+        names = list(dict.fromkeys(names))
+        with stage("backtest"):
+            payload = request_flight.do(
+                ('backtest', None if selected is None else tuple(selected), (tuple(names), horizon, min_train)),
+                backtester.run, selected, names, horizon, min_train
+            )
+        return json_response({'predictors': names, **payload})
 
     except Exception as e:
         return jsonify({'error': f'Internal Server Error: {str(e)}'}), 500
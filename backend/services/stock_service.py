@@ -1,101 +1,528 @@
 import os
-import pandas as pd
-import json
-import plotly.express as px
-import plotly
 import logging
-from flask import jsonify
-from .sentiment_service import fetch_stock_news_with_sentiment
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from flask import Response, jsonify, stream_with_context
+from .sentiment_service import (
+    fetch_stock_news_with_sentiment, get_sentiment_history, news_version, sentiment_history_revision,
+)
+from .sentiment_history import MAX_WINDOW
+from .price_store import DATA_FOLDER, PriceDataError, price_store
+from .periods import period_bounds
+from .charts import CHART_MODES, build_figures, build_series, format_dates
+from .singleflight import request_flight
+from .serialization import TABLE_FORMATS, columnar_table, json_response, ndjson_rows
+from .telemetry import stage
+from .indicators import indicator_engine
+from .resample import INTERVALS, resample
+from .symbols import DEFAULT_LIMIT, MAX_LIMIT, normalize_symbol, symbol_registry
+from .panel import (
+    SCREEN_METRICS, correlation_matrix, log_returns, market_panel, panel_results, rolling_beta, screen_values,
+)
+from . import downsample
 
-DATA_FOLDER = os.path.join(os.path.dirname(__file__), "data")
+NEWS_MODES = ("wait", "cached", "none")
+BATCH_FIELDS = ("info", "series", "table", "news")
+BATCH_MAX_SYMBOLS = int(os.getenv("BATCH_MAX_SYMBOLS", "50"))
+CORRELATION_MAX_SYMBOLS = int(os.getenv("CORRELATION_MAX_SYMBOLS", "100"))
+MAX_BETA_WINDOW = 756
+SCREENER_MAX_TOP = 100
 
-def normalize_symbol(symbol: str) -> str:
+# Bounded pool shared by every batch request
+_batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BATCH_MAX_WORKERS", "8")), thread_name_prefix="stock-batch"
+)
+
+def stock_data_etag_key(args, symbol):
     """
-    Removes NSE (.NS) and BSE (.BO) suffixes to match CSV filenames.
+    Return the cheap identity of a stock data response, or None if there is no data.
+
+    Combines the symbol's data version with the fetch time of its cached
+    news, so a new CSV/catalog generation or fresh news changes the ETag.
     """
-    return symbol.replace(".NS", "").replace(".BO", "")
+    clean_symbol = symbol_registry.resolve(symbol)
+    version = price_store.version(clean_symbol) if clean_symbol else None
+    if version is None:
+        return None
+    news = news_version(clean_symbol) if args.get("news", "wait") != "none" else None
+    return clean_symbol, version, news
+
+def _stock_info(clean_symbol, data):
+    """Return the latest-bar quote shown in the stock info card."""
+    latest = data.latest()
+    return {
+        "name": clean_symbol,
+        "exchange": "Local CSV",
+        "open": float(latest.get("Open", 0)),
+        "close": float(latest.get("Close", 0)),
+        "high": float(latest.get("High", 0)),
+        "low": float(latest.get("Low", 0)),
+        "volume": int(latest.get("Volume", 0)),
+        "market_cap": 0,
+        "pe_ratio": 0,
+        "dividend_yield": 0
+    }
+
+def _table_records(data, lo, hi):
+    """Return table rows [lo, hi) as records with DD-MM-YYYY dates."""
+    table_data = data.to_frame(lo, hi)
+    table_data["Date"] = table_data["Date"].dt.strftime("%d-%m-%Y")
+    return table_data.to_dict(orient="records")
 
-def get_stock_data_handler(symbol, chart_period="1mo", table_period="1mo"):
+def _build_stock_payload(clean_symbol, chart_period, table_period, start, end,
+                         chart, max_points, method, news, table_format, interval):
+    """
+    Compute the stock data response body for a normalized symbol.
+
+    Returns:
+        Tuple[Dict, int]: JSON-serializable body and HTTP status
+    """
+    # Load date-sorted price data from the shared store
+    with stage("load"):
+        data = price_store.get(clean_symbol)
+    if data is None:
+        logging.error(f"CSV not found: {price_store.path_for(clean_symbol)}")
+        return {"error": f"No data found for ticker {clean_symbol}"}, 404
+
+    if len(data) == 0:
+        return {"error": f"No valid rows found in {clean_symbol}.csv"}, 500
+
+    if "Close" not in data:
+        return {"error": "CSV missing 'Close' column"}, 500
+
+    # Extract latest row for stock info, always from the daily bars
+    stock_basic_info = _stock_info(clean_symbol, data)
+    data = resample(data, interval)
+
+    # Cut chart & table ranges independently from the sorted dates
+    try:
+        chart_lo, chart_hi = period_bounds(data.dates, chart_period, start, end)
+        table_lo, table_hi = period_bounds(data.dates, table_period, start, end)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    # Chart payload: raw arrays, or line & area figures cached per data version
+    with stage("chart"):
+        if chart == "series":
+            chart_payload = {"chart_series": build_series(data, chart_lo, chart_hi, max_points, method)}
+        else:
+            graphJSON1, graphJSON2 = build_figures(data, chart_lo, chart_hi, max_points, method)
+            chart_payload = {"graph_data1": graphJSON1, "graph_data2": graphJSON2}
+
+    with stage("table"):
+        table = (columnar_table(data, table_lo, table_hi) if table_format == "columnar"
+                 else _table_records(data, table_lo, table_hi))
+
+    # Fetch news with sentiment analysis
+    with stage("news"):
+        if news == "none":
+            news_data = {}
+        else:
+            news_data = fetch_stock_news_with_sentiment(clean_symbol, block=(news == "wait"))
+
+    return {
+        "stock_data": table,
+        **chart_payload,
+        "stock_info": stock_basic_info,
+        "stock_news": news_data.get("articles", []),
+        "sentiment_summary": news_data.get("sentiment_summary", {}),
+        "chart_period": chart_period,
+        "table_period": table_period,
+        "interval": interval
+    }, 200
+
+def _stream_table(clean_symbol, table_period, start, end, interval):
+    """Stream the table rows for a period as NDJSON."""
+    data = price_store.get(clean_symbol)
+    if data is None:
+        logging.error(f"CSV not found: {price_store.path_for(clean_symbol)}")
+        return jsonify({"error": f"No data found for ticker {clean_symbol}"}), 404
+    data = resample(data, interval)
+    try:
+        lo, hi = period_bounds(data.dates, table_period, start, end)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(stream_with_context(ndjson_rows(data, lo, hi)), mimetype="application/x-ndjson")
+
+def get_stock_data_handler(symbol, chart_period="1mo", table_period="1mo", start=None, end=None,
+                           chart="figure", max_points=None, method="lttb", news="wait",
+                           table_format="records", interval="1d"):
     """
     Handles GET request for stock data from local CSV files.
     Returns price chart, table, news with sentiment, and stock info in JSON format.
+    Chart and table rows are limited to their periods; explicit start/end
+    dates override both periods. With chart="series" the chart is returned as
+    raw x/y arrays instead of two Plotly figures. max_points caps the chart
+    series, downsampled with the given method ("lttb" or "minmax").
+    news="cached" returns cached (or empty) news without waiting on NewsAPI;
+    news="none" skips news entirely.
+    table_format="columnar" returns stock_data as one array per column;
+    table_format="ndjson" streams only the table rows, one JSON object per line.
+    interval="1wk" or "1mo" aggregates the daily bars for both chart and
+    table (day periods such as "5d" then count weekly or monthly bars).
+    Concurrent identical requests share a single computation.
     """
     try:
-        # Normalize symbol to match CSV filename
+        if chart not in CHART_MODES:
+            return jsonify({"error": f"Invalid chart mode '{chart}', expected one of {', '.join(CHART_MODES)}"}), 400
+        if news not in NEWS_MODES:
+            return jsonify({"error": f"Invalid news mode '{news}', expected one of {', '.join(NEWS_MODES)}"}), 400
+        if table_format not in TABLE_FORMATS:
+            return jsonify({"error": f"Invalid format '{table_format}', expected one of {', '.join(TABLE_FORMATS)}"}), 400
+        if interval not in INTERVALS:
+            return jsonify({"error": f"Invalid interval '{interval}', expected one of {', '.join(INTERVALS)}"}), 400
+        try:
+            downsample.validate(max_points, method)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Normalize symbol to match CSV filename; unknown symbols never touch the disk
         clean_symbol = normalize_symbol(symbol)
+        if symbol_registry.resolve(clean_symbol) is None:
+            return jsonify({"error": f"No data found for ticker {clean_symbol}"}), 404
+
+        if table_format == "ndjson":
+            return _stream_table(clean_symbol, table_period, start, end, interval)
+
+        params = (chart_period, table_period, start, end, chart, max_points, method, news, table_format, interval)
+        payload, status = request_flight.do(
+            ("stock_data", clean_symbol, params), _build_stock_payload, clean_symbol, *params
+        )
+        return json_response(payload, status)
 
-        # Path to stock CSV file
-        csv_path = os.path.join(DATA_FOLDER, f"{clean_symbol}.csv")
-        if not os.path.exists(csv_path):
-            logging.error(f"CSV not found: {csv_path}")
+    except PriceDataError as e:
+        return jsonify({"error": str(e)}), 500
+
+    except Exception as e:
+        logging.exception(f"Error in get_stock_data_handler for {symbol}")
+        return jsonify({"error": str(e)}), 500
+
+def _build_symbol_fields(clean_symbol, fields, period, max_points, method, news):
+    """
+    Compute only the requested fields for one symbol of a batch request.
+
+    Returns:
+        Tuple[Dict, int]: JSON-serializable body and HTTP status
+    """
+    data = price_store.get(clean_symbol)
+    if data is None:
+        return {"error": f"No data found for ticker {clean_symbol}"}, 404
+    if len(data) == 0:
+        return {"error": f"No valid rows found in {clean_symbol}.csv"}, 500
+    if "Close" not in data:
+        return {"error": "CSV missing 'Close' column"}, 500
+
+    result = {}
+    if "info" in fields:
+        result["stock_info"] = _stock_info(clean_symbol, data)
+    if "series" in fields or "table" in fields:
+        try:
+            lo, hi = period_bounds(data.dates, period)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if "series" in fields:
+            result["chart_series"] = build_series(data, lo, hi, max_points, method)
+        if "table" in fields:
+            result["stock_data"] = _table_records(data, lo, hi)
+    if "news" in fields:
+        news_data = fetch_stock_news_with_sentiment(clean_symbol, block=(news == "wait"))
+        result["stock_news"] = news_data.get("articles", [])
+        result["sentiment_summary"] = news_data.get("sentiment_summary", {})
+    return result, 200
+
+def _batch_symbol(clean_symbol, fields, period, max_points, method, news):
+    params = (fields, period, max_points, method, news)
+    try:
+        return request_flight.do(
+            ("stock_batch", clean_symbol, params), _build_symbol_fields, clean_symbol, *params
+        )
+    except PriceDataError as e:
+        return {"error": str(e)}, 500
+    except Exception as e:
+        logging.exception(f"Error in batch request for {clean_symbol}")
+        return {"error": str(e)}, 500
+
+def get_stocks_batch_handler(symbols, fields="info", period="1mo", max_points=None, method="lttb",
+                             news="cached"):
+    """
+    Handles GET request for several symbols at once.
+    Each symbol is computed in a bounded thread pool and only the requested
+    fields (info, series, table, news) are returned. Per-symbol failures are
+    reported under "errors" without failing the whole request.
+    """
+    try:
+        requested = [s.strip() for s in (symbols or "").split(",") if s.strip()]
+        if not requested:
+            return jsonify({"error": "symbols parameter is required"}), 400
+        if len(requested) > BATCH_MAX_SYMBOLS:
+            return jsonify({"error": f"At most {BATCH_MAX_SYMBOLS} symbols per request"}), 400
+
+        field_set = frozenset(f.strip() for f in (fields or "info").split(",") if f.strip())
+        unknown = field_set - set(BATCH_FIELDS)
+        if unknown or not field_set:
+            return jsonify({"error": f"Invalid fields, expected any of {', '.join(BATCH_FIELDS)}"}), 400
+        if news not in ("wait", "cached"):
+            return jsonify({"error": "Invalid news mode, expected wait or cached"}), 400
+        try:
+            downsample.validate(max_points, method)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Deduplicate while keeping the caller's order
+        clean_symbols = list(dict.fromkeys(normalize_symbol(s) for s in requested))
+        results, errors = {}, {}
+        futures = {}
+        for sym in clean_symbols:
+            if symbol_registry.resolve(sym) is None:
+                errors[sym] = {"error": f"No data found for ticker {sym}", "status": 404}
+                continue
+            futures[sym] = _batch_executor.submit(_batch_symbol, sym, field_set, period, max_points, method, news)
+
+        for sym, future in futures.items():
+            payload, status = future.result()
+            if status == 200:
+                results[sym] = payload
+            else:
+                errors[sym] = {**payload, "status": status}
+
+        return json_response({
+            "symbols": clean_symbols,
+            "fields": sorted(field_set),
+            "results": results,
+            "errors": errors
+        })
+
+    except Exception as e:
+        logging.exception("Error in get_stocks_batch_handler")
+        return jsonify({"error": str(e)}), 500
+
+def indicators_etag_key(args, symbol):
+    """Return the identity of an indicators response: the symbol's data version."""
+    clean_symbol = symbol_registry.resolve(symbol)
+    version = price_store.version(clean_symbol) if clean_symbol else None
+    if version is None:
+        return None
+    return clean_symbol, version
+
+def get_indicators_handler(symbol, names, period="1y", start=None, end=None):
+    """
+    Handles GET request for technical indicators of a stock.
+    names is a comma-separated list such as "rsi14,ema20,macd,bb20_2,vwap".
+    Indicators are computed over the full history (cached per data version)
+    and returned for the rows of the period, or start/end when given.
+    """
+    try:
+        requested = [n.strip() for n in (names or "").split(",") if n.strip()]
+        if not requested:
+            return jsonify({"error": "names parameter is required, e.g. names=rsi14,ema20"}), 400
+
+        clean_symbol = normalize_symbol(symbol)
+        if symbol_registry.resolve(clean_symbol) is None:
+            return jsonify({"error": f"No data found for ticker {clean_symbol}"}), 404
+        with stage("load"):
+            data = price_store.get(clean_symbol)
+        if data is None:
+            logging.error(f"CSV not found: {price_store.path_for(clean_symbol)}")
             return jsonify({"error": f"No data found for ticker {clean_symbol}"}), 404
+        if "Close" not in data:
+            return jsonify({"error": "CSV missing 'Close' column"}), 500
 
-        # Load data
-        df = pd.read_csv(csv_path)
+        try:
+            lo, hi = period_bounds(data.dates, period, start, end)
+            with stage("indicators"):
+                computed = indicator_engine.compute_many(data, requested)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # Ensure proper datetime (dayfirst for DD-MM-YYYY format)
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors="coerce")
-        else:
-            return jsonify({"error": "CSV missing 'Date' column"}), 500
-
-        # Drop invalid dates if any
-        df = df.dropna(subset=["Date"]).sort_values("Date", ascending=True).reset_index(drop=True)
-
-        if df.empty:
-            return jsonify({"error": f"No valid rows found in {clean_symbol}.csv"}), 500
-
-        # Extract latest row for stock info
-        latest = df.iloc[-1]
-        stock_basic_info = {
-            "name": clean_symbol,
-            "exchange": "Local CSV",
-            "open": float(latest["Open"]) if "Open" in df.columns else 0,
-            "close": float(latest["Close"]) if "Close" in df.columns else 0,
-            "high": float(latest["High"]) if "High" in df.columns else 0,
-            "low": float(latest["Low"]) if "Low" in df.columns else 0,
-            "volume": int(latest["Volume"]) if "Volume" in df.columns else 0,
-            "market_cap": 0,
-            "pe_ratio": 0,
-            "dividend_yield": 0
-        }
-
-        # For now, using same data for chart & table
-        chart_data = df.copy()
-        table_data = df.copy()
-
-        # Format date for frontend
-        chart_data["Date"] = chart_data["Date"].dt.strftime("%d-%m-%Y")
-        table_data["Date"] = table_data["Date"].dt.strftime("%d-%m-%Y")
-
-        # Generate line chart
-        fig1 = px.line(chart_data, x="Date", y="Close",
-                       title=f"{clean_symbol} Stock Price Over Time", markers=True)
-        fig1.update_layout(width=1200, height=600)
-        fig1.update_xaxes(autorange="reversed")
-        graphJSON1 = json.dumps(fig1, cls=plotly.utils.PlotlyJSONEncoder)
-
-        # Generate area chart
-        fig2 = px.area(chart_data, x="Date", y="Close",
-                       title=f"{clean_symbol} Stock Price Area Chart", markers=True)
-        fig2.update_layout(width=1200, height=600)
-        fig2.update_xaxes(autorange="reversed")
-        graphJSON2 = json.dumps(fig2, cls=plotly.utils.PlotlyJSONEncoder)
-
-        # Fetch news with sentiment analysis
-        news_data = fetch_stock_news_with_sentiment(clean_symbol)
-
-        return jsonify({
-            "stock_data": table_data.to_dict(orient="records"),
-            "graph_data1": graphJSON1,
-            "graph_data2": graphJSON2,
-            "stock_info": stock_basic_info,
-            "stock_news": news_data.get("articles", []),
-            "sentiment_summary": news_data.get("sentiment_summary", {}),
-            "chart_period": chart_period,
-            "table_period": table_period
+        return json_response({
+            "symbol": clean_symbol,
+            "period": period,
+            "dates": format_dates(data.dates[lo:hi], day_first=False).tolist(),
+            "indicators": {
+                name: {column: values[lo:hi] for column, values in outputs.items()}
+                for name, outputs in computed.items()
+            },
         })
 
+    except PriceDataError as e:
+        return jsonify({"error": str(e)}), 500
+
     except Exception as e:
-        logging.exception(f"Error in get_stock_data_handler for {symbol}")
+        logging.exception(f"Error in get_indicators_handler for {symbol}")
+        return jsonify({"error": str(e)}), 500
+
+def sentiment_history_etag_key(args, symbol):
+    """Return the identity of a sentiment history response: its revision and today's date."""
+    clean_symbol = normalize_symbol(symbol)
+    return clean_symbol, sentiment_history_revision(clean_symbol), date.today().isoformat()
+
+def get_sentiment_history_handler(symbol, window=30, rolling=7):
+    """
+    Handles GET request for a stock's stored news sentiment history.
+    Returns one entry per day for the last `window` days with the day's
+    sentiment index, distribution and confidence, plus a trailing
+    `rolling`-day index, read from precomputed daily aggregates.
+    """
+    try:
+        if not 1 <= window <= MAX_WINDOW:
+            return jsonify({"error": f"window must be between 1 and {MAX_WINDOW}"}), 400
+        if not 1 <= rolling <= MAX_WINDOW:
+            return jsonify({"error": f"rolling must be between 1 and {MAX_WINDOW}"}), 400
+        return json_response(get_sentiment_history(normalize_symbol(symbol), window, rolling))
+
+    except Exception as e:
+        logging.exception(f"Error in get_sentiment_history_handler for {symbol}")
+        return jsonify({"error": str(e)}), 500
+
+def get_symbols_handler(query="", limit=DEFAULT_LIMIT):
+    """
+    Handles GET request for symbol autocomplete.
+    Returns up to limit symbols whose ticker or company name starts with
+    query (case-insensitive), ticker matches first.
+    """
+    if limit is None or not 1 <= limit <= MAX_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_LIMIT}"}), 400
+    return json_response({"query": query, "results": symbol_registry.search(query, limit)})
+
+def panel_etag_key(args):
+    """Return the identity of a panel response: the fingerprint of every symbol's data version."""
+    return (market_panel.fingerprint(),)
+
+def _panel_symbols(panel, symbols):
+    """
+    Resolve a comma-separated symbols parameter against the panel.
+
+    Returns:
+        Tuple[List[str], Optional[Tuple]]: Symbols (every panel symbol when
+        none are given) and an error response, if any
+    """
+    if not symbols:
+        return panel.symbols, None
+    requested = list(dict.fromkeys(normalize_symbol(s) for s in symbols.split(",") if s.strip()))
+    unknown = [s for s in requested if s not in panel.rows]
+    if unknown:
+        return [], (jsonify({"error": f"No data found for ticker(s) {', '.join(unknown)}"}), 404)
+    return requested, None
+
+def _iso_date(value):
+    return str(np.datetime_as_string(value, unit="D"))
+
+def get_correlation_handler(symbols=None, period="1y", start=None, end=None, min_periods=20,
+                            benchmark=None, window=60):
+    """
+    Handles GET request for the correlation matrix of daily log returns.
+    Covers the given symbols (default: all, up to CORRELATION_MAX_SYMBOLS)
+    over the period, or start/end when given; each pair uses the dates both
+    symbols traded, and pairs with fewer than min_periods get null.
+    With benchmark, also returns each symbol's rolling beta against it over
+    a trailing window of trading days.
+    Results are computed on the aligned market panel and cached per data version.
+    """
+    try:
+        panel = market_panel.current()
+        selected, error = _panel_symbols(panel, symbols)
+        if error:
+            return error
+        if not selected:
+            return jsonify({"error": "No symbols with price data"}), 404
+        if len(selected) > CORRELATION_MAX_SYMBOLS:
+            return jsonify({"error": f"At most {CORRELATION_MAX_SYMBOLS} symbols per correlation matrix"}), 400
+        if min_periods is None or min_periods < 2:
+            return jsonify({"error": "min_periods must be at least 2"}), 400
+        bench = normalize_symbol(benchmark) if benchmark else None
+        if bench is not None:
+            if bench not in panel.rows:
+                return jsonify({"error": f"No data found for benchmark {bench}"}), 404
+            if window is None or not 2 <= window <= MAX_BETA_WINDOW:
+                return jsonify({"error": f"window must be between 2 and {MAX_BETA_WINDOW}"}), 400
+        try:
+            lo, hi = period_bounds(panel.dates, period, start, end)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        key = ("correlation", tuple(selected), lo, hi, min_periods, bench, window, panel.fingerprint)
+        payload = panel_results.get(key)
+        if payload is None:
+            with stage("correlation"):
+                rows = panel.select(selected)
+                # Start one bar early so the first date in range has a return
+                first = max(lo - 1, 0)
+                returns = log_returns(panel["Close"][rows, first:hi])[:, lo - first:]
+                payload = {
+                    "symbols": selected,
+                    "period": period,
+                    "start": _iso_date(panel.dates[lo]) if hi > lo else None,
+                    "end": _iso_date(panel.dates[hi - 1]) if hi > lo else None,
+                    "matrix": correlation_matrix(returns, min_periods),
+                }
+                if bench is not None:
+                    first = max(lo - window, 0)
+                    close = panel["Close"][:, first:hi]
+                    all_returns = log_returns(close)
+                    beta = rolling_beta(all_returns[rows], all_returns[panel.rows[bench]], window)[:, lo - first:]
+                    payload["beta"] = {
+                        "benchmark": bench,
+                        "window": window,
+                        "dates": format_dates(panel.dates[lo:hi], day_first=False),
+                        "series": dict(zip(selected, beta)),
+                        "latest": dict(zip(selected, beta[:, -1] if hi > lo else [None] * len(selected))),
+                    }
+            panel_results.put(key, payload)
+        return json_response(payload)
+
+    except Exception as e:
+        logging.exception("Error in get_correlation_handler")
+        return jsonify({"error": str(e)}), 500
+
+def get_screener_handler(metric="return", period="1mo", start=None, end=None, top=10, order="desc",
+                         symbols=None):
+    """
+    Handles GET request for a ranked screen over every symbol, e.g. the top 10
+    by one-month return. metric is one of "return", "volatility"
+    (annualized), "drawdown" or "volume" (mean daily); order is "desc" or
+    "asc". Symbols whose metric cannot be computed for the period are left out.
+    """
+    try:
+        if metric not in SCREEN_METRICS:
+            return jsonify({"error": f"Invalid metric '{metric}', expected one of {', '.join(SCREEN_METRICS)}"}), 400
+        if order not in ("asc", "desc"):
+            return jsonify({"error": "Invalid order, expected asc or desc"}), 400
+        if top is None or not 1 <= top <= SCREENER_MAX_TOP:
+            return jsonify({"error": f"top must be between 1 and {SCREENER_MAX_TOP}"}), 400
+        panel = market_panel.current()
+        selected, error = _panel_symbols(panel, symbols)
+        if error:
+            return error
+        try:
+            lo, hi = period_bounds(panel.dates, period, start, end)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        key = ("screen", metric, lo, hi, panel.fingerprint)
+        values = panel_results.get(key)
+        if values is None:
+            with stage("screen"):
+                values = screen_values(panel, metric, lo, hi)
+            panel_results.put(key, values)
+
+        rows = panel.select(selected)
+        scores = values[rows]
+        ranked = rows[np.isfinite(scores)]
+        ranked = ranked[np.argsort(values[ranked], kind="stable")]
+        if order == "desc":
+            ranked = ranked[::-1]
+        ranked = ranked[:top]
+        return json_response({
+            "metric": metric,
+            "period": period,
+            "order": order,
+            "start": _iso_date(panel.dates[lo]) if hi > lo else None,
+            "end": _iso_date(panel.dates[hi - 1]) if hi > lo else None,
+            "universe": len(selected),
+            "results": [{"symbol": panel.symbols[i], "value": float(values[i])} for i in ranked],
+        })
+
+    except Exception as e:
+        logging.exception("Error in get_screener_handler")
         return jsonify({"error": str(e)}), 500
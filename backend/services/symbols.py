@@ -0,0 +1,244 @@
+"""
+Symbol normalization and an in-memory index of the symbols with data.
+
+Provides functionality for:
+- One ``normalize_symbol`` for every handler: upper-cased, with the NSE
+  (.NS) and BSE (.BO) exchange suffixes removed
+- A registry of the symbols in the data folder and the catalog manifest,
+  built by one directory scan and answering membership in O(1)
+- Prefix search over symbols and company names for autocomplete, by binary
+  search over sorted keys, so a lookup costs O(log n + limit)
+- Rebuilding the index when the data folder, the manifest or the company
+  names file changes, checked at most once per ``SYMBOL_REFRESH_SECONDS``
+  and on every miss
+
+Company names come from a JSON object of symbol -> name at
+``COMPANY_NAMES_PATH`` (default ``services/companies.json``).
+
+The prefix index is two sorted key lists searched with ``bisect`` instead
+of a character trie. A prefix query walks the same entries either way: it
+finds the first key at or after the prefix, then reads forward until a key
+no longer matches. Sorted lists give that in O(log n + limit) with a small
+fraction of the memory. For 5000 tickers with three-word names the index
+takes about 4 MB, where the two tries alone take about 25 MB of per-node
+dicts. A rebuild is also just one sort.
+"""
+
+import os
+import re
+import json
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .catalog import MANIFEST_NAME, read_manifest
+from .price_store import PriceStore, price_store
+
+EXCHANGE_SUFFIXES = (".NS", ".BO")
+COMPANY_NAMES_PATH = os.getenv(
+    "COMPANY_NAMES_PATH", os.path.join(os.path.dirname(__file__), "companies.json")
+)
+REFRESH_SECONDS = float(os.getenv("SYMBOL_REFRESH_SECONDS", "1.0"))
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_WORD = re.compile(r"[A-Z0-9]+")
+
+
+def normalize_symbol(symbol: str) -> str:
+    """
+    Return the data-folder symbol for a ticker, e.g. ``tcs.ns`` -> ``TCS``.
+
+    Only the known exchange suffixes are removed, so class shares such as
+    ``BRK.B`` keep theirs.
+    """
+    clean = symbol.strip().upper()
+    for suffix in EXCHANGE_SUFFIXES:
+        if clean.endswith(suffix):
+            return clean[:-len(suffix)]
+    return clean
+
+
+class _Index:
+    """
+    Immutable snapshot of the known symbols; replaced wholesale on refresh.
+
+    ``sorted_symbols`` and ``name_keys`` stand in for prefix tries: every key
+    sharing a prefix is a contiguous run starting at its ``bisect_left`` position.
+    """
+
+    def __init__(self, symbols: List[str], names: Dict[str, str]):
+        self.symbols = frozenset(symbols)
+        self.names = {symbol: names.get(symbol) for symbol in symbols}
+        self.sorted_symbols = sorted(symbols)
+        # (key, symbol) pairs for the full company name and each word in it
+        name_keys = set()
+        for symbol in symbols:
+            name = (self.names[symbol] or "").upper()
+            words = _WORD.findall(name)
+            if words:
+                name_keys.add((" ".join(words), symbol))
+                name_keys.update((word, symbol) for word in words)
+        self.name_keys = sorted(name_keys)
+
+
+class SymbolRegistry:
+    """Known symbols and company names for a price store's data folder."""
+
+    def __init__(self, store: PriceStore = price_store, names_path: str = COMPANY_NAMES_PATH,
+                 refresh_seconds: float = REFRESH_SECONDS):
+        self.store = store
+        self.names_path = names_path
+        self.refresh_seconds = refresh_seconds
+        self._index = _Index([], {})
+        self._state: Optional[Tuple] = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._stats = {"refreshes": 0, "lookups": 0, "searches": 0}
+
+    def _source_state(self) -> Tuple:
+        """Identity of everything the index is built from; changes when any of it does."""
+        def stamp(path: str) -> Optional[Tuple[int, int]]:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            return stat.st_mtime_ns, stat.st_size
+
+        folder = self.store.data_folder
+        return (folder, stamp(folder), stamp(os.path.join(self.store.catalog_dir, MANIFEST_NAME)),
+                stamp(self.names_path))
+
+    def _load_names(self) -> Dict[str, str]:
+        try:
+            with open(self.names_path) as f:
+                return {normalize_symbol(symbol): name for symbol, name in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logging.error(f"Could not read company names from {self.names_path}: {e}")
+            return {}
+
+    def _current(self, recheck: bool = False) -> _Index:
+        """Return the index, rebuilding it first if its sources changed."""
+        now = time.monotonic()
+        if not recheck and now - self._checked_at < self.refresh_seconds:
+            return self._index
+        with self._lock:
+            if not recheck and now - self._checked_at < self.refresh_seconds:
+                return self._index
+            state = self._source_state()
+            if state != self._state:
+                folder = self.store.data_folder
+                manifest = read_manifest(self.store.catalog_dir)
+                symbols = {normalize_symbol(symbol) for symbol in manifest.get("symbols", {})}
+                file_names = self._scan_csvs(folder)
+                symbols.update(file_names)
+                self.store.set_file_names({symbol: name for symbol, name in file_names.items()
+                                           if name != f"{symbol}.csv"})
+                self._index = _Index(sorted(symbols), self._load_names())
+                self._state = state
+                self._stats["refreshes"] += 1
+                logging.info(f"Symbol registry indexed {len(symbols)} symbols in {folder}")
+            self._checked_at = now
+            return self._index
+
+    @staticmethod
+    def _scan_csvs(folder: str) -> Dict[str, str]:
+        """
+        Return the folder's CSV file names keyed by normalized symbol.
+
+        A file named after a ticker (``TCS.NS.csv``) or in lower case is listed
+        under the symbol ``resolve`` returns for it; ``<SYMBOL>.csv`` wins
+        when both exist.
+        """
+        if not os.path.isdir(folder):
+            return {}
+        file_names: Dict[str, str] = {}
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".csv"):
+                symbol = normalize_symbol(name[:-4])
+                if name == f"{symbol}.csv" or symbol not in file_names:
+                    file_names[symbol] = name
+        return file_names
+
+    def resolve(self, symbol: str) -> Optional[str]:
+        """
+        Return the normalized symbol if it has data, else None.
+
+        Args:
+            symbol (str): Ticker as given by the client, e.g. TCS.NS
+
+        Returns:
+            Optional[str]: Symbol matching a CSV or catalog entry
+        """
+        clean = normalize_symbol(symbol)
+        with self._lock:
+            self._stats["lookups"] += 1
+        if clean in self._current().symbols:
+            return clean
+        # A miss re-checks the sources at once, so newly ingested symbols resolve immediately
+        return clean if clean in self._current(recheck=True).symbols else None
+
+    def symbols(self) -> List[str]:
+        """Return every known symbol, sorted."""
+        return list(self._current().sorted_symbols)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Optional[str]]]:
+        """
+        Return symbols whose ticker, company name or a word of the name starts with the query.
+
+        Ticker matches come first, then name matches, each in alphabetical
+        order; an exact ticker match is always first. An empty query lists
+        symbols alphabetically.
+
+        Args:
+            query (str): Prefix typed by the user, case-insensitive
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Dict]: ``{"symbol", "name"}`` entries
+        """
+        index = self._current()
+        with self._lock:
+            self._stats["searches"] += 1
+        prefix = normalize_symbol(query) if query.strip() else ""
+        matches: List[str] = []
+        seen = set()
+
+        def add(symbol: str) -> bool:
+            if symbol not in seen:
+                seen.add(symbol)
+                matches.append(symbol)
+            return len(matches) >= limit
+
+        if prefix in index.symbols and add(prefix):
+            return self._entries(index, matches)
+        symbols = index.sorted_symbols
+        for i in range(bisect.bisect_left(symbols, prefix), len(symbols)):
+            if not symbols[i].startswith(prefix) or add(symbols[i]):
+                break
+
+        name_prefix = " ".join(_WORD.findall(query.upper()))
+        if name_prefix and len(matches) < limit:
+            keys = index.name_keys
+            for i in range(bisect.bisect_left(keys, (name_prefix, "")), len(keys)):
+                key, symbol = keys[i]
+                if not key.startswith(name_prefix) or add(symbol):
+                    break
+        return self._entries(index, matches)
+
+    @staticmethod
+    def _entries(index: _Index, symbols: List[str]) -> List[Dict[str, Optional[str]]]:
+        return [{"symbol": symbol, "name": index.names[symbol]} for symbol in symbols]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return lookup counters and the number of indexed symbols."""
+        with self._lock:
+            return {**self._stats, "symbols": len(self._index.symbols)}
+
+
+# Global instance shared by the stock, prediction and autocomplete handlers
+symbol_registry = SymbolRegistry()
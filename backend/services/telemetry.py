@@ -0,0 +1,317 @@
+"""
+Lightweight request timing, metrics and on-demand profiling.
+
+Provides functionality for:
+- ``stage(name)`` timers that feed a per-stage histogram and the current
+  request's ``Server-Timing`` header
+- Per-route latency histograms, whose counts double as request counters
+- Cache and upstream error counters, exposed in the Prometheus text format
+  at ``/metrics``
+- A sampling profiler for a single request, enabled with
+  ``PROFILING_ENABLED=1`` and triggered by the ``_profile=1`` query parameter
+
+Everything is in-process and per worker; no client library is required.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter as _Tally
+from contextlib import contextmanager
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, has_request_context, request
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_PARAM = "_profile"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+METRICS_PREFIX = "stock_api"
+# get_stats() keys that describe current state rather than counting events, for
+# every component; register_cache adds a component's own
+_GAUGE_STATS = frozenset({"size", "symbols", "in_flight", "generation", "dates"})
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                    cumulative += count
+                    le = f'le="{bound if bound == "+Inf" else format(bound, "g")}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and pull-time collectors, and renders the exposition text."""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: Dict[str, Tuple[Callable[[], Dict], FrozenSet[str]]] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(f"{METRICS_PREFIX}_{name}", documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        metric = Histogram(f"{METRICS_PREFIX}_{name}", documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def register_cache(self, name: str, get_stats: Callable[[], Dict], gauges: Iterable[str] = ()) -> None:
+        """
+        Export a component's ``get_stats()`` values under ``cache="<name>"``.
+
+        Args:
+            name (str): Component label
+            get_stats (Callable): Returns the component's current stats
+            gauges (Iterable[str]): Stats that can go down as well as up, such
+                as in-flight work, besides the shared ``_GAUGE_STATS``; every
+                other numeric stat is exported as a counter
+        """
+        self._collectors[name] = (get_stats, _GAUGE_STATS | frozenset(gauges))
+
+    def _render_caches(self) -> List[str]:
+        events = f"{METRICS_PREFIX}_cache_events_total"
+        state = f"{METRICS_PREFIX}_cache_state"
+        event_lines, state_lines = [], []
+        for cache, (get_stats, gauges) in sorted(self._collectors.items()):
+            for key, value in sorted(get_stats().items()):
+                if not isinstance(value, (int, float)):
+                    continue
+                if key in gauges:
+                    state_lines.append(f'{state}{{cache="{cache}",stat="{key}"}} {int(value) if isinstance(value, bool) else value}')
+                elif not isinstance(value, bool) and not key.startswith("max"):
+                    event_lines.append(f'{events}{{cache="{cache}",event="{key}"}} {value}')
+        return [
+            f"# HELP {events} Cache and coalescing events by component.",
+            f"# TYPE {events} counter", *event_lines,
+            f"# HELP {state} Current size and other point-in-time state of each component.",
+            f"# TYPE {state} gauge", *state_lines,
+        ]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+request_seconds = registry.histogram(
+    "request_duration_seconds", "Request latency by route.", ("route", "method", "status")
+)
+stage_seconds = registry.histogram("stage_duration_seconds", "Time spent in each handler stage.", ("stage",))
+upstream_errors = registry.counter("upstream_errors_total", "Failed calls to upstream services.", ("upstream",))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a named stage.
+
+    The duration is always recorded in the stage histogram, and also added to
+    the current request's ``Server-Timing`` header when one is active.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_seconds.observe(elapsed, stage=name)
+        if has_request_context():
+            timings = g.setdefault("stage_timings", {})
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack at a fixed interval.
+
+    Output is in the collapsed ``frame;frame;frame count`` format read by
+    flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000.0
+        self.samples = 0
+        self._stacks = _Tally()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks, most frequent first."""
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common()) + "\n"
+
+
+def profiling() -> bool:
+    """Return True if the current request is being profiled."""
+    return has_request_context() and g.get("profiler") is not None
+
+
+def _server_timing(timings: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def _before_request() -> None:
+    g.request_started = time.perf_counter()
+    # Read per request so a .env loaded after import still applies
+    if os.getenv("PROFILING_ENABLED", "0") == "1" and request.args.get(PROFILE_PARAM) == "1":
+        g.profiler = SamplingProfiler(threading.get_ident()).start()
+
+
+def _after_request(response: Response) -> Response:
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+    total = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    request_seconds.observe(total, route=route, method=request.method, status=response.status_code)
+
+    profiler: Optional[SamplingProfiler] = g.pop("profiler", None)
+    if profiler is not None:
+        profile = profiler.stop()
+        profiled = Response(profile, mimetype="text/plain")
+        profiled.headers["X-Profile-Samples"] = str(profiler.samples)
+        profiled.headers["X-Profiled-Status"] = str(response.status_code)
+        response = profiled
+
+    response.headers["Server-Timing"] = _server_timing(g.get("stage_timings", {}), total)
+    return response
+
+
+def metrics_view() -> Response:
+    """Serve every metric in the Prometheus text exposition format."""
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app: Flask) -> None:
+    """Install the timing hooks and the ``/metrics`` route, and export cache counters."""
+    # Imported here so the service modules can import this one for ``stage``
+    from .backtest import backtester
+    from .charts import figure_cache
+    from .downsample import index_cache
+    from .http_cache import body_cache
+    from .indicators import indicator_engine
+    from .keras_predict import batcher, forecast_cache
+    from .panel import market_panel, panel_results
+    from .price_store import price_store
+    from .regression import trend_model
+    from .resample import resample_cache
+    from .sentiment_service import enhanced_sentiment_analyzer, news_cache
+    from .singleflight import request_flight
+    from .symbols import symbol_registry
+
+    for name, get_stats, *gauges in (
+        ("price_store", price_store.get_stats),
+        ("figure", figure_cache.get_stats),
+        ("downsample_index", index_cache.get_stats),
+        ("resample", resample_cache.get_stats),
+        ("trend_fit", trend_model.get_stats),
+        ("backtest", backtester.get_stats),
+        ("indicators", indicator_engine.get_stats),
+        ("panel", market_panel.get_stats),
+        ("panel_results", panel_results.get_stats),
+        ("keras_forecast", forecast_cache.get_stats),
+        ("keras_batcher", batcher.get_stats, ("forecasting", "loaded", "max_batch_seen")),
+        ("news", news_cache.get_stats),
+        ("sentiment", enhanced_sentiment_analyzer.get_stats),
+        ("response_body", body_cache.get_stats),
+        ("request_flight", request_flight.get_stats),
+        ("symbols", symbol_registry.get_stats),
+    ):
+        registry.register_cache(name, get_stats, *gauges)
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
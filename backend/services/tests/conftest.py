@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def write_csv():
+    """
+    Return a function writing daily OHLCV bars for the given dates to a CSV file.
+
+    Bars depend only on the seed and their position, so writing more dates
+    appends to the previous file's bars without revising them.
+    """
+    def write(path, dates, seed=0):
+        import pandas as pd
+
+        dates = pd.DatetimeIndex(dates)
+        close = 100 + np.cumsum(np.random.default_rng(seed).normal(size=len(dates)))
+        frame = pd.DataFrame({
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close - 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": np.random.default_rng(seed + 1).integers(1_000, 10_000, len(dates)),
+        })
+        frame.to_csv(path, index=False)
+        return frame
+    return write
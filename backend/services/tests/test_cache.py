@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+from services.cache import LRUCache
+from services.price_store import PriceStore
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get_stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2}
+
+
+def test_lru_peek_leaves_recency_and_counters():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.peek("a") == 1
+    cache.put("c", 3)
+    assert cache.peek("a") is None
+    assert cache.get_stats()["hits"] == 0 and cache.get_stats()["misses"] == 0
+
+
+def test_price_store_reuses_until_file_changes(tmp_path, write_csv):
+    dates = pd.bdate_range("2024-01-01", periods=20)
+    write_csv(tmp_path / "TCS.csv", dates)
+    store = PriceStore(str(tmp_path))
+
+    first = store.get("TCS")
+    assert len(first) == 20
+    assert store.get("TCS") is first
+    assert store.version("TCS") == first.version
+
+    write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=21))
+    assert store.version("TCS") != first.version
+    second = store.get("TCS")
+    assert len(second) == 21
+    stats = store.get_stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+
+def test_price_store_notices_same_size_rewrite(tmp_path, write_csv):
+    path = tmp_path / "TCS.csv"
+    write_csv(path, pd.bdate_range("2024-01-01", periods=5))
+    store = PriceStore(str(tmp_path))
+    first = store.get("TCS")
+
+    # Same bytes, newer mtime: the version still changes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert store.get("TCS") is not first
+
+
+def test_price_store_evicts_and_forgets_deleted(tmp_path, write_csv):
+    for symbol in ("TCS", "INFY"):
+        write_csv(tmp_path / f"{symbol}.csv", pd.bdate_range("2024-01-01", periods=5))
+    store = PriceStore(str(tmp_path), max_symbols=1)
+    store.get("TCS")
+    store.get("INFY")
+    assert store.get_stats()["evictions"] == 1
+
+    os.unlink(tmp_path / "INFY.csv")
+    assert store.get("INFY") is None
+    assert store.get_stats()["size"] == 0
+
+
+def test_load_does_not_fill_the_cache(tmp_path, write_csv):
+    write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=5))
+    store = PriceStore(str(tmp_path))
+    assert len(store.load("TCS")) == 5
+    assert store.get_stats()["size"] == 0
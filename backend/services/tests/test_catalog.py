@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.catalog import build_catalog, catalog_dir_for, open_symbol, read_manifest, write_symbol
+from services.price_store import PriceStore
+
+
+def _columns(value: float, rows: int = 4):
+    dates = pd.bdate_range("2024-01-01", periods=rows).to_numpy()
+    return dates, {"Close": np.full(rows, value)}
+
+
+def test_reader_holding_old_manifest_can_still_open(tmp_path):
+    catalog_dir = str(tmp_path / "catalog")
+    write_symbol(catalog_dir, "TCS", *_columns(1.0))
+    seen = read_manifest(catalog_dir)["symbols"]["TCS"]
+
+    # A publish lands between the reader's manifest read and its open
+    write_symbol(catalog_dir, "TCS", *_columns(2.0))
+    _, columns = open_symbol(catalog_dir, seen)
+    np.testing.assert_array_equal(columns["Close"], 1.0)
+
+    current = read_manifest(catalog_dir)["symbols"]["TCS"]
+    _, columns = open_symbol(catalog_dir, current)
+    np.testing.assert_array_equal(columns["Close"], 2.0)
+
+
+def test_publish_keeps_only_the_previous_generation(tmp_path):
+    catalog_dir = str(tmp_path / "catalog")
+    for value in (1.0, 2.0, 3.0, 4.0):
+        write_symbol(catalog_dir, "TCS", *_columns(value))
+    write_symbol(catalog_dir, "TCSX", *_columns(9.0))
+
+    manifest = read_manifest(catalog_dir)
+    assert manifest["generation"] == 5
+    assert manifest["symbols"]["TCS"]["generation"] == 4
+    # Another symbol sharing the prefix is not mistaken for a TCS generation
+    assert sorted(name for name in os.listdir(catalog_dir) if not name.startswith(".")
+                  and name != "manifest.json") == ["TCS-3", "TCS-4", "TCSX-1"]
+
+
+def test_mapped_generation_survives_removal(tmp_path):
+    catalog_dir = str(tmp_path / "catalog")
+    write_symbol(catalog_dir, "TCS", *_columns(1.0))
+    _, mapped = open_symbol(catalog_dir, read_manifest(catalog_dir)["symbols"]["TCS"])
+    write_symbol(catalog_dir, "TCS", *_columns(2.0))
+    write_symbol(catalog_dir, "TCS", *_columns(3.0))
+    assert not os.path.exists(os.path.join(catalog_dir, "TCS-1"))
+    np.testing.assert_array_equal(mapped["Close"], 1.0)
+
+
+def test_store_switches_to_new_generation(tmp_path, write_csv):
+    write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=10))
+    build_catalog(str(tmp_path))
+    store = PriceStore(str(tmp_path))
+    first = store.get("TCS")
+    assert first.version == ("catalog", 1)
+
+    write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=11))
+    # A CSV newer than its catalog entry is read directly until it is published
+    assert store.get("TCS").version[0] == "csv"
+    build_catalog(str(tmp_path))
+    second = store.get("TCS")
+    assert second.version == ("catalog", 2) and len(second) == 11
+    assert store.generation() == 2
+    assert read_manifest(catalog_dir_for(str(tmp_path)))["symbols"]["TCS"]["rows"] == 11
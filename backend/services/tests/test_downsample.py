@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from services import downsample
+
+
+def _series(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = 19_000.0 + np.arange(n)
+    y = 100 + np.cumsum(rng.normal(size=n))
+    y[rng.integers(0, n, 5)] = np.nan
+    return x, y
+
+
+@pytest.mark.parametrize("n, max_points", [(2_500, 1_200), (2_500, 500), (1_001, 1_000), (5_000, 4),
+                                           (16 * 998 + 2, 1_000), (20_000, 1_000)])
+def test_lttb_table_matches_bucket_loop(monkeypatch, n, max_points):
+    x, y = _series(n)
+    table = downsample.lttb_indices(x, y, max_points)
+    monkeypatch.setattr(downsample, "TABLE_MAX_WIDTH", 0)
+    loop = downsample.lttb_indices(x, y, max_points)
+    np.testing.assert_array_equal(table, loop)
+    assert len(table) == max_points
+    assert table[0] == 0 and table[-1] == n - 1
+    assert np.all(np.diff(table) > 0)
+
+
+def test_minmax_keeps_extremes():
+    x, y = _series(10_000, seed=1)
+    rows = downsample.minmax_indices(y, 200)
+    assert len(rows) <= 200
+    assert np.nanargmax(y) in rows and np.nanargmin(y) in rows
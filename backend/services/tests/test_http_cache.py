@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from services import http_cache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.state = {"version": 1, "calls": 0, "rows": 500}
+
+    @app.route("/prices/<symbol>")
+    @http_cache.conditional(lambda args, symbol: (symbol, app.state["version"]))
+    def prices(symbol):
+        app.state["calls"] += 1
+        return jsonify(symbol=symbol, values=list(range(app.state["rows"])))
+
+    http_cache.body_cache.clear()
+    yield app
+    http_cache.body_cache.clear()
+
+
+def _get(client, etag=None, encoding="gzip", query=""):
+    headers = {"Accept-Encoding": encoding}
+    if etag:
+        headers["If-None-Match"] = f'"{etag}"'
+    return client.get(f"/prices/TCS{query}", headers=headers)
+
+
+def test_gzip_body_has_its_own_etag(app):
+    client = app.test_client()
+    response = _get(client)
+    etag, weak = response.get_etag()
+    assert response.status_code == 200 and not weak
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert etag.endswith("-gzip")
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.get_data()))["symbol"] == "TCS"
+
+    plain = _get(client, encoding="identity")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_etag()[0] == etag[:-len("-gzip")]
+
+
+def test_matching_etag_answers_304_without_the_view(app):
+    client = app.test_client()
+    etag = _get(client).get_etag()[0]
+    calls = app.state["calls"]
+
+    response = _get(client, etag=etag)
+    assert response.status_code == 304
+    assert response.get_etag()[0] == etag
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert app.state["calls"] == calls
+
+
+def test_etag_of_another_coding_does_not_validate(app):
+    client = app.test_client()
+    gzip_etag = _get(client).get_etag()[0]
+    response = _get(client, etag=gzip_etag, encoding="identity")
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+def test_identity_etag_validates_small_bodies(app):
+    app.state["rows"] = 3
+    client = app.test_client()
+    response = _get(client)
+    assert "Content-Encoding" not in response.headers
+    etag = response.get_etag()[0]
+    assert not etag.endswith("-gzip")
+    assert _get(client, etag=etag).status_code == 304
+
+
+def test_version_and_query_change_the_etag(app):
+    client = app.test_client()
+    etag = _get(client).get_etag()[0]
+    assert _get(client, query="?period=1y").get_etag()[0] != etag
+
+    app.state["version"] = 2
+    response = _get(client, etag=etag)
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+
+
+def test_repeat_requests_replay_the_cached_body(app):
+    client = app.test_client()
+    first = _get(client)
+    second = _get(client)
+    assert app.state["calls"] == 1
+    assert second.get_data() == first.get_data()
+    assert http_cache.get_stats()["hits"] == 1
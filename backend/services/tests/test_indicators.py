@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.indicators import IndicatorEngine, _ewm, parse_indicator
+from services.price_store import PriceData
+
+NAMES = ["sma5", "ema10", "rsi14", "macd12_26_9", "bb20_2", "vwap", "vwap10"]
+
+
+def _columns(rows: int = 300, seed: int = 0, gaps: bool = True):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    high = close * (1 + np.abs(rng.normal(0, 0.01, rows)))
+    low = close * (1 - np.abs(rng.normal(0, 0.01, rows)))
+    volume = rng.integers(1_000, 100_000, rows).astype(np.float64)
+    if gaps:
+        close[:3] = np.nan
+        close[[50, 51, 52, 120, 250, rows - 1]] = np.nan
+    return {"High": high, "Low": low, "Close": close, "Volume": volume}
+
+
+@pytest.mark.parametrize("name", NAMES)
+@pytest.mark.parametrize("split", [0, 1, 2, 30, 51, 200])
+def test_step_matches_compute(name, split):
+    columns = _columns()
+    _, indicator = parse_indicator(name)
+    full, _ = indicator.compute(columns)
+
+    prefix, state = indicator.compute({column: values[:split] for column, values in columns.items()})
+    stepped = {out: list(prefix[out]) for out in indicator.outputs}
+    for i in range(split, len(columns["Close"])):
+        values, state = indicator.step(state, {column: float(columns[column][i]) for column in indicator.inputs})
+        for out, value in zip(indicator.outputs, values):
+            stepped[out].append(value)
+
+    for out in indicator.outputs:
+        np.testing.assert_allclose(stepped[out], full[out], rtol=1e-9, equal_nan=True, err_msg=out)
+
+
+@pytest.mark.parametrize("alpha", [1.0, 0.5, 2 / 21, 1 / 14, 2 / 1001, 1e-4])
+def test_ewm_matches_pandas(alpha):
+    values = 1000 + np.cumsum(np.random.default_rng(1).normal(size=20_000))
+    expected = pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(_ewm(values, alpha), expected, rtol=1e-12)
+
+
+def _pandas_reference(name: str, frame: pd.DataFrame) -> pd.DataFrame:
+    close = frame["Close"].ffill()
+    if name == "sma5":
+        return pd.DataFrame({"sma": close.rolling(5).mean()})
+    if name == "ema10":
+        return pd.DataFrame({"ema": close.ewm(span=10, adjust=False).mean()})
+    if name == "rsi14":
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        rsi = 100 - 100 / (1 + gain / loss)
+        rsi[:close.first_valid_index() + 14] = np.nan
+        return pd.DataFrame({"rsi": rsi})
+    if name == "macd12_26_9":
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = macd.ewm(span=9, adjust=False).mean()
+        return pd.DataFrame({"macd": macd, "signal": signal, "histogram": macd - signal})
+    if name == "bb20_2":
+        middle, std = close.rolling(20).mean(), close.rolling(20).std(ddof=0)
+        return pd.DataFrame({"middle": middle, "upper": middle + 2 * std, "lower": middle - 2 * std})
+    typical = (frame["High"] + frame["Low"] + frame["Close"]) / 3
+    volume = frame["Volume"].where(typical.notna(), 0.0)
+    flow = typical.fillna(0.0) * volume
+    if name == "vwap":
+        return pd.DataFrame({"vwap": flow.cumsum() / volume.cumsum()})
+    return pd.DataFrame({"vwap": flow.rolling(10).sum() / volume.rolling(10).sum()})
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_compute_matches_pandas(name):
+    columns = _columns(rows=2_000, seed=2)
+    _, indicator = parse_indicator(name)
+    outputs, _ = indicator.compute(columns)
+    expected = _pandas_reference(name, pd.DataFrame(columns))
+    for out in indicator.outputs:
+        np.testing.assert_allclose(outputs[out], expected[out].to_numpy(), rtol=1e-9, atol=1e-9,
+                                   equal_nan=True, err_msg=out)
+
+
+def _price_data(columns, rows: int, version) -> PriceData:
+    dates = pd.bdate_range("2020-01-01", periods=rows).to_numpy().astype("datetime64[ns]")
+    return PriceData("TCS", dates, {column: values[:rows].copy() for column, values in columns.items()}, version)
+
+
+def test_engine_extends_appends_and_recomputes_rewrites():
+    columns = _columns()
+    engine = IndicatorEngine()
+    engine.compute(_price_data(columns, 250, 1), "ema10")
+    appended = engine.compute(_price_data(columns, 300, 2), "ema10")
+    assert engine.get_stats()["incremental"] == 1
+
+    # A split adjustment of early bars, with new bars appended in the same update
+    adjusted = {**columns, "Close": columns["Close"].copy()}
+    adjusted["Close"][:100] /= 2
+    engine.compute(_price_data(columns, 250, 3), "ema10")
+    rewritten = engine.compute(_price_data(adjusted, 300, 4), "ema10")
+    expected, _ = parse_indicator("ema10")[1].compute(adjusted)
+
+    assert engine.get_stats()["incremental"] == 1 and engine.get_stats()["full"] == 3
+    np.testing.assert_allclose(rewritten["ema"], expected["ema"], rtol=1e-9, equal_nan=True)
+    assert not np.allclose(rewritten["ema"][:100], appended["ema"][:100], equal_nan=True)
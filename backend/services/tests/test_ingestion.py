@@ -0,0 +1,99 @@
+import os
+import json
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from services.catalog import catalog_dir_for, read_manifest
+from services.ingestion import WATERMARK_DIRNAME, FixtureSource, Ingestor, IngestError, validate_frame
+
+
+def _dates(periods: int):
+    return pd.bdate_range(end=date.today() - timedelta(days=10), periods=periods)
+
+
+@pytest.fixture
+def folders(tmp_path):
+    fixtures, data = tmp_path / "fixtures", tmp_path / "data"
+    fixtures.mkdir()
+    data.mkdir()
+    return fixtures, data
+
+
+def test_watermark_limits_later_runs_to_new_bars(folders, write_csv):
+    fixtures, data = folders
+    write_csv(fixtures / "TCS.csv", _dates(12)[:10])
+    ingestor = Ingestor(str(data), FixtureSource(str(fixtures)), update_catalog=False)
+
+    first = ingestor.ingest("TCS.NS")
+    assert (first["symbol"], first["status"], first["new_rows"]) == ("TCS", "updated", 10)
+    assert ingestor.watermark("TCS") == _dates(12)[9].date()
+    with open(data / WATERMARK_DIRNAME / "TCS.json") as f:
+        assert json.load(f)["rows"] == 10
+
+    assert ingestor.ingest("TCS.NS")["status"] == "unchanged"
+
+    write_csv(fixtures / "TCS.csv", _dates(12))
+    second = ingestor.ingest("TCS.NS")
+    assert (second["status"], second["new_rows"]) == ("updated", 2)
+    assert len(pd.read_csv(data / "TCS.csv")) == 12
+    assert ingestor.watermark("TCS") == _dates(12)[-1].date()
+
+
+def test_watermark_of_an_edited_csv_falls_back_to_its_last_row(folders, write_csv):
+    fixtures, data = folders
+    write_csv(fixtures / "TCS.csv", _dates(10))
+    ingestor = Ingestor(str(data), FixtureSource(str(fixtures)), update_catalog=False)
+    ingestor.ingest("TCS")
+
+    stored = pd.read_csv(data / "TCS.csv")
+    stored.iloc[:7].to_csv(data / "TCS.csv", index=False)
+    assert ingestor.watermark("TCS") == _dates(10)[6].date()
+    assert ingestor.ingest("TCS")["new_rows"] == 3
+    assert len(pd.read_csv(data / "TCS.csv")) == 10
+
+
+def test_invalid_bars_leave_stored_data_alone(folders, write_csv):
+    fixtures, data = folders
+    frame = write_csv(fixtures / "TCS.csv", _dates(10))
+    ingestor = Ingestor(str(data), FixtureSource(str(fixtures)), update_catalog=False)
+    ingestor.ingest("TCS")
+    before = (data / "TCS.csv").read_bytes()
+
+    extra = frame.iloc[-1:].copy()
+    extra["Date"] = (_dates(10)[-1] + pd.offsets.BDay()).strftime("%Y-%m-%d")
+    extra["High"] = extra["Low"] - 1
+    pd.concat([frame, extra]).to_csv(fixtures / "TCS.csv", index=False)
+
+    result = ingestor.ingest("TCS")
+    assert result["status"] == "failed" and "High below Low" in result["error"]
+    assert (data / "TCS.csv").read_bytes() == before
+    assert ingestor.watermark("TCS") == _dates(10)[-1].date()
+
+
+def test_ingest_publishes_to_the_catalog(folders, write_csv):
+    fixtures, data = folders
+    write_csv(fixtures / "TCS.csv", _dates(10))
+    results = Ingestor(str(data), FixtureSource(str(fixtures))).ingest_all(["TCS.NS", "TCS.BO"])
+    assert [result["ticker"] for result in results] == ["TCS.NS"]
+    entry = read_manifest(catalog_dir_for(str(data)))["symbols"]["TCS"]
+    assert entry["rows"] == 10
+    assert entry["source"]["size"] == os.stat(data / "TCS.csv").st_size
+
+
+def test_validate_frame_rejects_duplicate_dates(write_csv, tmp_path):
+    frame = write_csv(tmp_path / "TCS.csv", _dates(3))
+    with pytest.raises(IngestError, match="Duplicate"):
+        validate_frame(pd.concat([frame, frame.iloc[:1]]))
+
+
+def test_tickers_keep_the_downloaded_listing(folders, write_csv):
+    fixtures, data = folders
+    write_csv(fixtures / "TCS.BO.csv", _dates(5))
+    ingestor = Ingestor(str(data), FixtureSource(str(fixtures)), update_catalog=False)
+    ingestor.ingest("TCS.BO")
+    # A CSV with no recorded ticker is not guessed from its bare file name
+    write_csv(data / "ACME.csv", _dates(5))
+
+    assert ingestor.tickers(fallback=["TCS.NS", "INFY.NS", "INFY.BO"]) == ["INFY.NS", "TCS.BO"]
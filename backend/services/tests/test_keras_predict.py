@@ -0,0 +1,52 @@
+import threading
+import time
+
+import numpy as np
+
+from services.keras_predict import WINDOW, MicroBatcher
+
+
+class _LastValueModel:
+    """Stands in for the LSTM: predicts the last value of each window plus one percent."""
+
+    def predict_on_batch(self, inputs):
+        return inputs[:, -1, :] * 1.01
+
+
+def _started(max_wait_ms: float) -> MicroBatcher:
+    batcher = MicroBatcher(max_batch=8, max_wait_ms=max_wait_ms)
+    batcher._model = _LastValueModel()
+    batcher._worker = threading.Thread(target=batcher._run, daemon=True)
+    batcher._worker.start()
+    return batcher
+
+
+def _forecast(batcher: MicroBatcher, steps: int) -> float:
+    window = np.linspace(0, 1, WINDOW)
+    with batcher.forecasting():
+        for _ in range(steps):
+            value = batcher.submit(window).result()
+            window = np.append(window[1:], value)
+    return value
+
+
+def test_lone_forecast_does_not_wait_for_a_batch():
+    batcher = _started(max_wait_ms=200)
+    started = time.perf_counter()
+    value = _forecast(batcher, steps=10)
+    assert time.perf_counter() - started < 1.0
+    assert abs(value - 1.01 ** 10) < 1e-4
+    assert batcher.get_stats()["batches"] == 10
+
+
+def test_concurrent_forecasts_share_each_step():
+    batcher = _started(max_wait_ms=200)
+    threads = [threading.Thread(target=_forecast, args=(batcher, 5)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = batcher.get_stats()
+    assert stats["windows"] == 20
+    assert stats["max_batch_seen"] > 1
+    assert stats["forecasting"] == 0
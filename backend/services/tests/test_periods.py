@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.periods import period_bounds
+
+# Latest bars on month ends, a leap day and mid-month
+ANCHORS = ["2024-03-29", "2024-02-29", "2023-05-31", "2024-12-31", "2025-01-15"]
+
+
+def _dates(anchor: str) -> np.ndarray:
+    return pd.date_range(end=anchor, periods=2_000, freq="D").to_numpy()
+
+
+def _expected_lo(dates: np.ndarray, period: str) -> int:
+    index = pd.DatetimeIndex(dates)
+    anchor = index[-1]
+    if period == "ytd":
+        return int(np.argmax(index >= pd.Timestamp(year=anchor.year, month=1, day=1)))
+    count, unit = int(period[:-2] if period.endswith(("wk", "mo")) else period[:-1]), period.lstrip("0123456789")
+    offset = {"wk": pd.DateOffset(weeks=count), "mo": pd.DateOffset(months=count),
+              "y": pd.DateOffset(years=count)}[unit]
+    return int(np.argmax(index > anchor - offset))
+
+
+@pytest.mark.parametrize("anchor", ANCHORS)
+@pytest.mark.parametrize("period", ["1wk", "2wk", "1mo", "3mo", "6mo", "1y", "2y", "5y", "ytd"])
+def test_calendar_periods_match_pandas(anchor, period):
+    dates = _dates(anchor)
+    assert period_bounds(dates, period) == (_expected_lo(dates, period), len(dates))
+
+
+def test_trading_day_periods_count_rows():
+    dates = pd.bdate_range("2024-01-01", periods=30).to_numpy()
+    assert period_bounds(dates, "5d") == (25, 30)
+    assert period_bounds(dates, "100d") == (0, 30)
+    assert period_bounds(dates, "max") == (0, 30)
+    assert period_bounds(dates, None) == period_bounds(dates, "1mo")
+
+
+@pytest.mark.parametrize("start, end", [("2024-01-10", "2024-01-20"), ("2024-01-13", None),
+                                        (None, "2024-01-14"), ("2024-02-01", "2024-01-01")])
+def test_explicit_range_matches_pandas_mask(start, end):
+    dates = pd.bdate_range("2024-01-01", periods=30).to_numpy()
+    mask = np.ones(len(dates), dtype=bool)
+    if start:
+        mask &= dates >= np.datetime64(start)
+    if end:
+        mask &= dates < np.datetime64(end) + np.timedelta64(1, "D")
+    lo, hi = period_bounds(dates, "5d", start=start, end=end)
+    assert hi - lo == mask.sum()
+    if mask.any():
+        assert (lo, hi) == (np.argmax(mask), len(mask) - np.argmax(mask[::-1]))
+
+
+@pytest.mark.parametrize("period", ["0d", "1h", "mo", "-1y"])
+def test_rejects_invalid_periods(period):
+    with pytest.raises(ValueError, match="Invalid period"):
+        period_bounds(pd.bdate_range("2024-01-01", periods=3).to_numpy(), period)
+
+
+def test_rejects_invalid_dates():
+    with pytest.raises(ValueError, match="Invalid start date"):
+        period_bounds(pd.bdate_range("2024-01-01", periods=3).to_numpy(), start="not-a-date")
@@ -0,0 +1,164 @@
+import json
+import asyncio
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from websockets.exceptions import ConnectionClosed
+
+from services.price_store import PriceStore
+from services.push import PushHub, Subscriber
+from services.symbols import SymbolRegistry
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def _queued(subscriber):
+    """Decode and clear the subscriber's queued messages."""
+    messages = [json.loads(message) for _, message in subscriber._pending]
+    subscriber._pending.clear()
+    return messages
+
+
+def test_overflow_replaces_backlog_with_resync():
+    async def scenario():
+        websocket = FakeWebSocket()
+        subscriber = Subscriber(websocket, queue_size=2)
+        subscriber.offer(None, json.dumps({"type": "subscribed"}))
+        assert subscriber.offer("TCS", json.dumps({"type": "bars", "symbol": "TCS"}))
+        assert not subscriber.offer("INFY", json.dumps({"type": "bars", "symbol": "INFY"}))
+        # Updates for a symbol already due a resync are folded into it
+        assert subscriber.offer("TCS", json.dumps({"type": "bars", "symbol": "TCS"}))
+        assert subscriber.offer("WIPRO", json.dumps({"type": "bars", "symbol": "WIPRO"}))
+
+        writer = asyncio.create_task(subscriber.drain())
+        while len(websocket.sent) < 3:
+            await asyncio.sleep(0)
+        writer.cancel()
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert sent == [
+        {"type": "resync", "symbols": ["INFY", "TCS"]},
+        {"type": "subscribed"},
+        {"type": "bars", "symbol": "WIPRO"},
+    ]
+
+
+@pytest.fixture
+def hub(tmp_path, write_csv):
+    write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=10))
+    store = PriceStore(str(tmp_path))
+    return PushHub(store, SymbolRegistry(store, names_path=str(tmp_path / "names.json")), queue_size=2)
+
+
+def test_hub_sends_appended_bars_and_resets(hub, tmp_path, write_csv):
+    async def scenario():
+        subscriber = Subscriber(FakeWebSocket(), queue_size=8)
+        await hub.subscribe(subscriber, ["TCS.NS", "NOPE"])
+        subscribed, = _queued(subscriber)
+        assert subscribed["symbols"] == ["TCS"] and subscribed["unknown"] == ["NOPE"]
+        assert subscribed["quotes"]["TCS"]["date"] == "2024-01-12"
+
+        assert await hub.poll_once() == 0
+        write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=12))
+        assert await hub.poll_once() == 1
+        bars, = _queued(subscriber)
+        assert bars["type"] == "bars" and bars["dates"] == ["2024-01-15", "2024-01-16"]
+        assert bars["quote"]["date"] == "2024-01-16"
+
+        # A history that no longer ends with the bars already sent is a reset
+        write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=5))
+        assert await hub.poll_once() == 1
+        assert _queued(subscriber) == [{"type": "reset", "symbol": "TCS"}]
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_does_not_hold_up_others(hub, tmp_path, write_csv):
+    async def scenario():
+        slow, fast = Subscriber(FakeWebSocket(), queue_size=2), Subscriber(FakeWebSocket(), queue_size=8)
+        for subscriber in (slow, fast):
+            await hub.subscribe(subscriber, ["TCS"])
+            _queued(subscriber)
+
+        for rows in range(11, 15):
+            write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=rows))
+            await hub.poll_once()
+
+        assert [message["dates"] for message in _queued(fast)] == [[date] for date in
+                                                                   ("2024-01-15", "2024-01-16",
+                                                                    "2024-01-17", "2024-01-18")]
+        assert len(slow._pending) == 0 and slow._resync == {"TCS"}
+        stats = hub.get_stats()
+        assert (stats["updates"], stats["messages"], stats["resyncs"]) == (4, 8, 1)
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribing_last_watcher_drops_the_symbol(hub):
+    async def scenario():
+        subscriber = Subscriber(FakeWebSocket())
+        await hub.subscribe(subscriber, ["TCS"])
+        hub.unsubscribe(subscriber, ["TCS.NS"])
+        assert subscriber.symbols == set()
+        assert hub.get_stats()["symbols"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_rewritten_earlier_bar_is_a_reset(hub, tmp_path, write_csv):
+    async def scenario():
+        subscriber = Subscriber(FakeWebSocket(), queue_size=8)
+        await hub.subscribe(subscriber, ["TCS"])
+        _queued(subscriber)
+
+        # New bars arrive together with a correction to an old one
+        frame = write_csv(tmp_path / "TCS.csv", pd.bdate_range("2024-01-01", periods=12))
+        frame.loc[2, "Close"] += 5
+        frame.to_csv(tmp_path / "TCS.csv", index=False)
+        assert await hub.poll_once() == 1
+        assert _queued(subscriber) == [{"type": "reset", "symbol": "TCS"}]
+
+    asyncio.run(scenario())
+
+
+class ShortLivedWebSocket(FakeWebSocket):
+    """A connection that subscribes from its URL and closes without sending a command."""
+
+    request = SimpleNamespace(path="/?symbols=TCS")
+
+    def __init__(self, fail_sends: bool):
+        super().__init__()
+        self.fail_sends = fail_sends
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0.01)
+        raise StopAsyncIteration
+
+    async def send(self, message):
+        if self.fail_sends:
+            raise ConnectionClosed(None, None)
+        await super().send(message)
+
+
+@pytest.mark.parametrize("fail_sends", [False, True])
+def test_handle_finishes_its_writer(hub, fail_sends):
+    async def scenario():
+        websocket = ShortLivedWebSocket(fail_sends)
+        await hub.handle(websocket)
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        return websocket.sent
+
+    sent = asyncio.run(scenario())
+    assert [message["type"] for message in sent] == ([] if fail_sends else ["subscribed"])
+    assert hub.get_stats()["connections"] == 0
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from services.price_store import PriceData
+from services.regression import TrendModel, TrendStats, date_ordinals
+
+
+def _history(rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2015-01-01", periods=rows).to_numpy().astype("datetime64[ns]")
+    close = 1_000 + np.cumsum(rng.normal(0.3, 5, rows))
+    close[rng.integers(0, rows, 10)] = np.nan
+    return dates, close
+
+
+def _sklearn_fit(x, y):
+    mask = ~np.isnan(y)
+    model = LinearRegression().fit(x[mask].reshape(-1, 1), y[mask])
+    return model.coef_[0], model.intercept_
+
+
+@pytest.mark.parametrize("split", [1, 100, 1_999])
+def test_incremental_matches_full_and_sklearn(split):
+    dates, close = _history(2_000)
+    x = date_ordinals(dates).astype(np.float64)
+
+    full = TrendStats.from_arrays(x, close).coefficients()
+    incremental = TrendStats.from_arrays(x[:split], close[:split]).update(x[split:], close[split:]).coefficients()
+    expected = _sklearn_fit(x, close)
+
+    np.testing.assert_allclose(incremental, full, rtol=1e-9)
+    np.testing.assert_allclose(full, expected, rtol=1e-7)
+
+
+def test_single_observation_is_flat():
+    slope, intercept = TrendStats.from_arrays(np.array([738000.0]), np.array([5.0])).coefficients()
+    assert slope == 0.0 and intercept == 5.0
+
+
+def test_model_updates_appended_bars_incrementally():
+    dates, close = _history(600, seed=1)
+    model = TrendModel()
+    model.coefficients(PriceData("TCS", dates[:500].copy(), {"Close": close[:500].copy()}, ("v", 1)))
+    grown = PriceData("TCS", dates.copy(), {"Close": close.copy()}, ("v", 2))
+    slope, intercept = model.coefficients(grown)
+    model.coefficients(grown)
+
+    assert model.get_stats() == {"memoized": 1, "incremental": 1, "full": 1, "symbols": 1}
+    np.testing.assert_allclose((slope, intercept), _sklearn_fit(date_ordinals(dates).astype(np.float64), close),
+                               rtol=1e-7)
+
+
+def test_model_refits_rewritten_history():
+    dates, close = _history(300, seed=2)
+    model = TrendModel()
+    model.coefficients(PriceData("TCS", dates.copy(), {"Close": close.copy()}, ("v", 1)))
+    revised = close.copy()
+    revised[-1] += 10
+    model.coefficients(PriceData("TCS", dates.copy(), {"Close": revised}, ("v", 2)))
+    assert model.get_stats()["full"] == 2
+
+
+def test_model_refits_when_earlier_bars_change():
+    dates, close = _history(600, seed=3)
+    model = TrendModel()
+    model.coefficients(PriceData("TCS", dates[:500].copy(), {"Close": close[:500].copy()}, ("v", 1)))
+    # Bars appended while a split adjustment rewrote the earliest ones
+    adjusted = close.copy()
+    adjusted[:100] /= 2
+    slope, intercept = model.coefficients(PriceData("TCS", dates.copy(), {"Close": adjusted}, ("v", 2)))
+
+    assert model.get_stats()["incremental"] == 0 and model.get_stats()["full"] == 2
+    np.testing.assert_allclose((slope, intercept), _sklearn_fit(date_ordinals(dates).astype(np.float64), adjusted),
+                               rtol=1e-7)
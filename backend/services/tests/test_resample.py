@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import resample as resample_module
+from services.price_store import PriceData
+from services.resample import resample
+
+
+def _daily(rows: int = 700, seed: int = 0) -> PriceData:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=rows)
+    # Holidays leave gaps, including whole weeks
+    dates = dates[rng.random(rows) > 0.05].delete(slice(40, 46)).to_numpy().astype("datetime64[ns]")
+    rows = len(dates)
+    close = 100 + np.cumsum(rng.normal(size=rows))
+    columns = {
+        "Open": close + rng.normal(size=rows),
+        "High": close + 2,
+        "Low": close - 2,
+        "Close": close,
+        "Adj Close": close * 0.99,
+        "Volume": rng.integers(1_000, 10_000, rows),
+    }
+    for name in ("Open", "High", "Low", "Close", "Adj Close"):
+        columns[name][rng.integers(0, rows, 30)] = np.nan
+    # A week with no opens at all
+    columns["Open"][100:105] = np.nan
+    return PriceData("TCS", dates, columns, ("csv", seed))
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    resample_module.resample_cache.clear()
+
+
+@pytest.mark.parametrize("interval, period", [("1wk", "W-SUN"), ("1mo", "M")])
+def test_matches_pandas_groupby(interval, period):
+    data = _daily()
+    frame = data.to_frame()
+    expected = frame.groupby(frame["Date"].dt.to_period(period)).agg({
+        "Date": "first", "Open": "first", "High": "max", "Low": "min",
+        "Close": "last", "Adj Close": "last", "Volume": "sum",
+    })
+
+    result = resample(data, interval)
+    np.testing.assert_array_equal(result.dates, expected["Date"].to_numpy())
+    for name in data.columns:
+        np.testing.assert_array_equal(result[name], expected[name].to_numpy(), err_msg=name)
+    assert result.version == (*data.version, interval)
+
+
+def test_cached_per_version():
+    data = _daily()
+    weekly = resample(data, "1wk")
+    assert resample(data, "1wk") is weekly
+    assert resample(data, "1d") is data
+
+    changed = PriceData("TCS", data.dates.copy(), {name: values.copy() for name, values in data.columns.items()},
+                        ("csv", 99))
+    assert resample(changed, "1wk") is not weekly
+
+
+def test_rejects_unknown_interval():
+    with pytest.raises(ValueError, match="Invalid interval"):
+        resample(_daily(), "1h")
@@ -0,0 +1,138 @@
+import time
+import threading
+
+import pytest
+import requests
+
+from services import sentiment_service
+from services.sentiment_service import EnhancedSentimentAnalyzer, NewsCache
+
+HEADLINES = [
+    "TCS shares gain after quarterly profit beats estimates",
+    "Infosys stock dropped 4% as revenue growth slows",
+    "Reliance Industries reports record revenue, announces expansion into retail",
+    "Sensex falls as banking stocks decline on rate concerns",
+    "HDFC Bank shares surge after strong loan growth",
+    "Wipro misses revenue estimates, shares plunge in early trade",
+    "ITC posts 10% increase in net profit, maintains dividend",
+    "SBI flags asset quality concerns amid economic downturn",
+    "Maruti Suzuki sales decrease 5% in March",
+    "Bharti Airtel outperforms peers on strong subscriber gains",
+    "Nifty ends steady ahead of inflation data release",
+    "Adani stocks crash after short seller report raises fraud concerns",
+    "Sun Pharma shares decline after US regulator issues warning letter",
+    "Axis Bank posts loss as bad loans surged",
+    "Bajaj Finance stock rising after strong quarterly update",
+]
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return EnhancedSentimentAnalyzer(cache_size=16)
+
+
+def _substring_counts(analyzer, text):
+    """The matcher this replaced: one substring scan per keyword."""
+    lowered = text.lower()
+    return {category: sum(1 for word in words if word in lowered)
+            for category, words in analyzer.financial_keywords.items()}
+
+
+@pytest.mark.parametrize("headline", HEADLINES)
+def test_keyword_counts_match_substring_scan(analyzer, headline):
+    assert analyzer._keyword_counts(headline) == _substring_counts(analyzer, headline)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Inflections the substring scan missed
+    ("L&T shares surging on record order inflows", {"positive": 1, "negative": 0, "neutral": 0}),
+    ("Kotak stock rallies on breakthrough in digital lending", {"positive": 2, "negative": 0, "neutral": 0}),
+    # Keywords inside other words ("up" in "rupee", "gain" in "against") do not count
+    ("Rupee fell against the dollar as oil rallied", {"positive": 1, "negative": 1, "neutral": 0}),
+    ("Analysts support the group's shareholders", {"positive": 0, "negative": 0, "neutral": 0}),
+    # Each keyword counts once, whatever its form
+    ("Profits rose, then rising costs dropped profit", {"positive": 2, "negative": 1, "neutral": 0}),
+])
+def test_keyword_counts_whole_words(analyzer, text, expected):
+    assert analyzer._keyword_counts(text) == expected
+
+
+class _Upstream:
+    """Stands in for NewsAPI; each fetch returns a new numbered result."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def __call__(self, search_query, api_key):
+        assert self.release.wait(5)
+        self.calls += 1
+        if self.fail:
+            raise requests.RequestException("upstream down")
+        return {"articles": [self.calls], "sentiment_summary": {}}
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = _Upstream()
+    monkeypatch.setattr(sentiment_service, "_fetch_news", fake)
+    return fake
+
+
+def _age(cache, query, seconds):
+    fetched_at, ttl, result = cache._entries.peek(query)
+    cache._entries.put(query, (fetched_at - seconds, ttl, result))
+
+
+def test_news_cache_serves_fresh_then_stale_while_refreshing(upstream):
+    cache = NewsCache(ttl=60, stale_ttl=60, error_ttl=5)
+    assert cache.get("TCS", "key")["articles"] == [1]
+    assert cache.get("TCS", "key")["articles"] == [1]
+    assert upstream.calls == 1
+
+    _age(cache, "TCS", 90)
+    upstream.release.clear()
+    # The stale result is returned at once while the refresh waits on the upstream
+    assert cache.get("TCS", "key")["articles"] == [1]
+    assert cache.get("TCS", "key")["articles"] == [1]
+    upstream.release.set()
+    _wait_for(lambda: cache.get_stats()["fetches"] == 2 and not cache._pending)
+
+    assert cache.get("TCS", "key")["articles"] == [2]
+    stats = cache.get_stats()
+    assert (stats["fresh"], stats["stale"], stats["misses"]) == (2, 2, 1)
+
+
+def test_news_cache_refetches_after_stale_window(upstream):
+    cache = NewsCache(ttl=60, stale_ttl=60, error_ttl=5)
+    cache.get("TCS", "key")
+    _age(cache, "TCS", 200)
+    assert cache.version("TCS", "key") is None
+    assert cache.get("TCS", "key")["articles"] == [2]
+
+
+def test_news_cache_keeps_last_result_when_refresh_fails(upstream):
+    cache = NewsCache(ttl=60, stale_ttl=60, error_ttl=5)
+    cache.get("TCS", "key")
+    _age(cache, "TCS", 200)
+    upstream.fail = True
+    assert cache.get("TCS", "key")["articles"] == [1]
+    # The failure is cached for error_ttl, so the upstream is not retried at once
+    assert cache.get("TCS", "key")["articles"] == [1]
+    assert upstream.calls == 2 and cache.get_stats()["errors"] == 1
+
+
+def test_news_cache_non_blocking_miss_fetches_in_background(upstream):
+    cache = NewsCache(ttl=60, stale_ttl=60, error_ttl=5)
+    assert cache.get("TCS", "key", block=False)["articles"] == []
+    _wait_for(lambda: cache.version("TCS", "key") is not None)
+    assert cache.get("TCS", "key")["articles"] == [1]
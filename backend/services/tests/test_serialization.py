@@ -0,0 +1,21 @@
+import json
+
+import numpy as np
+import pytest
+
+from services import serialization
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_writes_null_for_missing_values(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    payload = {"actual": np.array([1.5, np.nan, 2.0]), "last": np.float64("nan"),
+               "returns": {"1y": float("inf"), "5y": 0.25}, "dates": ("2024-01-01",)}
+
+    assert json.loads(serialization.dumps(payload)) == {
+        "actual": [1.5, None, 2.0], "last": None,
+        "returns": {"1y": None, "5y": 0.25}, "dates": ["2024-01-01"],
+    }
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from services.price_store import PriceStore
+from services.symbols import SymbolRegistry
+
+
+def test_csv_named_after_a_ticker_resolves_and_loads(tmp_path, write_csv):
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    write_csv(tmp_path / "TCS.NS.csv", dates)
+    write_csv(tmp_path / "infy.csv", dates, seed=1)
+    write_csv(tmp_path / "WIPRO.BO.csv", dates, seed=2)
+    write_csv(tmp_path / "WIPRO.csv", dates, seed=3)
+    store = PriceStore(str(tmp_path))
+    registry = SymbolRegistry(store, names_path=str(tmp_path / "names.json"))
+
+    assert registry.symbols() == ["INFY", "TCS", "WIPRO"]
+    assert registry.resolve("tcs.ns") == "TCS" and registry.resolve("INFY.BO") == "INFY"
+    assert [entry["symbol"] for entry in registry.search("T")] == ["TCS"]
+    assert len(store.get("TCS")) == 5 and len(store.get("INFY")) == 5
+    # The file named exactly after the symbol wins over a ticker-named one
+    assert store.path_for("WIPRO") == str(tmp_path / "WIPRO.csv")
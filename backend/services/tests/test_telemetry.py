@@ -0,0 +1,19 @@
+from services.telemetry import Registry
+
+
+def test_declared_gauges_are_not_exported_as_counters():
+    registry = Registry()
+    registry.register_cache("batcher", lambda: {"batches": 7, "forecasting": 2, "loaded": True,
+                                                "max_batch": 64, "max_batch_seen": 12},
+                            gauges=("forecasting", "loaded", "max_batch_seen"))
+    registry.register_cache("store", lambda: {"hits": 3, "size": 5, "max_size": 128})
+    lines = registry.render().splitlines()
+
+    assert 'stock_api_cache_events_total{cache="batcher",event="batches"} 7' in lines
+    assert 'stock_api_cache_state{cache="batcher",stat="forecasting"} 2' in lines
+    assert 'stock_api_cache_state{cache="batcher",stat="loaded"} 1' in lines
+    assert 'stock_api_cache_state{cache="batcher",stat="max_batch_seen"} 12' in lines
+    assert 'stock_api_cache_state{cache="store",stat="size"} 5' in lines
+    assert 'stock_api_cache_events_total{cache="store",event="hits"} 3' in lines
+    assert not [line for line in lines if 'event="forecasting"' in line or "max_size" in line
+                or 'max_batch"' in line]
@@ -0,0 +1,161 @@
+"""
+Warm-up of lazily imported dependencies, the price store and the models.
+
+The app imports only what it needs to register its routes; pandas, plotly,
+TextBlob (with nltk, SciPy and scikit-learn) and Keras are imported on first
+use, so the server starts listening quickly. Warm-up pays those costs ahead
+of the first requests that need them:
+
+- ``imports``: pandas, plotly express and TextBlob
+- ``prices``: map the published catalog and load CSV-only symbols, up to
+  the price store's capacity
+- ``charts``: render the default one-month figures for one symbol
+- ``sentiment``: score one sample text, loading TextBlob's lexicon
+- ``keras``: load the LSTM and compile its batch shape, when Keras is installed
+
+The ``WARMUP`` environment variable selects the mode: ``background``
+(default) runs the steps in a daemon thread once the server accepts
+connections, ``eager`` runs them before serving, and ``off`` skips them
+(the fastest start, e.g. for short-lived autoscaled instances).
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+WARMUP_MODES = ("background", "eager", "off")
+PORT_WAIT_SECONDS = 30.0
+
+
+def _import_dependencies() -> None:
+    import pandas  # noqa: F401
+    import plotly.express  # noqa: F401
+    import textblob  # noqa: F401
+
+
+def _load_prices() -> None:
+    from .price_store import price_store
+
+    price_store.preload(build=False)
+    if not os.path.isdir(price_store.data_folder):
+        return
+    # Symbols without a catalog entry are parsed from CSV; published ones are already cached
+    symbols = sorted(name[:-4] for name in os.listdir(price_store.data_folder) if name.endswith(".csv"))
+    for symbol in symbols[:price_store.max_symbols]:
+        price_store.get(symbol)
+
+
+def _render_charts() -> None:
+    from .charts import build_figures
+    from .periods import DEFAULT_PERIOD, period_bounds
+    from .price_store import price_store
+
+    if not os.path.isdir(price_store.data_folder):
+        return
+    for name in sorted(os.listdir(price_store.data_folder)):
+        data = price_store.get(name[:-4]) if name.endswith(".csv") else None
+        if data is not None and len(data) and "Close" in data:
+            build_figures(data, *period_bounds(data.dates, DEFAULT_PERIOD))
+            return
+
+
+def _score_sample() -> None:
+    from .sentiment_service import enhanced_sentiment_analyzer
+
+    enhanced_sentiment_analyzer.analyze_batch(["Shares rose after strong quarterly results."])
+
+
+def _load_keras() -> None:
+    from .keras_predict import ModelUnavailableError, available, batcher
+
+    if not available():
+        return
+
+    try:
+        batcher.warmup()
+    except ModelUnavailableError as e:
+        logging.info(f"Warm-up skipped the Keras model: {e}")
+
+
+STEPS: Dict[str, Callable[[], None]] = {
+    "imports": _import_dependencies,
+    "prices": _load_prices,
+    "charts": _render_charts,
+    "sentiment": _score_sample,
+    "keras": _load_keras,
+}
+
+
+def warm_up(steps: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Run warm-up steps in order, logging (not raising) failures.
+
+    Args:
+        steps (Optional[Iterable[str]]): Names from STEPS, defaults to all of them
+
+    Returns:
+        Dict[str, float]: Seconds taken by each step that ran
+    """
+    timings = {}
+    for name in steps or STEPS:
+        started = time.perf_counter()
+        try:
+            STEPS[name]()
+        except Exception:
+            logging.exception(f"Warm-up step '{name}' failed")
+            continue
+        timings[name] = round(time.perf_counter() - started, 3)
+    logging.info(f"Warm-up finished: {timings}")
+    return timings
+
+
+def _wait_for_port(address: Tuple[str, int], timeout: float = PORT_WAIT_SECONDS) -> bool:
+    """Poll until something accepts connections on ``address``."""
+    host, port = address
+    host = "127.0.0.1" if host in ("", "0.0.0.0") else host
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def start_warm_up(wait_for: Optional[Tuple[str, int]] = None,
+                  steps: Optional[Iterable[str]] = None) -> Optional[threading.Thread]:
+    """
+    Warm up according to the ``WARMUP`` mode.
+
+    Args:
+        wait_for (Optional[Tuple[str, int]]): In background mode, wait until
+            this (host, port) accepts connections before starting
+        steps (Optional[Iterable[str]]): Names from STEPS, defaults to all of them
+
+    Returns:
+        Optional[threading.Thread]: The background thread, or None if warm-up
+        ran eagerly or is off
+    """
+    mode = os.getenv("WARMUP", "background")
+    if mode not in WARMUP_MODES:
+        logging.warning(f"Unknown WARMUP mode '{mode}', expected one of {', '.join(WARMUP_MODES)}; skipping")
+        return None
+    if mode == "off":
+        return None
+    if mode == "eager":
+        warm_up(steps)
+        return None
+
+    def run():
+        if wait_for is not None and not _wait_for_port(wait_for):
+            logging.warning(f"Warm-up gave up waiting for {wait_for[0]}:{wait_for[1]} to accept connections")
+            return
+        warm_up(steps)
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,109 @@
+"""
+Simulated live feed for exercising the push server locally.
+
+Every interval, appends one random-walk bar (the business day after its
+latest bar) to each symbol's CSV in the data folder, replacing the file
+atomically as the ingestor does, and optionally republishes the symbols to
+the catalog.
+
+Usage (from the ``backend`` directory)::
+
+    python simulate_feed.py --data services/data --interval 1 --symbols TCS,INFY
+"""
+
+import os
+import csv
+import time
+import argparse
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from services.catalog import build_catalog
+from services.ingestion import _atomic_write
+from services.price_store import PriceData, PriceStore
+from services.symbols import normalize_symbol
+
+
+class SimulatedFeed:
+    """Appends random-walk daily bars to CSVs in a data folder."""
+
+    def __init__(self, data_folder: str, symbols: Optional[List[str]] = None, seed: int = 0,
+                 update_catalog: bool = False):
+        self.data_folder = data_folder
+        self.symbols = symbols or sorted(name[:-4] for name in os.listdir(data_folder) if name.endswith(".csv"))
+        self.update_catalog = update_catalog
+        self._rng = np.random.default_rng(seed)
+        # Histories may be stored unsorted; the store gives each symbol's latest bar
+        self._store = PriceStore(data_folder, max_symbols=1)
+
+    def _next_line(self, header: List[str], sample: List[str], data: PriceData) -> str:
+        """Build the bar after the symbol's latest one, in the file's date format and column order."""
+        row = dict(zip(header, sample))
+        next_date = np.busday_offset(data.dates[-1].astype("datetime64[D]"), 1, roll="forward").astype(date)
+        stored = row["Date"].strip()
+        if len(stored) >= 10 and stored[4] == "-":
+            # Keep any time or timezone suffix the file uses
+            row["Date"] = next_date.isoformat() + stored[10:]
+        else:
+            row["Date"] = next_date.strftime("%d-%m-%Y")
+
+        previous = float(data["Close"][-1])
+        close = previous * float(np.exp(self._rng.normal(0, 0.015)))
+        open_ = previous * (1 + float(self._rng.normal(0, 0.003)))
+        high = max(open_, close) * (1 + abs(float(self._rng.normal(0, 0.005))))
+        low = min(open_, close) * (1 - abs(float(self._rng.normal(0, 0.005))))
+        values = {"Open": open_, "High": high, "Low": low, "Close": close, "Adj Close": close}
+        for name, value in values.items():
+            if name in row:
+                row[name] = f"{value:.2f}"
+        if "Volume" in row:
+            row["Volume"] = str(int(self._rng.integers(100_000, 1_000_000)))
+        return ",".join(row[name] for name in header) + "\n"
+
+    def tick(self) -> Dict[str, str]:
+        """
+        Append one bar to every symbol.
+
+        Returns:
+            Dict[str, str]: The date appended per symbol
+        """
+        appended = {}
+        for symbol in self.symbols:
+            symbol = normalize_symbol(symbol)
+            data = self._store.load(symbol)
+            if data is None or not len(data) or "Close" not in data:
+                continue
+            path = self._store.path_for(symbol)
+            with open(path, newline="") as f:
+                text = f.read()
+            lines = text.splitlines()
+            line = self._next_line(next(csv.reader([lines[0]])), next(csv.reader([lines[-1]])), data)
+            if not text.endswith("\n"):
+                text += "\n"
+            _atomic_write(path, lambda f: f.write(text + line))
+            appended[symbol] = line.split(",", 1)[0]
+        if self.update_catalog and appended:
+            build_catalog(self.data_folder, list(appended))
+        return appended
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append simulated daily bars to data/*.csv at an interval")
+    parser.add_argument("--data", default=Config.DATA_DIR, help="Data folder to update")
+    parser.add_argument("--symbols", help="Comma-separated symbols, defaults to every CSV")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between bars")
+    parser.add_argument("--ticks", type=int, help="Stop after this many bars (default: run until interrupted)")
+    parser.add_argument("--catalog", action="store_true", help="Republish updated symbols to the catalog")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    feed = SimulatedFeed(args.data, args.symbols.split(",") if args.symbols else None, args.seed, args.catalog)
+    count = 0
+    while args.ticks is None or count < args.ticks:
+        appended = feed.tick()
+        count += 1
+        print(f"Tick {count}: appended {len(appended)} bar(s), e.g. {next(iter(appended.items()), None)}")
+        time.sleep(args.interval)
@@ -0,0 +1,29 @@
+"""
+Multi-worker WSGI entry point.
+
+Run from the ``backend`` directory with::
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+``gunicorn.conf.py`` sets ``preload_app``, so this module is imported once in
+the gunicorn master. With ``PRICE_PRELOAD=1`` (the default) the master
+publishes any new CSVs to the columnar catalog and maps every symbol
+read-only before forking; workers inherit the mappings and share their
+pages instead of each holding a private copy of every symbol they touch.
+
+After the nightly ingest publishes a new catalog generation, each worker
+notices the changed manifest on its next request, drops the mappings of
+the replaced generation and maps the new files; no restart is needed.
+"""
+
+import os
+import logging
+
+from app import app
+from services.price_store import price_store
+
+if os.getenv("PRICE_PRELOAD", "1") == "1":
+    try:
+        price_store.preload()
+    except OSError as e:
+        logging.error(f"Price store preload failed, workers will load symbols on demand: {e}")
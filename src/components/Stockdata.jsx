@@ -24,6 +24,27 @@ function Stockdata() {
   const [showMore, setShowMore] = useState(false);
   const [showPrediction, setShowPrediction] = useState(false);
 
+  // Build the line & area figures from the raw chart series
+  const buildFigure = (series, type, title) => ({
+    data: [
+      {
+        x: series.x,
+        y: series.y,
+        type: "scatter",
+        mode: "lines+markers",
+        fill: type === "area" ? "tozeroy" : undefined,
+        name: "Close",
+      },
+    ],
+    layout: {
+      title: { text: title },
+      width: 1200,
+      height: 600,
+      xaxis: { title: { text: "Date" }, autorange: "reversed" },
+      yaxis: { title: { text: "Close" } },
+    },
+  });
+
   const periods = [
     "1d",
     "5d",
@@ -48,12 +69,13 @@ function Stockdata() {
     setIsLoading(true);
     try {
       const res = await axios.get(
-        `${process.env.REACT_APP_API_URL}/api/stock/${ticker}?chart_period=${chartPeriod}&table_period=${tablePeriod}`
+        `${process.env.REACT_APP_API_URL}/api/stock/${ticker}?chart_period=${chartPeriod}&table_period=${tablePeriod}&chart=series&max_points=1200`
       );
 
+      const series = res.data.chart_series || { x: [], y: [] };
       setStockData(res.data.stock_data);
-      setGraphData1(JSON.parse(res.data.graph_data1));
-      setGraphData2(JSON.parse(res.data.graph_data2));
+      setGraphData1(buildFigure(series, "line", `${ticker} Stock Price Over Time`));
+      setGraphData2(buildFigure(series, "area", `${ticker} Stock Price Area Chart`));
       setStockInfo(res.data.stock_info);
       setNews(Array.isArray(res.data.stock_news) ? res.data.stock_news : []);
       setSentimentSummary(res.data.sentiment_summary || {});
@@ -1,12 +1,31 @@
 import React, { useEffect, useState } from "react";
-import { getWatchlist, removeStockFromWatchlist } from "../utils/watchlistManager";
+import {
+  fetchWatchlistQuotes,
+  getWatchlist,
+  removeStockFromWatchlist,
+} from "../utils/watchlistManager";
 import { auth } from "../components/firebase";
 import { onAuthStateChanged } from "firebase/auth";
 import BackToTopBtn from "../components/BackToTopBtn";
 import styles from "./Watchlist.module.css";
 
+// Latest close and its change from the day's open
+const QuoteLine = ({ info }) => {
+  if (!info || !info.close) return null;
+  const change = info.open ? ((info.close - info.open) / info.open) * 100 : 0;
+  return (
+    <p className={styles.quote}>
+      {info.close.toFixed(2)}{" "}
+      <span className={change >= 0 ? styles.up : styles.down}>
+        {change >= 0 ? "▲" : "▼"} {Math.abs(change).toFixed(2)}%
+      </span>
+    </p>
+  );
+};
+
 const Watchlist = () => {
   const [watchlist, setWatchlist] = useState([]);
+  const [quotes, setQuotes] = useState({});
   const [loading, setLoading] = useState(true);
   const [user, setUser] = useState(null);
 
@@ -17,6 +36,11 @@ const Watchlist = () => {
       getWatchlist().then((data) => {
         setWatchlist(data);
         setLoading(false);
+
+        // One batch request for every card's latest quote
+        fetchWatchlistQuotes(data.map((stock) => stock.symbol))
+          .then(setQuotes)
+          .catch((err) => console.error("Failed to load watchlist quotes:", err));
       });
     });
 
@@ -53,6 +77,9 @@ const Watchlist = () => {
             <div key={stock.symbol} className={styles.card}>
               <h4>{stock.symbol}</h4>
               <p>{stock.name}</p>
+              {quotes[stock.symbol] && (
+                <QuoteLine info={quotes[stock.symbol].stock_info} />
+              )}
               <button
                 className={styles.removeBtn}
                 onClick={() => handleRemove(stock.symbol)}
@@ -1,3 +1,4 @@
+import axios from "axios";
 import { auth, db } from "../components/firebase"; 
 
 import {
@@ -127,4 +128,31 @@ export const removeStockFromWatchlist = async (symbol) => {
   }
 };
 
+// The API keys quotes by symbol without the exchange suffix, e.g. TCS.NS -> TCS
+const BATCH_MAX_SYMBOLS = 50;
+const quoteKey = (symbol) => symbol.trim().toUpperCase().replace(/\.(NS|BO)$/, "");
 
+// Load latest quotes for every watchlist symbol in as few batch requests as possible,
+// returned keyed by the symbols as given
+export const fetchWatchlistQuotes = async (symbols, fields = "info") => {
+  const quotes = {};
+  if (!symbols.length) return quotes;
+
+  const chunks = [];
+  for (let i = 0; i < symbols.length; i += BATCH_MAX_SYMBOLS) {
+    chunks.push(symbols.slice(i, i + BATCH_MAX_SYMBOLS));
+  }
+  const responses = await Promise.all(
+    chunks.map((chunk) =>
+      axios.get(`${process.env.REACT_APP_API_URL}/api/stocks`, {
+        params: { symbols: chunk.join(","), fields },
+      })
+    )
+  );
+  const results = Object.assign({}, ...responses.map((res) => res.data.results));
+  symbols.forEach((symbol) => {
+    const quote = results[quoteKey(symbol)];
+    if (quote) quotes[symbol] = quote;
+  });
+  return quotes;
+};